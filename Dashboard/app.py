@@ -7,7 +7,6 @@
 
 import streamlit as st
 import pandas as pd
-import json
 import os
 from datetime import datetime
 import sys
@@ -18,8 +17,23 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, os.path.join(BASE_DIR, "Dashboard"))
 
+# 输出目录 (模块加载时计算一次)
+OUTPUTS_DIR = os.path.join(BASE_DIR, "storage", "outputs")
+LONGTERM_WEIGHTS_DIR = os.path.join(OUTPUTS_DIR, "longterm", "weights")
+DAILY_SIGNAL_DIR = os.path.join(OUTPUTS_DIR, "shortterm", "daily_signal")
+POOL_WATCH_DIR = os.path.join(OUTPUTS_DIR, "shortterm", "pool_watch")
+
+# 首页只展示信号文件中列表字段的前 N 项
+SIGNAL_LIST_LIMITS = (('hot_sectors', 5), ('signals', 20))
+
+# 市场状态 -> 显示颜色 / 名称 / 建议仓位
+REGIME_COLOR = {'AGGRESSIVE': 'green', 'DEFENSIVE': 'red', 'NEUTRAL': 'orange'}
+REGIME_NAME = {'AGGRESSIVE': '积极', 'DEFENSIVE': '防御', 'NEUTRAL': '中性'}
+REGIME_POSITION = {'AGGRESSIVE': 1.0, 'DEFENSIVE': 0.3}
+
 # 导入股票代码工具
 from lib.utils import StockCodeUtil, get_stock_name
+from data_bridge import read_csv_fast, read_json_fast, read_json_head
 
 # ============= 配置 =============
 st.set_page_config(
@@ -82,66 +96,109 @@ st.markdown("""
 
 # ============= 工具函数 =============
 def get_base_dir():
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return BASE_DIR
+
+
+@st.cache_data(show_spinner=False)
+def _read_csv_cached(path: str, mtime: float) -> pd.DataFrame:
+    """按 (路径, 修改时间) 缓存 CSV，文件更新后自动失效"""
+    return read_csv_fast(path)
+
+
+@st.cache_data(show_spinner=False)
+def _read_parquet_cached(path: str, mtime: float) -> pd.DataFrame:
+    """按 (路径, 修改时间) 缓存 Parquet，文件更新后自动失效"""
+    return pd.read_parquet(path)
+
+
+@st.cache_data(show_spinner=False)
+def _read_json_cached(path: str, mtime: float) -> dict:
+    """按 (路径, 修改时间) 缓存 JSON，文件更新后自动失效"""
+    return read_json_fast(path)
+
+
+@st.cache_data(show_spinner=False)
+def _read_json_head_cached(path: str, mtime: float, list_limits: tuple) -> dict:
+    """按 (路径, 修改时间) 缓存 JSON，列表字段只保留首页展示所需的前 N 项"""
+    return read_json_head(path, dict(list_limits))
+
+
+@st.cache_data(show_spinner=False)
+def _build_allocation_pie(slices: tuple):
+    """按 ((名称, 权重), ...) 缓存资产配置饼图，权重不变时复用同一个 Figure"""
+    import plotly.express as px
+    df = pd.DataFrame(list(slices), columns=['display_name', 'weight'])
+    return px.pie(
+        df,
+        values='weight',
+        names='display_name',
+        title="资产配置",
+        hole=0.4
+    )
 
 
 def load_longterm_data():
     """加载长线数据 - 从 storage/outputs 读取"""
-    base = get_base_dir()
-    weights_file = os.path.join(base, "storage", "outputs", "longterm", "weights", "output_weights.csv")
+    parquet_file = os.path.join(LONGTERM_WEIGHTS_DIR, "output_weights.parquet")
+    weights_file = os.path.join(LONGTERM_WEIGHTS_DIR, "output_weights.csv")
 
+    # 优先读取 Parquet 副本
+    if os.path.exists(parquet_file):
+        return _read_parquet_cached(parquet_file, os.path.getmtime(parquet_file))
     if os.path.exists(weights_file):
-        return pd.read_csv(weights_file)
+        return _read_csv_cached(weights_file, os.path.getmtime(weights_file))
     return pd.DataFrame()
 
 
 def load_daily_signals():
     """加载今日异动信号"""
-    base = get_base_dir()
-    signals_file = os.path.join(base, "storage", "outputs", "shortterm", "daily_signal", "signals", "daily_signals.json")
+    signals_file = os.path.join(DAILY_SIGNAL_DIR, "signals", "daily_signals.json")
 
     if os.path.exists(signals_file):
-        with open(signals_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _read_json_head_cached(signals_file, os.path.getmtime(signals_file), SIGNAL_LIST_LIMITS)
     return {}
 
 
 def load_pool_watch_summary():
     """加载股票池监控摘要"""
-    base = get_base_dir()
-    report_dir = os.path.join(base, "storage", "outputs", "shortterm", "pool_watch")
+    report_dir = POOL_WATCH_DIR
     
     if os.path.exists(report_dir):
         files = [f for f in os.listdir(report_dir) if f.startswith("pool_watch_") and f.endswith(".json")]
         if files:
             files.sort(reverse=True)
             latest_file = os.path.join(report_dir, files[0])
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('summary', {}), data.get('date', '')
+            data = _read_json_cached(latest_file, os.path.getmtime(latest_file))
+            return data.get('summary', {}), data.get('date', '')
     return {}, ''
 
 
-def get_market_regime():
-    """获取市场状态 - 从JSON文件读取"""
+def load_scanner_output() -> dict:
+    """加载 Scanner 最新输出 (市场状态、仓位建议、板块偏好共用一份)"""
     try:
-        base = get_base_dir()
-        signals_file = os.path.join(base, "storage", "outputs", "shortterm", "daily_signal", "daily_signals.json")
+        signals_file = os.path.join(DAILY_SIGNAL_DIR, "daily_signals.json")
         if os.path.exists(signals_file):
-            with open(signals_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # 获取文件修改时间
-                mtime = os.path.getmtime(signals_file)
-                generated_at = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
-                return {
-                    'regime': data.get('regime', 'UNKNOWN'),
-                    'score': data.get('composite_score', 50) / 10,
-                    'reasons': [],
-                    'timestamp': data.get('date', datetime.now().strftime('%Y-%m-%d')),
-                    'generated_at': generated_at
-                }
-    except Exception as e:
+            mtime = os.path.getmtime(signals_file)
+            data = dict(_read_json_head_cached(signals_file, mtime, SIGNAL_LIST_LIMITS))
+            # 获取文件修改时间
+            data['_generated_at'] = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+            return data
+    except Exception:
         pass
+    return {}
+
+
+def get_market_regime():
+    """获取市场状态 - 从JSON文件读取"""
+    data = load_scanner_output()
+    if data:
+        return {
+            'regime': data.get('regime', 'UNKNOWN'),
+            'score': data.get('composite_score', 50) / 10,
+            'reasons': [],
+            'timestamp': data.get('date', datetime.now().strftime('%Y-%m-%d')),
+            'generated_at': data['_generated_at']
+        }
     return {
         'regime': 'UNKNOWN',
         'score': 0,
@@ -153,8 +210,7 @@ def get_market_regime():
 
 def run_longterm_optimization():
     """运行长线优化"""
-    base = get_base_dir()
-    longterm_dir = os.path.join(base, "LongTerm")
+    longterm_dir = os.path.join(BASE_DIR, "LongTerm")
     try:
         result = subprocess.run(
             [sys.executable, "run_optimization.py"],
@@ -176,8 +232,7 @@ def run_longterm_optimization():
 
 def run_daily_scanner():
     """运行今日异动扫描"""
-    base = get_base_dir()
-    shortterm_dir = os.path.join(base, "ShortTerm")
+    shortterm_dir = os.path.join(BASE_DIR, "ShortTerm")
     try:
         result = subprocess.run(
             [sys.executable, "run_scanner.py", "daily"],
@@ -199,8 +254,7 @@ def run_daily_scanner():
 
 def run_pool_watch():
     """运行股票池监控"""
-    base = get_base_dir()
-    shortterm_dir = os.path.join(base, "ShortTerm")
+    shortterm_dir = os.path.join(BASE_DIR, "ShortTerm")
     try:
         result = subprocess.run(
             [sys.executable, "run_scanner.py", "pool"],
@@ -222,8 +276,7 @@ def run_pool_watch():
 
 def refresh_data():
     """刷新数据"""
-    base = get_base_dir()
-    datahub_dir = os.path.join(base, "DataHub")
+    datahub_dir = os.path.join(BASE_DIR, "DataHub")
     try:
         result = subprocess.run(
             [sys.executable, "scripts/refresh_data.py", "prices"],
@@ -254,13 +307,12 @@ st.caption(f"长线战略配置 + 短线战术扫描 | 数据生成时间: {regi
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    regime_color = {'AGGRESSIVE': 'green', 'DEFENSIVE': 'red', 'NEUTRAL': 'orange'}
-    regime_name = {'AGGRESSIVE': '积极', 'DEFENSIVE': '防御', 'NEUTRAL': '中性'}
+    regime_type = regime.get('regime', 'UNKNOWN')
     st.markdown(f"""
     <div class="metric-card" style="text-align: center;">
         <h3>市场状态</h3>
-        <h2 style="color: {regime_color.get(regime.get('regime', 'UNKNOWN'), 'gray')};">
-            {regime_name.get(regime.get('regime', 'UNKNOWN'), '未知')}
+        <h2 style="color: {REGIME_COLOR.get(regime_type, 'gray')};">
+            {REGIME_NAME.get(regime_type, '未知')}
         </h2>
     </div>
     """, unsafe_allow_html=True)
@@ -332,13 +384,13 @@ with col_nav3:
 
 st.divider()
 
-# ============= 两栏布局: 长线 + 短线摘要 =============
-col_left, col_right = st.columns([1, 1])
-
-# ========== 左侧: 长线配置 ==========
-with col_left:
+# ============= 分区渲染 (st.fragment: 区内交互只重跑本区) =============
+@st.fragment
+def _render_longterm():
+    """左侧: 长线配置"""
     st.header("📈 长线配置 (战略)")
 
+    longterm_weights = load_longterm_data()
     if not longterm_weights.empty:
         # 添加名称列用于显示
         longterm_weights['display_name'] = longterm_weights['symbol'].apply(
@@ -346,13 +398,8 @@ with col_left:
         )
         
         # 饼图
-        import plotly.express as px
-        fig_pie = px.pie(
-            longterm_weights,
-            values='weight',
-            names='display_name',
-            title="资产配置",
-            hole=0.4
+        fig_pie = _build_allocation_pie(
+            tuple(zip(longterm_weights['display_name'], longterm_weights['weight']))
         )
         st.plotly_chart(fig_pie, use_container_width=True)
 
@@ -370,8 +417,10 @@ with col_left:
     else:
         st.info("长线策略未运行，请先运行 LongTerm/run_optimization.py")
 
-# ========== 右侧: 短线摘要 ==========
-with col_right:
+
+@st.fragment
+def _render_shortterm():
+    """右侧: 短线摘要"""
     st.header("⚡ 短线摘要 (战术)")
     
     # 今日异动摘要
@@ -383,15 +432,19 @@ with col_right:
         hot_sectors = signals.get('hot_sectors', [])
         if hot_sectors:
             st.write("热点板块:")
-            for sector in hot_sectors[:3]:
-                st.markdown(f"<span class='hot-sector'>{sector['sector']} ({sector['zt_count']})</span>", 
-                          unsafe_allow_html=True)
+            # 拼成一段 HTML 一次输出，避免每个板块一条 markdown 消息
+            sector_html = "\n".join(
+                f"<div><span class='hot-sector'>{sector['sector']} ({sector['zt_count']})</span></div>"
+                for sector in hot_sectors[:3]
+            )
+            st.markdown(sector_html, unsafe_allow_html=True)
     else:
         st.info("今日异动未运行")
     
     st.divider()
     
     # 股票池监控摘要
+    pool_summary, _ = load_pool_watch_summary()
     if pool_summary:
         st.subheader("📊 股票池信号")
         
@@ -408,66 +461,65 @@ with col_right:
     else:
         st.info("股票池监控未运行")
 
-st.divider()
 
-# ============= 底部: 综合建议 =============
-st.header("💡 综合交易建议")
+@st.fragment
+def _render_suggestions():
+    """底部: 综合建议"""
+    st.header("💡 综合交易建议")
 
-col1, col2 = st.columns(2)
+    scanner_output = load_scanner_output()
+    col1, col2 = st.columns(2)
 
-with col1:
-    st.subheader("仓位建议")
-    # 从JSON读取仓位建议
-    multiplier = 0.7  # 默认
-    try:
-        base = get_base_dir()
-        signals_file = os.path.join(base, "storage", "outputs", "shortterm", "daily_signal", "daily_signals.json")
-        if os.path.exists(signals_file):
-            with open(signals_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                regime_type = data.get('regime', 'NEUTRAL')
-                if regime_type == 'AGGRESSIVE':
-                    multiplier = 1.0
-                elif regime_type == 'DEFENSIVE':
-                    multiplier = 0.3
-                else:
-                    multiplier = 0.7
-    except:
-        pass
+    with col1:
+        st.subheader("仓位建议")
+        # 从JSON读取仓位建议
+        regime_type = scanner_output.get('regime')
+        multiplier = REGIME_POSITION.get(regime_type, 0.7)
 
-    st.progress(multiplier)
-    st.write(f"建议仓位: {multiplier:.0%}")
+        st.progress(multiplier)
+        st.write(f"建议仓位: {multiplier:.0%}")
 
-    if regime.get('regime') == 'DEFENSIVE':
-        st.warning("⚠️ 市场风险较高，建议降低仓位，减少操作")
-    elif regime.get('regime') == 'AGGRESSIVE':
-        st.success("✅ 市场积极，可适当加大仓位")
-    else:
-        st.info("ℹ️ 市场中性，保持现有仓位")
-
-with col2:
-    st.subheader("板块偏好")
-
-    # 从JSON读取热点板块
-    try:
-        base = get_base_dir()
-        signals_file = os.path.join(base, "storage", "outputs", "shortterm", "daily_signal", "daily_signals.json")
-        if os.path.exists(signals_file):
-            with open(signals_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                hot_sectors = data.get('hot_sectors', [])
-                if hot_sectors:
-                    st.write("推荐关注板块:")
-                    for sector in hot_sectors[:5]:
-                        sector_name = sector.get('sector', '')
-                        if sector_name:
-                            st.markdown(f"<span class='hot-sector'>{sector_name}</span>", unsafe_allow_html=True)
-                else:
-                    st.write("暂无板块推荐")
+        if regime_type == 'DEFENSIVE':
+            st.warning("⚠️ 市场风险较高，建议降低仓位，减少操作")
+        elif regime_type == 'AGGRESSIVE':
+            st.success("✅ 市场积极，可适当加大仓位")
+        else:
+            st.info("ℹ️ 市场中性，保持现有仓位")
+
+    with col2:
+        st.subheader("板块偏好")
+
+        # 从JSON读取热点板块
+        if scanner_output:
+            hot_sectors = scanner_output.get('hot_sectors', [])
+            if hot_sectors:
+                st.write("推荐关注板块:")
+                sector_html = "\n".join(
+                    f"<div><span class='hot-sector'>{sector['sector']}</span></div>"
+                    for sector in hot_sectors[:5] if sector.get('sector')
+                )
+                st.markdown(sector_html, unsafe_allow_html=True)
+            else:
+                st.write("暂无板块推荐")
         else:
             st.write("请运行短线策略获取板块推荐")
-    except:
-        st.write("请运行短线策略获取板块推荐")
+
+
+# ============= 两栏布局: 长线 + 短线摘要 =============
+col_left, col_right = st.columns([1, 1])
+
+# ========== 左侧: 长线配置 ==========
+with col_left:
+    _render_longterm()
+
+# ========== 右侧: 短线摘要 ==========
+with col_right:
+    _render_shortterm()
+
+st.divider()
+
+# ============= 底部: 综合建议 =============
+_render_suggestions()
 
 # ============= 侧边栏 =============
 with st.sidebar:
@@ -6,72 +6,277 @@ import os
 import json
 import sys
 import pandas as pd
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# 项目根目录与统一输出目录 (模块加载时计算一次)
+BASE_DIR = Path(__file__).resolve().parent.parent
+STORAGE_OUTPUTS = BASE_DIR / "storage" / "outputs"
+
+# 超过该大小的 JSON 才走增量解析，小文件整体解析更快
+STREAM_JSON_THRESHOLD = 1024 * 1024
+
+
+def _inferred_date_columns(df: pd.DataFrame) -> List[str]:
+    """pyarrow 引擎自动推断为日期/时间的列 (默认引擎会保留为字符串)"""
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            columns.append(col)
+        elif series.dtype == object:
+            first = series.first_valid_index()
+            if first is not None and isinstance(series[first], date):
+                columns.append(col)
+    return columns
+
+
+def read_csv_fast(path, **kwargs) -> pd.DataFrame:
+    """
+    读取 CSV，优先使用 pyarrow 多线程解析引擎
+
+    只切换解析引擎，不启用 dtype_backend="pyarrow"；pyarrow 会把 ISO 格式的日期/时间列
+    推断为 datetime.date / datetime64，这些列按字符串重新读取，使 dtype 与默认引擎一致
+    (显式传入 parse_dates 或 dtype 时不做调整)。未安装 pyarrow 时回退到 pandas 默认 C 引擎。
+    """
+    try:
+        df = pd.read_csv(path, engine="pyarrow", **kwargs)
+    except ImportError:
+        return pd.read_csv(path, **kwargs)
+
+    if 'parse_dates' in kwargs or not isinstance(kwargs.get('dtype', {}), dict):
+        return df
+    date_columns = [col for col in _inferred_date_columns(df) if col not in kwargs.get('dtype', {})]
+    if not date_columns:
+        return df
+    dtype = {**kwargs.get('dtype', {}), **{col: str for col in date_columns}}
+    return pd.read_csv(path, engine="pyarrow", **{**kwargs, 'dtype': dtype})
+
+
+def read_json_fast(path) -> Any:
+    """
+    读取 JSON，安装了 orjson 时直接解析字节
+
+    json.dump 默认会写出 NaN/Infinity，orjson 不接受这类字面量，遇到时回退到标准库。
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw.decode('utf-8'))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _stream_json_head(path, list_limits: Dict[str, int]) -> Dict[str, Any]:
+    """增量解析顶层 JSON 对象，list_limits 中的列表字段超出部分直接跳过、不构建"""
+    data = {}
+    key = None
+    items = None      # 当前正在截断的顶层列表
+    builder = None    # 当前正在构建的值
+    base = 0          # builder 开始时的嵌套深度
+    depth = 0
+    with open(path, 'rb') as f:
+        for _, event, value in ijson.parse(f, use_float=True):
+            if event in ('start_map', 'start_array'):
+                depth += 1
+                if builder is None:
+                    if depth == 1:
+                        continue
+                    if depth == 2 and event == 'start_array' and key in list_limits:
+                        items = data[key] = []
+                        continue
+                    if depth == 3 and (items is None or len(items) >= list_limits[key]):
+                        continue
+                    if depth > 3:
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    base = depth
+                builder.event(event, value)
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if builder is not None:
+                    builder.event(event, value)
+                    if depth == base - 1:
+                        if items is not None:
+                            items.append(builder.value)
+                        else:
+                            data[key] = builder.value
+                        builder = None
+                elif depth == 1:
+                    items = None
+            elif builder is not None:
+                builder.event(event, value)
+            elif depth == 1:
+                if event == 'map_key':
+                    key = value
+                else:
+                    data[key] = value
+            elif depth == 2 and items is not None and len(items) < list_limits[key]:
+                items.append(value)
+    return data
+
+
+def read_json_head(path, list_limits: Dict[str, int]) -> Dict[str, Any]:
+    """
+    读取顶层 JSON 对象，list_limits 指定的列表字段只保留前 N 项
+
+    文件超过 STREAM_JSON_THRESHOLD 且安装了 ijson 时增量解析，只构建需要展示的部分；
+    否则整体解析后截断。两种方式返回的结构一致。
+    """
+    if IJSON_AVAILABLE and os.path.getsize(path) > STREAM_JSON_THRESHOLD:
+        try:
+            return _stream_json_head(path, list_limits)
+        except ijson.JSONError:
+            # NaN/Infinity 等非标准字面量，回退到整体解析
+            pass
+    data = read_json_fast(path)
+    for key, limit in list_limits.items():
+        if isinstance(data.get(key), list):
+            data[key] = data[key][:limit]
+    return data
+
+
+def read_table(csv_path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    优先读取同名 .parquet 副本，不存在时读取 CSV；两者都不存在返回 None
+
+    Args:
+        csv_path: CSV 文件路径
+        columns: 只读取的列，None 表示全部列 (Parquet 按列存储，只解压所需列)
+    """
+    parquet_path = csv_path.with_suffix(".parquet")
+    try:
+        return pd.read_parquet(parquet_path, columns=columns)
+    except FileNotFoundError:
+        pass
+    try:
+        return read_csv_fast(csv_path, usecols=columns)
+    except FileNotFoundError:
+        return None
 
 
 class DataBridge:
     """直接读取各项目数据，不依赖其他模块"""
 
     def __init__(self):
-        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.longterm_dir = os.path.join(self.base_dir, "LongTerm")
-        self.shortterm_dir = os.path.join(self.base_dir, "ShortTerm")
+        self.base_dir = BASE_DIR
+        self.longterm_dir = BASE_DIR / "LongTerm"
+        self.shortterm_dir = BASE_DIR / "ShortTerm"
         # 新统一输出目录
-        self.storage_outputs = os.path.join(self.base_dir, "storage", "outputs")
+        self.storage_outputs = STORAGE_OUTPUTS
 
     def get_longterm_weights(self) -> pd.DataFrame:
         """读取长线权重配置 - 从 storage/outputs 读取"""
-        weights_file = os.path.join(self.storage_outputs, "longterm", "weights", "output_weights.csv")
-        if os.path.exists(weights_file):
-            return pd.read_csv(weights_file)
+        weights_file = self.storage_outputs / "longterm" / "weights" / "output_weights.csv"
+        df = read_table(weights_file)
+        if df is not None:
+            return df
         return pd.DataFrame(columns=['symbol', 'weight'])
 
     def get_longterm_metrics(self) -> dict:
         """获取长线绩效指标"""
-        report_file = os.path.join(self.storage_outputs, "longterm", "reports", "portfolio_report.html")
-        if os.path.exists(report_file):
-            return {
-                'report_exists': True,
-                'last_update': datetime.fromtimestamp(
-                    os.path.getmtime(report_file)
-                ).strftime('%Y-%m-%d %H:%M')
-            }
-        return {'report_exists': False}
+        report_file = self.storage_outputs / "longterm" / "reports" / "portfolio_report.html"
+        try:
+            stat = os.stat(report_file)
+        except OSError:
+            return {'report_exists': False}
+        return {
+            'report_exists': True,
+            'last_update': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
+        }
 
     def get_shortterm_signals(self) -> dict:
         """读取短线信号 - 从 storage/outputs 读取"""
-        signals_file = os.path.join(self.storage_outputs, "shortterm", "signals", "daily_signals.json")
-        if os.path.exists(signals_file):
-            with open(signals_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-
-    def get_zt_pool(self, date: str) -> pd.DataFrame:
-        """读取涨停池 - 优先从 DataHub storage"""
+        signals_file = self.storage_outputs / "shortterm" / "signals" / "daily_signals.json"
+        try:
+            return read_json_fast(signals_file)
+        except FileNotFoundError:
+            return {}
+
+    def get_zt_pool(self, date: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        读取涨停池 - 优先从 DataHub storage
+
+        Args:
+            date: 日期 (YYYYMMDD)
+            columns: 只读取的列 (如 ['代码', '所属行业'])，None 表示全部列
+        """
         from DataHub.config import RAW_ZT_POOL_DIR
-        parquet_file = RAW_ZT_POOL_DIR / f"zt_pool_{date}.parquet"
-        if parquet_file.exists():
-            return pd.read_parquet(parquet_file)
+        # 按日期分区 (date=YYYYMMDD/)，兼容旧的单文件布局
+        for parquet_path in (RAW_ZT_POOL_DIR / f"date={date}", RAW_ZT_POOL_DIR / f"zt_pool_{date}.parquet"):
+            try:
+                return pd.read_parquet(parquet_path, columns=columns)
+            except FileNotFoundError:
+                pass
 
         # 回退到 cache
-        cache_file = os.path.join(self.shortterm_dir, "cache", f"zt_pool_{date}.csv")
-        if os.path.exists(cache_file):
-            return pd.read_csv(cache_file)
-        return pd.DataFrame()
-
-    def get_sector_heat_history(self) -> pd.DataFrame:
-        """读取板块热度历史 - 从 storage/outputs 读取"""
-        history_file = os.path.join(self.storage_outputs, "shortterm", "history", "sector_heat_history.csv")
-        if os.path.exists(history_file):
-            return pd.read_csv(history_file)
-        return pd.DataFrame()
+        cache_file = self.shortterm_dir / "cache" / f"zt_pool_{date}.csv"
+        try:
+            return read_csv_fast(cache_file, usecols=columns)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    def get_sector_heat_history(self, columns: Optional[List[str]] = None,
+                                start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        读取板块热度历史 - 从 storage/outputs 读取
+
+        与 LimitUpScanner.load_history 读取同一布局: 每日一个分区文件
+        daily_signal/sector_heat_history/date=YYYYMMDD.parquet；
+        分区目录尚未生成 (扫描器未迁移) 时回退到旧版整表 sector_heat_history.parquet/.csv
+
+        Args:
+            columns: 只读取的列，None 表示全部列
+            start_date: 开始日期 (YYYYMMDD)，None 表示不限
+            end_date: 结束日期 (YYYYMMDD)，None 表示不限
+        """
+        output_dir = self.storage_outputs / "shortterm" / "daily_signal"
+        history_dir = output_dir / "sector_heat_history"
+        if history_dir.is_dir():
+            files = sorted(
+                path for path in history_dir.glob("date=*.parquet")
+                if (start_date is None or path.stem[5:] >= start_date)
+                and (end_date is None or path.stem[5:] <= end_date)
+            )
+            if not files:
+                return pd.DataFrame(columns=columns or ['date', '所属行业', 'limit_up_count'])
+            import pyarrow.dataset as ds
+            return ds.dataset(files, format='parquet').to_table(columns=columns).to_pandas()
+
+        df = read_table(output_dir / "sector_heat_history.csv", columns=columns)
+        if df is None:
+            return pd.DataFrame()
+        if 'date' in df.columns and (start_date is not None or end_date is not None):
+            dates = df['date'].astype(str)
+            mask = pd.Series(True, index=df.index)
+            if start_date is not None:
+                mask &= dates >= start_date
+            if end_date is not None:
+                mask &= dates <= end_date
+            df = df[mask]
+        return df
 
     def get_market_regime(self) -> dict:
         """获取市场状态"""
         # 直接实例化 MarketRegime，避免复杂的路径问题
         try:
-            sys.path.insert(0, self.shortterm_dir)
+            sys.path.insert(0, str(self.shortterm_dir))
             from market_regime import MarketRegime
             regime = MarketRegime()
             return regime.get_market_status()
@@ -84,15 +289,16 @@ class DataBridge:
             }
         finally:
             # 清理 path
-            if self.shortterm_dir in sys.path:
-                sys.path.remove(self.shortterm_dir)
+            if str(self.shortterm_dir) in sys.path:
+                sys.path.remove(str(self.shortterm_dir))
 
     def get_all_data(self) -> dict:
         """获取所有数据"""
+        weights = self.get_longterm_weights()
         return {
             'market_regime': self.get_market_regime(),
             'longterm': {
-                'weights': self.get_longterm_weights().to_dict('records') if not self.get_longterm_weights().empty else [],
+                'weights': weights.to_dict('records') if not weights.empty else [],
                 'metrics': self.get_longterm_metrics()
             },
             'shortterm': self.get_shortterm_signals()
@@ -32,14 +32,25 @@ SHORTTERM_DATABASE_DIR = SHORTTERM_DIR / "database"
 SHORTTERM_CHARTS_DIR = SHORTTERM_DIR / "charts"
 SHORTTERM_CACHE_DIR = SHORTTERM_DIR / "cache"
 
-# Ensure all directories exist
-for _dir in [
-    STORAGE_DIR, RAW_PRICES_DIR, RAW_ZT_POOL_DIR, PROCESSED_RETURNS_DIR, DATABASE_DIR,
-    OUTPUTS_DIR, LONGTERM_DIR, SHORTTERM_DIR,
-    LONGTERM_WEIGHTS_DIR, LONGTERM_REPORTS_DIR, LONGTERM_CHARTS_DIR, LONGTERM_DATA_DIR,
-    SHORTTERM_SIGNALS_DIR, SHORTTERM_HISTORY_DIR, SHORTTERM_DATABASE_DIR, SHORTTERM_CHARTS_DIR, SHORTTERM_CACHE_DIR
-]:
-    _dir.mkdir(parents=True, exist_ok=True)
+# Marker written once the storage tree has been created
+_STORAGE_SENTINEL = STORAGE_DIR / ".initialized"
+
+
+def ensure_dirs():
+    """Create all storage directories and write the sentinel marker."""
+    for _dir in [
+        STORAGE_DIR, RAW_PRICES_DIR, RAW_ZT_POOL_DIR, PROCESSED_RETURNS_DIR, DATABASE_DIR,
+        OUTPUTS_DIR, LONGTERM_DIR, SHORTTERM_DIR,
+        LONGTERM_WEIGHTS_DIR, LONGTERM_REPORTS_DIR, LONGTERM_CHARTS_DIR, LONGTERM_DATA_DIR,
+        SHORTTERM_SIGNALS_DIR, SHORTTERM_HISTORY_DIR, SHORTTERM_DATABASE_DIR, SHORTTERM_CHARTS_DIR, SHORTTERM_CACHE_DIR
+    ]:
+        _dir.mkdir(parents=True, exist_ok=True)
+    _STORAGE_SENTINEL.touch()
+
+
+# Ensure all directories exist (a single stat once the tree is initialized)
+if not _STORAGE_SENTINEL.exists():
+    ensure_dirs()
 
 # Stock list from LongTerm
 STOCK_LIST = [
@@ -89,6 +100,7 @@ UPDATE_CONFIG = {
         "days_before_today": 0,
         "retry_times": 3,
         "retry_delay": 5,
+        "fetch_workers": 16,  # Concurrent symbol fetches for a full refresh
     },
     "zt_pool": {
         "schedule": "15 15 * * 1-5",  # Every weekday at 15:15
@@ -97,6 +109,15 @@ UPDATE_CONFIG = {
     },
 }
 
+# Parquet write settings (LZ4 decodes faster than snappy on local disks;
+# statistics enable row-group pruning on filtered reads)
+PARQUET_WRITE_OPTIONS = {
+    "compression": "lz4",
+    "use_dictionary": True,
+    "write_statistics": True,
+    "data_page_size": 1 << 20,
+}
+
 # Data retention
 RETENTION = {
     "zt_pool_days": 90,  # Keep 90 days of ZT pool data
@@ -2,11 +2,13 @@
 
 from .data_provider import DataProvider
 from .storage_engine import StorageEngine
-from .data_client import UnifiedDataClient, create_data_client
+from .data_client import UnifiedDataClient, create_data_client, retry_call, backoff_delay
 
 __all__ = [
     "DataProvider",
     "StorageEngine",
     "UnifiedDataClient",
-    "create_data_client"
+    "create_data_client",
+    "retry_call",
+    "backoff_delay"
 ]
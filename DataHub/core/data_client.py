@@ -3,13 +3,126 @@ Unified Data Client - 统一数据获取客户端
 封装所有 akshare 和 baostock 调用
 """
 
+import atexit
+import bisect
+import importlib.util
 import logging
+import random
+import threading
+import time
+from functools import lru_cache
 from typing import Optional, List
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _module_available(name: str) -> bool:
+    """检查模块是否可安装导入（进程内只检查一次）"""
+    return importlib.util.find_spec(name) is not None
+
+
+@lru_cache(maxsize=1)
+def _full_trading_calendar() -> tuple:
+    """
+    全量交易日历 (YYYY-MM-DD 升序)，进程内只下载一次
+
+    ak.tool_trading_date() 每次调用都会下载完整日历，这里缓存结果；
+    下载失败时抛出异常且不缓存，下次调用会重试。
+    """
+    import akshare as ak
+    df = ak.tool_trading_date()
+    return tuple(sorted(str(d) for d in df["calendarDate"]))
+
+
+@lru_cache(maxsize=1)
+def _trading_date_set() -> frozenset:
+    """交易日集合，用于 O(1) 判断某日是否为交易日"""
+    return frozenset(_full_trading_calendar())
+
+
+def backoff_delay(attempt: int, base_delay: float = 0.3) -> float:
+    """第 attempt 次 (从 0 计) 失败后的等待秒数: 指数退避，叠加 ±20% 抖动错开并发请求"""
+    return base_delay * (2 ** attempt) * random.uniform(0.8, 1.2)
+
+
+def retry_call(fn, retries: int = 3, base_delay: float = 0.3):
+    """
+    调用 fn()，抛出异常时按指数退避重试 (首次调用前不等待)
+
+    Args:
+        fn: 无参可调用对象
+        retries: 最多调用次数
+        base_delay: 第一次重试前的基准等待秒数
+
+    Returns:
+        fn() 的返回值；重试用尽时抛出最后一次的异常
+    """
+    for attempt in range(retries):
+        try:
+            return fn()
+        except Exception:
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff_delay(attempt, base_delay))
+
+
+# 场内基金代码前缀：51x/50x 沪市ETF、58x 科创板ETF、15x/16x 深市ETF/LOF
+_ETF_PREFIXES = ("51", "50", "58", "15", "16")
+
+
+# baostock 使用进程级全局会话，不支持并发查询；所有客户端共享同一次登录
+_baostock_lock = threading.Lock()
+_baostock_logged_in = False
+
+# 登录失败后在该间隔 (秒) 内不再重试，避免每只股票都重新握手一次
+BAOSTOCK_LOGIN_RETRY_INTERVAL = 60
+_baostock_login_failed_at = None
+
+
+def _baostock_session_login() -> bool:
+    """登录 baostock（已登录时直接返回），返回是否处于登录状态"""
+    global _baostock_logged_in, _baostock_login_failed_at
+    if _baostock_logged_in:
+        return True
+    if (_baostock_login_failed_at is not None
+            and time.monotonic() - _baostock_login_failed_at < BAOSTOCK_LOGIN_RETRY_INTERVAL):
+        return False
+    
+    import baostock as bs
+    try:
+        lg = bs.login()
+        if lg.error_code == "0":
+            _baostock_logged_in = True
+            _baostock_login_failed_at = None
+            logger.info("baostock login success")
+        else:
+            logger.error(f"baostock login failed: {lg.error_msg}")
+    except Exception as e:
+        logger.error(f"baostock login error: {e}")
+    if not _baostock_logged_in:
+        _baostock_login_failed_at = time.monotonic()
+    return _baostock_logged_in
+
+
+@atexit.register
+def _baostock_session_logout():
+    """进程退出时登出 baostock"""
+    global _baostock_logged_in
+    if not _baostock_logged_in:
+        return
+    
+    import baostock as bs
+    try:
+        bs.logout()
+        _baostock_logged_in = False
+        logger.info("baostock logout success")
+    except Exception as e:
+        logger.warning(f"baostock logout error: {e}")
+
+
 class UnifiedDataClient:
     """
     统一数据获取客户端
@@ -30,56 +143,28 @@ class UnifiedDataClient:
         self._akshare_available = self._check_akshare()
         self._baostock_available = self._check_baostock() if enable_baostock_fallback else False
         
-        # baostock 登录状态
-        self._baostock_logged_in = False
-        
         logger.info(f"UnifiedDataClient initialized: akshare={self._akshare_available}, "
                    f"baostock={self._baostock_available}")
     
     def _check_akshare(self) -> bool:
         """检查 akshare 是否可用"""
-        try:
-            import akshare as ak
+        if _module_available("akshare"):
             return True
-        except ImportError:
-            logger.warning("akshare not available")
-            return False
+        logger.warning("akshare not available")
+        return False
     
     def _check_baostock(self) -> bool:
         """检查 baostock 是否可用"""
-        try:
-            import baostock as bs
+        if _module_available("baostock"):
             return True
-        except ImportError:
-            logger.warning("baostock not available")
-            return False
-    
-    def _baostock_login(self):
-        """登录 baostock"""
-        if not self._baostock_available or self._baostock_logged_in:
-            return
-        
-        import baostock as bs
-        try:
-            lg = bs.login()
-            if lg.error_code == "0":
-                self._baostock_logged_in = True
-                logger.info("baostock login success")
-            else:
-                logger.error(f"baostock login failed: {lg.error_msg}")
-        except Exception as e:
-            logger.error(f"baostock login error: {e}")
+        logger.warning("baostock not available")
+        return False
     
-    def _baostock_logout(self):
-        """登出 baostock"""
-        if self._baostock_logged_in:
-            import baostock as bs
-            try:
-                bs.logout()
-                self._baostock_logged_in = False
-                logger.info("baostock logout success")
-            except Exception as e:
-                logger.warning(f"baostock logout error: {e}")
+    def _baostock_login(self) -> bool:
+        """登录 baostock（进程内共享会话，重复调用不会重新认证）"""
+        if not self._baostock_available:
+            return False
+        return _baostock_session_login()
     
     # ==================== 股票数据接口 ====================
     
@@ -276,8 +361,7 @@ class UnifiedDataClient:
             DataFrame 包含价格数据
         """
         is_stock = symbol.endswith(".SH") or symbol.endswith(".SZ")
-        is_etf = (symbol.startswith("51") or symbol.startswith("15") or 
-                  symbol.startswith("16") or symbol.startswith("50"))
+        is_etf = symbol.startswith(_ETF_PREFIXES)
         is_hk = symbol.endswith(".HK")
         
         # 优先使用 baostock（股票数据，支持日线）
@@ -312,38 +396,40 @@ class UnifiedDataClient:
         """通过 baostock 获取价格数据"""
         import baostock as bs
         
-        self._baostock_login()
-        
-        if not self._baostock_logged_in:
-            raise Exception("baostock not logged in")
-        
-        bs_symbol = symbol.replace(".", "-")
-        
-        rs = bs.query_history_k_data_plus(
-            bs_symbol,
-            "date,open,high,low,close,volume",
-            start_date=start_date,
-            end_date=end_date,
-            frequency="d",
-            adjustflag="2"
-        )
-        
-        if rs.error_code != '0':
-            raise Exception(f"baostock query error: {rs.error_msg}")
-        
-        data_list = []
-        while rs.next():
-            data_list.append(rs.get_row_data())
-        
-        if data_list:
-            df = pd.DataFrame(data_list, columns=["日期", "开盘", "最高", "最低", "收盘", "成交量"])
-            df["日期"] = pd.to_datetime(df["日期"])
-            df = df.set_index("日期")
-            for col in ["开盘", "最高", "最低", "收盘", "成交量"]:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-            return df
+        with _baostock_lock:
+            if not self._baostock_login():
+                raise Exception("baostock not logged in")
+            
+            bs_symbol = symbol.replace(".", "-")
+            
+            rs = bs.query_history_k_data_plus(
+                bs_symbol,
+                "date,open,high,low,close,volume",
+                start_date=start_date,
+                end_date=end_date,
+                frequency="d",
+                adjustflag="2"
+            )
+            
+            if rs.error_code != '0':
+                raise Exception(f"baostock query error: {rs.error_msg}")
+            
+            dates = []
+            values = []
+            while rs.next():
+                row = rs.get_row_data()
+                dates.append(row[0])
+                values.extend(row[1:])
+        
+        if not dates:
+            return pd.DataFrame()
         
-        return pd.DataFrame()
+        # 数值列一次性批量解析（停牌等缺失值为空串 -> NaN），避免逐列 object -> numeric 转换
+        columns = ["开盘", "最高", "最低", "收盘", "成交量"]
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        data = np.asarray(numeric, dtype="float64").reshape(len(dates), len(columns))
+        index = pd.DatetimeIndex(pd.to_datetime(dates, format="%Y-%m-%d"), name="日期")
+        return pd.DataFrame(data, index=index, columns=columns)
     
     # ==================== 涨停池接口 ====================
     
@@ -475,32 +561,34 @@ class UnifiedDataClient:
         if not self._akshare_available:
             raise ImportError("akshare not available")
         
-        import akshare as ak
+        calendar = _full_trading_calendar()
+        lo = bisect.bisect_left(calendar, start_date)
+        hi = bisect.bisect_right(calendar, end_date)
+        return list(calendar[lo:hi])
+    
+    def is_trading_date(self, date_str: str) -> bool:
+        """判断某日 (YYYY-MM-DD) 是否为交易日"""
+        if not self._akshare_available:
+            raise ImportError("akshare not available")
         
-        df = ak.tool_trading_date()
-        mask = (df["calendarDate"] >= start_date) & (df["calendarDate"] <= end_date)
-        return df[mask]["calendarDate"].tolist()
+        return date_str in _trading_date_set()
     
     def get_latest_trading_date(self) -> str:
         """获取最近交易日"""
         from datetime import datetime, timedelta
         
         today = datetime.now()
-        for i in range(7):
-            check_date = today - timedelta(days=i)
-            date_str = check_date.strftime("%Y-%m-%d")
-            calendar = self.get_trading_calendar(date_str, date_str)
-            if calendar:
-                return check_date.strftime("%Y%m%d")
+        # 一次区间查询取最近 10 天内的最后一个交易日（覆盖长假）
+        calendar = self.get_trading_calendar(
+            (today - timedelta(days=10)).strftime("%Y-%m-%d"),
+            today.strftime("%Y-%m-%d")
+        )
+        if calendar:
+            return calendar[-1].replace("-", "")
         
         return today.strftime("%Y%m%d") if today.weekday() < 5 else (
             today - timedelta(days=(today.weekday() - 4))
         ).strftime("%Y%m%d")
-    
-    def __del__(self):
-        """析构时登出 baostock"""
-        if hasattr(self, '_baostock_logged_in'):
-            self._baostock_logout()
 
 
 def create_data_client(**kwargs) -> UnifiedDataClient:
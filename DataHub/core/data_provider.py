@@ -1,14 +1,19 @@
 """Data Provider - Unified data fetching interface"""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from DataHub.core.data_client import UnifiedDataClient
 
 logger = logging.getLogger(__name__)
 
+# 并发拉取行情的最大线程数 (网络 I/O 为主，线程等待时释放 GIL)
+MAX_FETCH_WORKERS = 8
+
 
 class DataProvider:
     """Unified data provider supporting akshare and baostock"""
@@ -24,7 +29,8 @@ class DataProvider:
         start_date: str,
         end_date: str,
         period: str = "daily",
-        adjust: str = "qfq"
+        adjust: str = "qfq",
+        max_workers: int = MAX_FETCH_WORKERS
     ) -> pd.DataFrame:
         """
         Get price data for given symbols
@@ -35,49 +41,56 @@ class DataProvider:
             end_date: End date (YYYY-MM-DD)
             period: Period type - "daily" (日线), "weekly" (周线), "monthly" (月线)
             adjust: Adjustment type - "qfq" (forward), "hfq" (backward), "" (no adjustment)
+            max_workers: Number of symbols fetched concurrently
 
         Returns:
             DataFrame with Date as index and symbols as columns
         """
-        all_data = []
+        results = {}
         failed_symbols = []
         success_count = 0
-
-        for i, symbol in enumerate(symbols):
-            try:
-                df = self.client.get_price_data(symbol, start_date, end_date, period, adjust)
-                if df is not None and not df.empty:
-                    # 获取收盘价列
-                    close_col = None
-                    if "收盘" in df.columns:
-                        close_col = "收盘"
-                    elif "close" in df.columns:
-                        close_col = "close"
-
-                    if close_col:
-                        df = df[[close_col]].rename(columns={close_col: symbol})
-                        all_data.append(df)
-                        success_count += 1
-                        logger.info(f"[{i+1}/{len(symbols)}] {symbol}: 获取成功 ({len(df)} 条)")
-                    else:
-                        failed_symbols.append(f"{symbol}(无收盘价列)")
-                        logger.warning(f"[{i+1}/{len(symbols)}] {symbol}: 无收盘价列")
+        positions = {symbol: i for i, symbol in enumerate(symbols)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+            futures = {
+                executor.submit(self._fetch_single_price, symbol, start_date, end_date, period, adjust): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                progress = f"[{positions[symbol]+1}/{len(symbols)}] {symbol}"
+                try:
+                    df, reason = future.result()
+                except Exception as e:
+                    failed_symbols.append(f"{symbol}({str(e)[:30]})")
+                    logger.error(f"{progress}: 获取失败 - {e}")
+                    continue
+
+                if df is not None:
+                    results[symbol] = df
+                    success_count += 1
+                    logger.info(f"{progress}: 获取成功 ({len(df)} 条)")
                 else:
-                    failed_symbols.append(f"{symbol}(无数据)")
-                    logger.warning(f"[{i+1}/{len(symbols)}] {symbol}: 无数据")
-            except Exception as e:
-                failed_symbols.append(f"{symbol}({str(e)[:30]})")
-                logger.error(f"[{i+1}/{len(symbols)}] {symbol}: 获取失败 - {e}")
-                continue
+                    failed_symbols.append(f"{symbol}({reason})")
+                    logger.warning(f"{progress}: {reason}")
+
+        # 按输入顺序排列
+        all_data = [results[symbol] for symbol in symbols if symbol in results]
 
         if not all_data:
             logger.warning(f"所有股票获取失败: {failed_symbols}")
             return pd.DataFrame()
 
-        # Merge all data
-        result = all_data[0]
-        for df in all_data[1:]:
-            result = result.join(df, how="outer")
+        # Merge all data: one sorted union of dates, then fill a preallocated
+        # (dates x symbols) float64 buffer column by column
+        index = pd.DatetimeIndex(
+            np.unique(np.concatenate([df.index.values for df in all_data])),
+            name=all_data[0].index.name
+        )
+        values = np.full((len(index), len(all_data)), np.nan, dtype="float64")
+        for j, df in enumerate(all_data):
+            values[:, j] = df.iloc[:, 0].reindex(index).to_numpy(dtype="float64", na_value=np.nan)
+        result = pd.DataFrame(values, index=index, columns=[df.columns[0] for df in all_data])
 
         logger.info(f"数据获取完成: 成功 {success_count}/{len(symbols)}")
         if failed_symbols:
@@ -85,6 +98,37 @@ class DataProvider:
 
         return result
 
+    def _fetch_single_price(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        period: str,
+        adjust: str
+    ) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        Fetch close prices for a single symbol
+
+        Returns:
+            (single-column DataFrame named after the symbol, failure reason);
+            the DataFrame is None when the symbol has no usable data
+        """
+        df = self.client.get_price_data(symbol, start_date, end_date, period, adjust)
+        if df is None or df.empty:
+            return None, "无数据"
+
+        # 获取收盘价列
+        close_col = None
+        if "收盘" in df.columns:
+            close_col = "收盘"
+        elif "close" in df.columns:
+            close_col = "close"
+
+        if close_col is None:
+            return None, "无收盘价列"
+
+        return df[[close_col]].rename(columns={close_col: symbol}), ""
+
     def get_zt_pool(self, date: str) -> pd.DataFrame:
         """
         Get ZT (涨停) pool data for a given date
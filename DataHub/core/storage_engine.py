@@ -1,24 +1,93 @@
 """Storage Engine - Parquet + SQLite storage"""
 
+import hashlib
 import logging
+import os
+import shutil
 import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from DataHub.config import PARQUET_WRITE_OPTIONS
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Connection-level tuning applied once when the connection is opened
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+# Single SQL string so the connection's statement cache reuses the compiled insert
+_INSERT_JOB_SQL = """INSERT INTO job_log
+   (job_name, status, started_at, completed_at, records_processed, error_message)
+   VALUES (?, ?, ?, ?, ?, ?)"""
+
+JOB_LOG_COLUMNS = [
+    "id", "job_name", "status", "started_at", "completed_at", "records_processed", "error_message"
+]
+
+# Number of decoded Arrow tables (prices, returns, recent ZT pools) kept in memory
+TABLE_CACHE_SIZE = 8
+
+
+def _file_checksum(*paths: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Checksum of one or more written files (in the given order), streamed in chunks
+
+    Uses xxh3_64 when xxhash is installed, otherwise 64-bit blake2b.
+    Unlike hash() of a CSV dump this is stable across processes and
+    never materializes the frame as text.
+    """
+    hasher = xxhash.xxh3_64() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=8)
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _to_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store float64 columns as float32
+
+    Prices and daily returns need far fewer than float32's ~7 significant
+    digits; halving the width halves file size, decode time and memory.
+    """
+    float_cols = df.select_dtypes(include="float64").columns
+    if len(float_cols) == 0:
+        return df
+    return df.astype({col: np.float32 for col in float_cols})
+
 
 class StorageEngine:
     """Storage engine for Parquet and SQLite"""
 
-    def __init__(self, base_path: Optional[Path] = None):
+    def __init__(self, base_path: Optional[Path] = None, compression: Optional[str] = None):
         """
         Initialize storage engine
 
         Args:
             base_path: Base path for storage directory
+            compression: Parquet codec override (default from PARQUET_WRITE_OPTIONS)
         """
         if base_path is None:
             # Default to DataHub/storage
@@ -31,6 +100,15 @@ class StorageEngine:
         self.database_dir = self.base_path / "database"
         self.database_path = self.database_dir / "datahub.db"
 
+        self.parquet_options = dict(PARQUET_WRITE_OPTIONS)
+
+        # path -> ((st_mtime_ns, st_size), pa.Table), least recently used first
+        self._table_cache = OrderedDict()
+        # Sorted ZT pool dates (newest first); None until first listed
+        self._zt_dates_cache: Optional[List[str]] = None
+        if compression is not None:
+            self.parquet_options["compression"] = compression
+
         # Create directories
         for _dir in [
             self.raw_prices_dir,
@@ -40,49 +118,71 @@ class StorageEngine:
         ]:
             _dir.mkdir(parents=True, exist_ok=True)
 
+        # Single long-lived SQLite connection shared by all operations;
+        # the lock serializes access since it may be used from several threads
+        self._conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        for pragma in SQLITE_PRAGMAS:
+            self._conn.execute(pragma)
+
         # Initialize SQLite
         self._init_database()
 
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
+
     def _init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-
-        # Data versions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS data_versions (
-                data_type TEXT PRIMARY KEY,
-                version INTEGER,
-                updated_at TEXT,
-                checksum TEXT
-            )
-        """)
-
-        # ZT pool index table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS zt_pool_index (
-                date TEXT PRIMARY KEY,
-                file_path TEXT,
-                record_count INTEGER,
-                created_at TEXT
-            )
-        """)
-
-        # Jobs/execution log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS job_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_name TEXT,
-                status TEXT,
-                started_at TEXT,
-                completed_at TEXT,
-                records_processed INTEGER,
-                error_message TEXT
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+
+            # Data versions table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS data_versions (
+                    data_type TEXT PRIMARY KEY,
+                    version INTEGER,
+                    updated_at TEXT,
+                    checksum TEXT
+                )
+            """)
+
+            # ZT pool index table (clustered on date: range scans and
+            # ORDER BY date read the primary key b-tree directly)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS zt_pool_index (
+                    date TEXT PRIMARY KEY,
+                    file_path TEXT,
+                    record_count INTEGER,
+                    created_at TEXT
+                ) WITHOUT ROWID
+            """)
+
+            # Jobs/execution log
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_name TEXT,
+                    status TEXT,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    records_processed INTEGER,
+                    error_message TEXT
+                )
+            """)
+
+            # Index for get_recent_jobs(job_name=...); gather planner
+            # statistics once when the index is first created
+            index_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_job_log_name_id'"
+            ).fetchone()
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_job_log_name_id ON job_log(job_name, id DESC)"
             )
-        """)
+            if not index_exists:
+                cursor.execute("ANALYZE")
 
-        conn.commit()
-        conn.close()
         logger.info(f"Database initialized at {self.database_path}")
 
     # ========== Price Data Operations ==========
@@ -103,32 +203,81 @@ class StorageEngine:
             return False
 
         try:
-            file_path = self.raw_prices_dir / "prices.parquet"
-            df.to_parquet(file_path, engine="pyarrow", compression="snappy")
+            # One partition per year (raw/prices/year=YYYY/part-0.parquet);
+            # years whose rows are unchanged are not rewritten, so a daily
+            # refresh only rewrites the current year
+            df = _to_float32(df)
+            written = set()
+            rewritten = 0
+            for year, part in df.groupby(df.index.year, sort=True):
+                part_path = self.raw_prices_dir / f"year={year}" / "part-0.parquet"
+                written.add(part_path.parent)
+                table = pa.Table.from_pandas(part)
+                if part_path.exists() and pq.read_table(part_path).equals(table):
+                    continue
+                part_path.parent.mkdir(exist_ok=True)
+                # Write to a temp file and swap in, so memory-mapped readers of
+                # the old file are never truncated under them
+                tmp_path = part_path.with_suffix(".tmp")
+                pq.write_table(table, tmp_path, **self.parquet_options)
+                os.replace(tmp_path, part_path)
+                rewritten += 1
+
+            # Years no longer covered by the frame, and the pre-partition file
+            for part_dir in self.raw_prices_dir.glob("year=*"):
+                if part_dir not in written:
+                    shutil.rmtree(part_dir)
+            (self.raw_prices_dir / "prices.parquet").unlink(missing_ok=True)
 
             # Update version
-            checksum = str(hash(df.to_csv()))
+            checksum = _file_checksum(*self._price_partitions())
             self._update_version("prices", version, checksum)
 
-            logger.info(f"Saved prices to {file_path}")
+            logger.info(f"Saved prices to {self.raw_prices_dir} ({rewritten}/{len(written)} years rewritten)")
             return True
         except Exception as e:
             logger.error(f"Error saving prices: {e}")
             return False
 
-    def load_prices(self) -> pd.DataFrame:
-        """Load price data from Parquet"""
-        file_path = self.raw_prices_dir / "prices.parquet"
+    def _price_partitions(self) -> List[Path]:
+        """Year partition files of the price dataset, oldest first"""
+        return sorted(self.raw_prices_dir.glob("year=*/part-0.parquet"))
+
+    def has_prices(self) -> bool:
+        """Whether a price cache exists"""
+        return bool(self._price_partitions()) or (self.raw_prices_dir / "prices.parquet").exists()
+
+    def load_prices(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        raise_errors: bool = False
+    ) -> pd.DataFrame:
+        """
+        Load price data from Parquet
+
+        Args:
+            start_date: Only load rows on/after this date (pushed down into the reader)
+            end_date: Only load rows on/before this date
+            columns: Only load these symbol columns (unknown symbols are ignored)
+            raise_errors: Re-raise read errors (e.g. a corrupt or half-written
+                file) instead of returning an empty DataFrame
+        """
+        partitions = self._price_partitions()
+        file_path = self.raw_prices_dir if partitions else self.raw_prices_dir / "prices.parquet"
         if not file_path.exists():
             logger.warning(f"Price file not found: {file_path}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_parquet(file_path)
+            df = self._read_parquet(file_path, start_date, end_date, columns, files=partitions or None)
             logger.info(f"Loaded prices: {len(df)} rows, {len(df.columns)} columns")
             return df
         except Exception as e:
             logger.error(f"Error loading prices: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
     def save_returns(self, df: pd.DataFrame, version: int = 1) -> bool:
@@ -147,9 +296,9 @@ class StorageEngine:
 
         try:
             file_path = self.processed_returns_dir / "returns.parquet"
-            df.to_parquet(file_path, engine="pyarrow", compression="snappy")
+            _to_float32(df).to_parquet(file_path, engine="pyarrow", **self.parquet_options)
 
-            checksum = str(hash(df.to_csv()))
+            checksum = _file_checksum(file_path)
             self._update_version("returns", version, checksum)
 
             logger.info(f"Saved returns to {file_path}")
@@ -158,21 +307,123 @@ class StorageEngine:
             logger.error(f"Error saving returns: {e}")
             return False
 
-    def load_returns(self) -> pd.DataFrame:
-        """Load returns data from Parquet"""
+    def has_returns(self) -> bool:
+        """Whether a returns cache file exists"""
+        return (self.processed_returns_dir / "returns.parquet").exists()
+
+    def load_returns(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        raise_errors: bool = False
+    ) -> pd.DataFrame:
+        """
+        Load returns data from Parquet
+
+        Args:
+            start_date: Only load rows on/after this date (pushed down into the reader)
+            end_date: Only load rows on/before this date
+            columns: Only load these symbol columns (unknown symbols are ignored)
+            raise_errors: Re-raise read errors (e.g. a corrupt or half-written
+                file) instead of returning an empty DataFrame
+        """
         file_path = self.processed_returns_dir / "returns.parquet"
         if not file_path.exists():
             logger.warning(f"Returns file not found: {file_path}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_parquet(file_path)
+            df = self._read_parquet(file_path, start_date, end_date, columns)
             logger.info(f"Loaded returns: {len(df)} rows")
             return df
         except Exception as e:
             logger.error(f"Error loading returns: {e}")
+            if raise_errors:
+                raise
             return pd.DataFrame()
 
+    def _load_table(self, path: Path, files: Optional[List[Path]] = None) -> pa.Table:
+        """
+        Read a Parquet file or partition directory into an Arrow table
+
+        Args:
+            path: File or directory (also the cache key)
+            files: Explicit data files under path, read in order (default: all)
+
+        Tables are memoized per path on each file's (st_mtime_ns, st_size),
+        so repeated loads of unchanged files skip I/O and decoding entirely.
+        """
+        if files is None:
+            files = sorted(path.rglob("*.parquet")) if path.is_dir() else [path]
+        key = tuple((str(f), f.stat().st_mtime_ns, f.stat().st_size) for f in files)
+        with self._lock:
+            cached = self._table_cache.get(path)
+            if cached is not None and cached[0] == key:
+                self._table_cache.move_to_end(path)
+                return cached[1]
+
+        # Memory-map the file(s) (a partition directory is read as a dataset)
+        # so pages are mapped from the OS page cache instead of copied into
+        # Python-managed read buffers
+        table = pq.read_table(
+            [str(f) for f in files] if len(files) > 1 else files[0],
+            memory_map=True,
+            use_threads=True,
+            partitioning=None
+        )
+
+        with self._lock:
+            self._table_cache[path] = (key, table)
+            self._table_cache.move_to_end(path)
+            while len(self._table_cache) > TABLE_CACHE_SIZE:
+                self._table_cache.popitem(last=False)
+        return table
+
+    def _read_parquet(
+        self,
+        file_path: Path,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        files: Optional[List[Path]] = None
+    ) -> pd.DataFrame:
+        """
+        Read a Parquet file (or partition directory) into a DataFrame
+
+        The column projection and the date range on the stored index column
+        are applied to the cached Arrow table before conversion, so only the
+        selected cells are converted to pandas. Each call returns a new,
+        writable frame that never aliases the cached (memory-mapped) table,
+        whether or not a projection or date range was applied.
+        """
+        table = self._load_table(file_path, files)
+        # RangeIndex is stored as metadata only, not as a column
+        index_columns = [
+            col for col in (table.schema.pandas_metadata or {}).get("index_columns", [])
+            if isinstance(col, str)
+        ]
+
+        if columns is not None:
+            table = table.select(
+                [col for col in columns if col in table.column_names and col not in index_columns]
+                + index_columns
+            )
+
+        if (start_date or end_date) and index_columns:
+            index = table[index_columns[0]]
+            mask = None
+            if start_date:
+                mask = pc.greater_equal(index, pa.scalar(pd.Timestamp(start_date), index.type))
+            if end_date:
+                upper = pc.less_equal(index, pa.scalar(pd.Timestamp(end_date), index.type))
+                mask = upper if mask is None else pc.and_(mask, upper)
+            table = table.filter(mask)
+
+        # Consolidating conversion copies into pandas-owned blocks; zero-copy
+        # (split_blocks) columns would be read-only views of the mmap'd table
+        return table.to_pandas(use_threads=True)
+
     # ========== ZT Pool Operations ==========
 
     def save_zt_pool(self, df: pd.DataFrame, date: str) -> bool:
@@ -191,18 +442,28 @@ class StorageEngine:
             return False
 
         try:
-            file_path = self.raw_zt_pool_dir / f"zt_pool_{date}.parquet"
-            df.to_parquet(file_path, engine="pyarrow", compression="snappy")
+            # Hive-partitioned dataset: raw/zt_pool/date=YYYYMMDD/part-0.parquet;
+            # re-saving a date replaces only that partition
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.append_column("date", pa.array([date] * len(df), pa.string()))
+            ds.write_dataset(
+                table,
+                base_dir=self.raw_zt_pool_dir,
+                format="parquet",
+                partitioning=ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+                basename_template="part-{i}.parquet",
+                existing_data_behavior="delete_matching",
+                file_options=ds.ParquetFileFormat().make_write_options(**self.parquet_options)
+            )
+            file_path = self._zt_pool_partition(date)
 
             # Update index
-            conn = sqlite3.connect(self.database_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO zt_pool_index VALUES (?, ?, ?, ?)",
-                (date, str(file_path), len(df), datetime.now().isoformat())
-            )
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO zt_pool_index VALUES (?, ?, ?, ?)",
+                    (date, str(file_path), len(df), datetime.now().isoformat())
+                )
+                self._zt_dates_cache = None
 
             logger.info(f"Saved ZT pool for {date}: {len(df)} records")
             return True
@@ -210,15 +471,23 @@ class StorageEngine:
             logger.error(f"Error saving ZT pool: {e}")
             return False
 
+    def _zt_pool_partition(self, date: str) -> Path:
+        """Partition directory holding the ZT pool of one date"""
+        return self.raw_zt_pool_dir / f"date={date}"
+
     def load_zt_pool(self, date: str) -> pd.DataFrame:
         """Load ZT pool data for a specific date"""
-        file_path = self.raw_zt_pool_dir / f"zt_pool_{date}.parquet"
+        file_path = self._zt_pool_partition(date)
+        if not file_path.exists():
+            # Files written before the partitioned layout
+            file_path = self.raw_zt_pool_dir / f"zt_pool_{date}.parquet"
         if not file_path.exists():
             logger.warning(f"ZT pool not found: {file_path}")
             return pd.DataFrame()
 
         try:
-            df = pd.read_parquet(file_path)
+            # Reading the partition directory directly prunes all other dates
+            df = self._read_parquet(file_path)
             logger.info(f"Loaded ZT pool for {date}: {len(df)} records")
             return df
         except Exception as e:
@@ -226,13 +495,32 @@ class StorageEngine:
             return pd.DataFrame()
 
     def list_zt_pool_dates(self) -> List[str]:
-        """List all available ZT pool dates"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT date FROM zt_pool_index ORDER BY date DESC")
-        dates = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return dates
+        """List all available ZT pool dates (newest first)"""
+        with self._lock:
+            if self._zt_dates_cache is None:
+                self._zt_dates_cache = self._scan_zt_pool_dates()
+            return list(self._zt_dates_cache)
+
+    def _scan_zt_pool_dates(self) -> List[str]:
+        """
+        Discover ZT pool dates from the directory listing.
+
+        The filesystem is the source of truth (the SQLite index only keeps
+        record counts), so the index can never drift from what is on disk.
+        Covers both date=YYYYMMDD partitions and legacy zt_pool_YYYYMMDD.parquet.
+        """
+        if not self.raw_zt_pool_dir.exists():
+            return []
+
+        dates = set()
+        with os.scandir(self.raw_zt_pool_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("date=") and entry.is_dir():
+                    dates.add(name[len("date="):])
+                elif name.startswith("zt_pool_") and name.endswith(".parquet"):
+                    dates.add(name[len("zt_pool_"):-len(".parquet")])
+        return sorted(dates, reverse=True)
 
     def delete_old_zt_pool(self, days: int = 90) -> int:
         """
@@ -248,24 +536,36 @@ class StorageEngine:
 
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
 
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-
-        # Get files to delete
-        cursor.execute("SELECT date, file_path FROM zt_pool_index WHERE date < ?", (cutoff,))
-        to_delete = cursor.fetchall()
-
-        deleted = 0
-        for date, file_path in to_delete:
-            try:
-                Path(file_path).unlink()
-                cursor.execute("DELETE FROM zt_pool_index WHERE date = ?", (date,))
-                deleted += 1
-            except Exception as e:
-                logger.error(f"Error deleting {file_path}: {e}")
-
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+
+            # Get files to delete
+            cursor.execute("SELECT date, file_path FROM zt_pool_index WHERE date < ?", (cutoff,))
+            to_delete = cursor.fetchall()
+
+            removed = []
+            for date, file_path in to_delete:
+                try:
+                    path = Path(file_path)
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                    removed.append(date)
+                except Exception as e:
+                    logger.error(f"Error deleting {file_path}: {e}")
+
+            # Drop index rows in one statement / one commit; rows whose files
+            # could not be removed are kept
+            if len(removed) == len(to_delete):
+                cursor.execute("DELETE FROM zt_pool_index WHERE date < ?", (cutoff,))
+            else:
+                cursor.executemany(
+                    "DELETE FROM zt_pool_index WHERE date = ?", [(date,) for date in removed]
+                )
+            self._zt_dates_cache = None
+
+        deleted = len(removed)
         logger.info(f"Deleted {deleted} old ZT pool files")
         return deleted
 
@@ -273,22 +573,18 @@ class StorageEngine:
 
     def _update_version(self, data_type: str, version: int, checksum: str):
         """Update data version in database"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO data_versions VALUES (?, ?, ?, ?)",
-            (data_type, version, datetime.now().isoformat(), checksum)
-        )
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO data_versions VALUES (?, ?, ?, ?)",
+                (data_type, version, datetime.now().isoformat(), checksum)
+            )
 
     def get_version(self, data_type: str) -> Optional[Dict[str, Any]]:
         """Get version info for a data type"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM data_versions WHERE data_type = ?", (data_type,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM data_versions WHERE data_type = ?", (data_type,)
+            ).fetchone()
 
         if row:
             return {
@@ -302,7 +598,9 @@ class StorageEngine:
     def get_data_status(self) -> Dict[str, Any]:
         """Get overall data status"""
         status = {
-            "prices": self._get_file_status(self.raw_prices_dir / "prices.parquet"),
+            "prices": self._get_file_status(
+                *(self._price_partitions() or [self.raw_prices_dir / "prices.parquet"])
+            ),
             "returns": self._get_file_status(self.processed_returns_dir / "returns.parquet"),
             "zt_pool_dates": len(self.list_zt_pool_dates()),
             "versions": {},
@@ -315,16 +613,16 @@ class StorageEngine:
 
         return status
 
-    def _get_file_status(self, path: Path) -> Dict[str, Any]:
-        """Get status of a file"""
-        if not path.exists():
+    def _get_file_status(self, *paths: Path) -> Dict[str, Any]:
+        """Get status of a file (or the combined status of a partitioned dataset)"""
+        if not all(path.exists() for path in paths):
             return {"exists": False}
 
-        stat = path.stat()
+        stats = [path.stat() for path in paths]
         return {
             "exists": True,
-            "size_bytes": stat.st_size,
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            "size_bytes": sum(stat.st_size for stat in stats),
+            "modified": datetime.fromtimestamp(max(stat.st_mtime for stat in stats)).isoformat()
         }
 
     # ========== Job Logging ==========
@@ -333,50 +631,49 @@ class StorageEngine:
         self,
         job_name: str,
         status: str,
+        started_at: Optional[datetime] = None,
         records_processed: int = 0,
         error_message: Optional[str] = None
     ):
-        """Log a job execution"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO job_log
-               (job_name, status, started_at, completed_at, records_processed, error_message)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (job_name, status, datetime.now().isoformat(), datetime.now().isoformat(),
-             records_processed, error_message)
-        )
-        conn.commit()
-        conn.close()
-
-    def get_recent_jobs(self, job_name: Optional[str] = None, limit: int = 10) -> List[Dict]:
-        """Get recent job logs"""
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
+        """
+        Log a job execution
 
-        if job_name:
-            cursor.execute(
-                "SELECT * FROM job_log WHERE job_name = ? ORDER BY id DESC LIMIT ?",
-                (job_name, limit)
-            )
-        else:
-            cursor.execute(
-                "SELECT * FROM job_log ORDER BY id DESC LIMIT ?",
-                (limit,)
-            )
+        Args:
+            started_at: When the job started (record it before doing the work);
+                defaults to the completion time
+        """
+        completed_at = datetime.now()
+        started_at = started_at or completed_at
+        self.log_jobs_bulk([(
+            job_name, status, started_at.isoformat(), completed_at.isoformat(),
+            records_processed, error_message
+        )])
+
+    def log_jobs_bulk(self, rows: List[tuple]):
+        """
+        Log several job executions in one transaction
 
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [
-            {
-                "id": row[0],
-                "job_name": row[1],
-                "status": row[2],
-                "started_at": row[3],
-                "completed_at": row[4],
-                "records_processed": row[5],
-                "error_message": row[6]
-            }
-            for row in rows
-        ]
+        Args:
+            rows: (job_name, status, started_at, completed_at, records_processed, error_message) tuples
+        """
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_INSERT_JOB_SQL, rows)
+
+    def get_recent_jobs(self, job_name: Optional[str] = None, limit: int = 10) -> pd.DataFrame:
+        """Get recent job logs (one row per job, newest first; JOB_LOG_COLUMNS)"""
+        with self._lock:
+            if job_name:
+                cursor = self._conn.execute(
+                    "SELECT * FROM job_log WHERE job_name = ? ORDER BY id DESC LIMIT ?",
+                    (job_name, limit)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "SELECT * FROM job_log ORDER BY id DESC LIMIT ?",
+                    (limit,)
+                )
+            rows = cursor.fetchall()
+
+        return pd.DataFrame(rows, columns=JOB_LOG_COLUMNS)
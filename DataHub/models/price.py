@@ -69,17 +69,12 @@ class PriceData:
             "columns": self.columns,
         }
 
-        # Numeric stats for each column
-        numeric_stats = {}
-        for col in self.data.columns:
-            if pd.api.types.is_numeric_dtype(self.data[col]):
-                numeric_stats[col] = {
-                    "mean": self.data[col].mean(),
-                    "std": self.data[col].std(),
-                    "min": self.data[col].min(),
-                    "max": self.data[col].max(),
-                    "latest": self.data[col].iloc[-1] if len(self.data) > 0 else None
-                }
-
-        stats["statistics"] = numeric_stats
+        # Numeric stats for all columns in one aggregate
+        numeric = self.data.select_dtypes(include=["number", "bool"])
+        if numeric.columns.empty:
+            stats["statistics"] = {}
+            return stats
+        summary = numeric.agg(["mean", "std", "min", "max"]).T
+        summary["latest"] = numeric.iloc[-1]
+        stats["statistics"] = summary.to_dict(orient="index")
         return stats
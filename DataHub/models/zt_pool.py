@@ -1,6 +1,6 @@
 """ZT Pool Data Model"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 import pandas as pd
@@ -14,6 +14,28 @@ class ZtPoolData:
     record_count: int
     last_updated: datetime
     source: str = "akshare"
+    industry_col: Optional[str] = field(default=None, init=False)
+    _industry_summary: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        """Locate the industry column once, store it as categorical and count it"""
+        self.industry_col = self._find_industry_col()
+        if self.industry_col:
+            self.data = self.data.astype({self.industry_col: "category"})
+            self._industry_summary = self.data[self.industry_col].value_counts().to_dict()
+
+    def _find_industry_col(self) -> Optional[str]:
+        """Find the industry column among the names akshare might use"""
+        for col in ["行业", "行业板块", "所属行业", "申万行业"]:
+            if col in self.data.columns:
+                return col
+
+        # Try to find any column containing "行业"
+        for col in self.data.columns:
+            if "行业" in col:
+                return col
+
+        return None
 
     @classmethod
     def from_dataframe(
@@ -37,28 +59,8 @@ class ZtPoolData:
         return self.data.empty
 
     def get_industry_summary(self) -> Dict[str, int]:
-        """Get summary by industry"""
-        if self.data.empty:
-            return {}
-
-        # Try different column names that akshare might use
-        industry_col = None
-        for col in ["行业", "行业板块", "所属行业", "申万行业"]:
-            if col in self.data.columns:
-                industry_col = col
-                break
-
-        if industry_col is None:
-            # Try to find any column containing "行业"
-            for col in self.data.columns:
-                if "行业" in col:
-                    industry_col = col
-                    break
-
-        if industry_col:
-            return self.data[industry_col].value_counts().to_dict()
-
-        return {}
+        """Get summary by industry (counted once at construction)"""
+        return dict(self._industry_summary)
 
     def get_sector_counts(self) -> Dict[str, int]:
         """Alias for get_industry_summary"""
@@ -140,31 +140,32 @@ def check_local_cache():
     
     storage_path = Path(__file__).parent.parent.parent / "storage"
     
-    # 检查价格数据
-    price_file = storage_path / "raw" / "prices" / "prices.parquet"
-    if price_file.exists():
+    # 检查价格数据 (按年分区 year=YYYY/，兼容旧的单文件 prices.parquet)
+    price_dir = storage_path / "raw" / "prices"
+    price_files = sorted(price_dir.glob("year=*/part-0.parquet")) or sorted(price_dir.glob("prices.parquet"))
+    if price_files:
         try:
-            import pandas as pd
-            df = pd.read_parquet(price_file)
+            import pyarrow.parquet as pq
+            df = pq.read_table([str(f) for f in price_files], partitioning=None).to_pandas()
             
             # 检查数据有效性
             if df.empty or len(df.index) == 0:
-                print(f"△ 价格缓存存在但为空: {price_file}")
+                print(f"△ 价格缓存存在但为空: {price_dir}")
             else:
-                print(f"✓ 价格缓存: {price_file}")
+                print(f"✓ 价格缓存: {price_dir}")
                 print(f"  形状: {df.shape}")
                 print(f"  日期范围: {df.index[0]} ~ {df.index[-1]}")
                 print(f"  股票数量: {len(df.columns)}")
         except Exception as e:
             print(f"✗ 读取价格缓存失败: {type(e).__name__}: {e}")
     else:
-        print(f"✗ 价格缓存不存在: {price_file}")
+        print(f"✗ 价格缓存不存在: {price_dir}")
     
     # 检查涨停池数据
     zt_dir = storage_path / "raw" / "zt_pool"
     if zt_dir.exists():
         try:
-            files = list(zt_dir.glob("*.parquet"))
+            files = list(zt_dir.glob("date=*")) + list(zt_dir.glob("*.parquet"))
             print(f"\n✓ 涨停池缓存: {len(files)} 个文件")
             for f in sorted(files)[-3:]:
                 print(f"  - {f.name}")
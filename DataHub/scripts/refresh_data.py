@@ -3,7 +3,9 @@
 import argparse
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -17,10 +19,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def refresh_prices(service: DataService) -> bool:
-    """Refresh price data"""
+def _job_row(job_name: str, started_at: str, result: dict) -> tuple:
+    """Build a job_log row from a refresh result dict"""
+    return (
+        job_name,
+        result["status"],
+        started_at,
+        datetime.now().isoformat(),
+        result.get("records", 0),
+        result.get("message"),
+    )
+
+
+def refresh_prices(service: DataService, jobs: Optional[List[tuple]] = None) -> bool:
+    """Refresh price data (appends a job_log row to jobs when given)"""
     logger.info("Starting price refresh...")
+    started_at = datetime.now().isoformat()
     result = service.refresh_prices()
+    if jobs is not None:
+        jobs.append(_job_row("refresh_prices", started_at, result))
 
     if result["status"] == "success":
         logger.info(f"Price refresh successful: {result['records']} rows, {result['symbols']} symbols")
@@ -30,11 +47,18 @@ def refresh_prices(service: DataService) -> bool:
         return False
 
 
-def refresh_zt_pool(service: DataService, date: str = None) -> bool:
-    """Refresh ZT pool data"""
+def refresh_zt_pool(
+    service: DataService,
+    date: str = None,
+    jobs: Optional[List[tuple]] = None
+) -> bool:
+    """Refresh ZT pool data (appends a job_log row to jobs when given)"""
     date = date or service.provider.get_latest_trading_date()
     logger.info(f"Starting ZT pool refresh for {date}...")
+    started_at = datetime.now().isoformat()
     result = service.refresh_zt_pool(date)
+    if jobs is not None:
+        jobs.append(_job_row("refresh_zt_pool", started_at, result))
 
     if result["status"] == "success":
         logger.info(f"ZT pool refresh successful: {result['records']} records for {result['date']}")
@@ -93,17 +117,19 @@ def main():
     service = DataService()
 
     success = True
+    # Job log rows, written in one transaction at the end
+    jobs = []
 
     if args.task == "prices":
-        success = refresh_prices(service)
+        success = refresh_prices(service, jobs)
 
     elif args.task == "zt_pool":
-        success = refresh_zt_pool(service, args.date)
+        success = refresh_zt_pool(service, args.date, jobs)
 
     elif args.task == "all":
-        success = refresh_prices(service)
+        success = refresh_prices(service, jobs)
         if success:
-            success = refresh_zt_pool(service, args.date)
+            success = refresh_zt_pool(service, args.date, jobs)
 
     elif args.task == "cleanup":
         cleanup(service, args.days)
@@ -111,6 +137,8 @@ def main():
     elif args.task == "status":
         status(service)
 
+    service.storage.log_jobs_bulk(jobs)
+
     if not success:
         sys.exit(1)
 
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+import numpy as np
 import pandas as pd
 
 import sys
@@ -11,11 +12,26 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from DataHub.core.data_provider import DataProvider
 from DataHub.core.storage_engine import StorageEngine
-from DataHub.config import STOCK_LIST
+from DataHub.config import STOCK_LIST, UPDATE_CONFIG
 
 logger = logging.getLogger(__name__)
 
 
+def _simple_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Period-over-period simple returns, computed in one NumPy pass
+
+    Same shape as prices with a NaN first row, like pct_change() without
+    forward-filling gaps.
+    """
+    values = prices.to_numpy(dtype="float64")
+    returns = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(values[1:], values[:-1], out=returns[1:])
+    returns[1:] -= 1.0
+    return pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+
+
 class DataService:
     """Unified data service for all strategies"""
 
@@ -57,16 +73,32 @@ class DataService:
         Returns:
             DataFrame with Date as index and symbols as columns
         """
-        if use_cache and period == "daily":
-            cached = self.storage.load_prices()
-            if not cached.empty:
-                return self._filter_by_date(cached, start_date, end_date)
-
-        # Fetch from provider
-        symbols = symbols or self.stock_list
         start = start_date or self._get_default_start()
         end = end_date or datetime.now().strftime("%Y-%m-%d")
 
+        if use_cache and period == "daily" and self.storage.has_prices():
+            # Date range and symbol columns are pushed down into the Parquet reader;
+            # an unreadable cache falls through to the provider
+            try:
+                cached = self.storage.load_prices(start_date, end_date, columns=symbols, raise_errors=True)
+            except Exception as e:
+                logger.warning(f"Price cache unreadable, fetching from provider: {e}")
+            else:
+                missing = self._missing_symbols(cached, symbols)
+                if not missing:
+                    return self._filter_by_date(cached, start_date, end_date)
+
+                # Partial hit: fetch only the symbols the cache lacks and merge them in
+                logger.info(f"{len(missing)} symbols not in price cache, fetching from provider")
+                fetched = self.provider.get_price_data(missing, start, end, period)
+                if fetched.empty:
+                    return self._filter_by_date(cached, start_date, end_date)
+                existing = self.storage.load_prices()
+                self.storage.save_prices(fetched if existing.empty else fetched.combine_first(existing))
+                return self._combine_cached(cached, fetched, symbols, start_date, end_date)
+
+        # Fetch from provider
+        symbols = symbols or self.stock_list
         df = self.provider.get_price_data(symbols, start, end, period)
         if not df.empty and period == "daily":
             self.storage.save_prices(df)
@@ -92,17 +124,33 @@ class DataService:
         Returns:
             DataFrame with returns
         """
-        if use_cache:
-            cached = self.storage.load_returns()
-            if not cached.empty:
-                return self._filter_by_date(cached, start_date, end_date)
+        if use_cache and self.storage.has_returns():
+            try:
+                cached = self.storage.load_returns(start_date, end_date, columns=symbols, raise_errors=True)
+            except Exception as e:
+                logger.warning(f"Returns cache unreadable, recomputing from prices: {e}")
+            else:
+                missing = self._missing_symbols(cached, symbols)
+                if not missing:
+                    return self._filter_by_date(cached, start_date, end_date)
+
+                # Partial hit: compute the missing symbols over their full price
+                # history and merge them into the returns cache
+                logger.info(f"{len(missing)} symbols not in returns cache, computing from prices")
+                prices = self.get_prices(missing)
+                if prices.empty:
+                    return self._filter_by_date(cached, start_date, end_date)
+                returns = _simple_returns(prices)
+                existing = self.storage.load_returns()
+                self.storage.save_returns(returns if existing.empty else returns.combine_first(existing))
+                return self._combine_cached(cached, returns, symbols, start_date, end_date)
 
         # Calculate from prices
         prices = self.get_prices(symbols, start_date, end_date)
         if prices.empty:
             return pd.DataFrame()
 
-        returns = prices.pct_change()
+        returns = _simple_returns(prices)
         self.storage.save_returns(returns)
 
         return self._filter_by_date(returns, start_date, end_date)
@@ -116,10 +164,12 @@ class DataService:
         """
         logger.info("Refreshing price data...")
         try:
+            # Full-list refresh is HTTP-bound: fan out wider than ad-hoc fetches
             prices = self.provider.get_price_data(
                 self.stock_list,
                 self._get_default_start(),
-                datetime.now().strftime("%Y-%m-%d")
+                datetime.now().strftime("%Y-%m-%d"),
+                max_workers=UPDATE_CONFIG["prices"]["fetch_workers"]
             )
 
             if prices.empty:
@@ -128,7 +178,7 @@ class DataService:
             self.storage.save_prices(prices)
 
             # Also save returns
-            returns = prices.pct_change()
+            returns = _simple_returns(prices)
             self.storage.save_returns(returns)
 
             return {
@@ -232,25 +282,50 @@ class DataService:
         """Get default start date (5 years ago)"""
         return (datetime.now() - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
 
+    def _missing_symbols(self, cached: pd.DataFrame, symbols: Optional[List[str]]) -> List[str]:
+        """
+        Requested symbols a cached read did not return
+
+        An empty read (no rows in range, or none of the symbols cached)
+        counts every requested symbol (stock_list if None) as missing.
+        """
+        if cached.empty:
+            return list(symbols or self.stock_list)
+        return [symbol for symbol in symbols or [] if symbol not in cached.columns]
+
+    def _combine_cached(
+        self,
+        cached: pd.DataFrame,
+        fetched: pd.DataFrame,
+        symbols: Optional[List[str]],
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> pd.DataFrame:
+        """Join freshly fetched symbols onto a partial cache hit, in requested order"""
+        if cached.empty:
+            combined = fetched
+        else:
+            combined = cached.drop(columns=fetched.columns, errors="ignore").join(fetched, how="outer")
+        if symbols:
+            combined = combined[[symbol for symbol in symbols if symbol in combined.columns]]
+        return self._filter_by_date(combined, start_date, end_date)
+
     def _filter_by_date(
         self,
         df: pd.DataFrame,
         start_date: Optional[str],
         end_date: Optional[str]
     ) -> pd.DataFrame:
-        """Filter DataFrame by date range"""
-        if df.empty:
+        """Filter DataFrame by date range (binary-search slice on the sorted index)"""
+        if df.empty or not (start_date or end_date):
             return df
 
-        mask = pd.Series(True, index=df.index)
-
-        if start_date:
-            mask &= (df.index >= pd.to_datetime(start_date))
-
-        if end_date:
-            mask &= (df.index <= pd.to_datetime(end_date))
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
 
-        return df[mask]
+        start = pd.to_datetime(start_date) if start_date else None
+        end = pd.to_datetime(end_date) if end_date else None
+        return df.loc[start:end]
 
 
 # Convenience function for quick access
@@ -0,0 +1,32 @@
+"""
+LongTerm 配置加载 - 各模块共用
+
+按 (绝对路径, 修改时间) 缓存解析结果，同一进程内 DataUpdater / PortfolioOptimizer /
+PortfolioReport 共享一次 YAML 解析；文件修改后自动重新读取
+"""
+
+import os
+
+import yaml
+
+# LibYAML C 扩展可用时使用 C 解析器
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_config_cache = {}
+
+
+def load_config(path: str) -> dict:
+    """
+    读取 YAML 配置 (缓存结果为只读共享对象，调用方不要原地修改)
+
+    Args:
+        path: 配置文件路径
+
+    Returns:
+        配置字典；文件不存在时抛出 FileNotFoundError
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _config_cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            _config_cache[key] = yaml.load(f, Loader=_YAML_LOADER)
+    return _config_cache[key]
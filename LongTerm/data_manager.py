@@ -2,7 +2,7 @@
 统一数据管理层 - Parquet + SQLite 接口
 
 提供高效的数据读写接口，支持:
-- Parquet 格式存储行情数据 (prices, returns)
+- Feather (LZ4) / Parquet 格式存储行情数据 (prices, returns)
 - SQLite 存储信号和元数据
 - 向后兼容 CSV 读取
 - DataHub 集成
@@ -13,8 +13,10 @@ import sys
 import json
 import logging
 import sqlite3
+import threading
+import zlib
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from pathlib import Path
 import pandas as pd
 
@@ -32,11 +34,120 @@ except ImportError:
 
 try:
     import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
     import pyarrow.parquet as pq
     PYARROW_AVAILABLE = True
 except ImportError:
     PYARROW_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    import zstandard
+    MSGPACK_ZSTD_AVAILABLE = True
+except ImportError:
+    MSGPACK_ZSTD_AVAILABLE = False
+
+# 行情 Parquet 行组大小 (约一年的交易日)，按日期范围读取时可跳过无关行组；
+# 行组内再由页索引按页跳过
+PARQUET_ROW_GROUP_SIZE = 252
+
+PARQUET_WRITE_KWARGS = dict(
+    row_group_size=PARQUET_ROW_GROUP_SIZE,
+    compression='zstd',
+    compression_level=3,
+    data_page_size=64 * 1024,
+    write_statistics=True,
+    use_dictionary=True,
+    write_page_index=True,
+)
+
+# 行情默认存储格式: feather (Arrow IPC + LZ4，读取快) 或 parquet
+DEFAULT_STORAGE_FORMAT = 'feather'
+
+# 长连接的 SQLite 参数 (WAL 持久化在文件中，其余为连接级设置)
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA temp_store=MEMORY',
+)
+
+# 信号载荷编码: msgpack + zstd (可选依赖)，未安装时回退到 JSON + zlib
+SIGNAL_PAYLOAD_FORMAT = 'msgpack+zstd' if MSGPACK_ZSTD_AVAILABLE else 'json+zlib'
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节，安装了 orjson 时使用 orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data) -> Any:
+    """
+    解析 JSON 字节或文本，安装了 orjson 时使用 orjson
+
+    旧版 json.dumps 写入的记录可能含 NaN/Infinity，orjson 不接受这类字面量，遇到时回退到标准库
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _encode_payload(obj: Any) -> bytes:
+    """编码信号载荷为压缩二进制"""
+    if SIGNAL_PAYLOAD_FORMAT == 'msgpack+zstd':
+        return zstandard.ZstdCompressor().compress(msgpack.packb(obj, use_bin_type=True))
+    return zlib.compress(_json_dumps(obj))
+
+
+def _decode_payload(blob: bytes, fmt: str) -> Any:
+    """按写入时的编码格式解码信号载荷"""
+    if fmt == 'msgpack+zstd':
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(blob), raw=False)
+    return _json_loads(zlib.decompress(blob))
+
+
+# daily_signals 读取列 (新旧两种载荷列都取出，由 _signals_from_row 选择)
+SIGNAL_COLUMNS = (
+    "date, total_zt_count, signals_json, hot_sectors_json, generated_at, "
+    "signals_blob, hot_sectors_blob, payload_format"
+)
+
+def _arrow_to_pandas(table: "pa.Table") -> pd.DataFrame:
+    """
+    Arrow 表转 pandas (返回普通的可写 DataFrame)
+
+    不使用零拷贝/split_blocks: 那样得到的列直接引用只读的 Arrow 缓冲区，调用方原地修改会报错；
+    self_destruct 在转换过程中逐列释放 Arrow 内存，峰值内存约为一份数据
+    """
+    return table.to_pandas(self_destruct=True, use_threads=True)
+
+
+def _slice_dates(df: pd.DataFrame, start_date: Optional[str],
+                 end_date: Optional[str]) -> pd.DataFrame:
+    """按日期区间切片 (有序索引上二分定位边界，返回视图而非布尔掩码拷贝)"""
+    if not start_date and not end_date:
+        return df
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df.loc[start_date or None:end_date or None]
+
+
+# 涨停池缓存的 Hive 分区: year=YYYY/month=MM/date=YYYYMMDD/
+ZT_POOL_PARTITION_FIELDS = ('year', 'month', 'date')
+
 
 class DataManager:
     """统一数据管理器"""
@@ -79,13 +190,43 @@ class DataManager:
 
         self._init_db()
 
+    def close(self):
+        """关闭 SQLite 连接"""
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self):
-        """初始化 SQLite 数据库"""
+        """初始化 SQLite 数据库 (整个 DataManager 生命周期共用一个连接)"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256
+        )
+        # 按列名取值；查询统一走 self._conn.execute，复用连接级语句缓存
+        self._conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            self._conn.execute(pragma)
+
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            self._create_tables(cursor)
+            self._migrate_tables(cursor)
+
+    def _migrate_tables(self, cursor: sqlite3.Cursor):
+        """为旧库补充新增列"""
+        cursor.execute("PRAGMA table_info(daily_signals)")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, col_type in (
+            ('signals_blob', 'BLOB'),
+            ('hot_sectors_blob', 'BLOB'),
+            ('payload_format', 'TEXT'),
+        ):
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE daily_signals ADD COLUMN {column} {col_type}")
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """创建信号 / 权重历史 / 数据版本表"""
         # 创建信号表
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS daily_signals (
@@ -95,7 +236,10 @@ class DataManager:
                 signals_json TEXT,
                 hot_sectors_json TEXT,
                 generated_at TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                signals_blob BLOB,
+                hot_sectors_blob BLOB,
+                payload_format TEXT
             )
         ''')
 
@@ -110,6 +254,17 @@ class DataManager:
             )
         ''')
 
+        # get_weights_history(date) 的 ORDER BY weight DESC 直接走索引，无需排序；
+        # 索引首次创建时收集一次统计信息
+        index_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_weights_date_weight'"
+        ).fetchone()
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_weights_date_weight ON weights_history(date, weight DESC)"
+        )
+        if not index_exists:
+            cursor.execute("ANALYZE")
+
         # 创建数据版本表
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS data_versions (
@@ -121,43 +276,166 @@ class DataManager:
             )
         ''')
 
-        conn.commit()
-        conn.close()
-
-    # ============= Parquet 数据读写 =============
+    # ============= Parquet / Feather 数据读写 =============
 
     def _get_parquet_path(self, name: str) -> str:
         """获取 Parquet 文件路径"""
         return os.path.join(self.data_dir, f"{name}.parquet")
 
-    def save_prices(self, df: pd.DataFrame) -> bool:
+    def _get_feather_path(self, name: str) -> str:
+        """获取 Feather 文件路径"""
+        return os.path.join(self.data_dir, f"{name}.feather")
+
+    def _write_wide_feather(self, df: pd.DataFrame, path: str):
+        """写入宽格式行情 Feather v2 (LZ4 压缩，索引保存为 date 列)"""
+        table = pa.Table.from_pandas(df.sort_index().rename_axis('date'))
+        feather.write_feather(table, path, compression='lz4')
+
+    def _read_wide_feather(self, path: str,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           symbols: Optional[List[str]] = None) -> pd.DataFrame:
         """
-        保存价格数据到 Parquet
+        按日期范围 / 股票列读取宽格式行情 Feather
 
-        Args:
-            df: 宽格式 DataFrame，index 为日期，列为股票代码
+        以内存映射方式只读取需要的列，日期过滤在 Arrow 表上完成后再转 pandas
+        """
+        columns = None
+        if symbols is not None:
+            present = set(pa.ipc.open_file(path).schema.names)
+            columns = ['date'] + [s for s in symbols if s in present]
+
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        if start_date:
+            table = table.filter(pc.greater_equal(table['date'], pd.Timestamp(start_date)))
+        if end_date:
+            table = table.filter(pc.less_equal(table['date'], pd.Timestamp(end_date)))
+        return _arrow_to_pandas(table)
+
+    def _write_wide_parquet(self, df: pd.DataFrame, path: str):
+        """
+        写入宽格式行情 Parquet
 
-        Returns:
-            bool: 是否成功
+        按日期排序并以 date 列保存索引，配合按年划分的行组、列统计信息与页索引，
+        读取时可按日期下推过滤
         """
+        table = pa.Table.from_pandas(df.sort_index().rename_axis('date'))
+        # 合并为连续内存块，避免分块输入产生碎片化的行组
+        pq.write_table(table.combine_chunks(), path, **PARQUET_WRITE_KWARGS)
+
+    def _read_wide_parquet(self, path: str,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        按日期范围 / 股票列读取宽格式行情 Parquet
+
+        新格式文件将日期条件下推到 Parquet，只解码 min/max 与区间重叠的行组；
+        旧文件 (索引未命名为 date) 读取后再按索引切片。
+        指定 symbols 时只读取对应列块，其余列不解码
+        """
+        filters = []
+        if start_date:
+            filters.append(('date', '>=', pd.Timestamp(start_date)))
+        if end_date:
+            filters.append(('date', '<=', pd.Timestamp(end_date)))
+
+        names = pq.read_schema(path).names
+        columns = None
+        if symbols is not None:
+            present = set(names)
+            columns = [s for s in symbols if s in present]
+
+        if 'date' in names:
+            table = pq.read_table(
+                path,
+                columns=None if columns is None else ['date'] + columns,
+                filters=filters or None,
+                memory_map=True,
+                use_threads=True
+            )
+            return _arrow_to_pandas(table)
+
+        df = pd.read_parquet(path, columns=columns)
+        return _slice_dates(df, start_date, end_date)
+
+    def _save_wide(self, name: str, df: pd.DataFrame, format: str) -> bool:
+        """保存宽格式行情数据，并删除另一种格式的旧文件以免读到过期数据"""
         if not PYARROW_AVAILABLE:
             # 回退到 CSV
-            csv_path = os.path.join(self.data_dir, "prices.csv")
-            df.to_csv(csv_path)
+            csv_path = os.path.join(self.data_dir, f"{name}.csv")
+            df.sort_index().to_csv(csv_path)
             return True
 
+        if format == 'feather':
+            path, stale = self._get_feather_path(name), self._get_parquet_path(name)
+        else:
+            path, stale = self._get_parquet_path(name), self._get_feather_path(name)
+
         try:
-            path = self._get_parquet_path("prices")
-            df.to_parquet(path, engine='pyarrow', index=True)
-            self._update_version("prices", len(df))
+            if format == 'feather':
+                self._write_wide_feather(df, path)
+            else:
+                self._write_wide_parquet(df, path)
+            if os.path.exists(stale):
+                os.remove(stale)
+            # 版本号在同一事务内提交
+            with self._lock, self._conn:
+                self._update_version(name, len(df), conn=self._conn)
             return True
         except Exception as e:
-            print(f"保存 prices.parquet 失败: {e}")
+            print(f"保存 {os.path.basename(path)} 失败: {e}")
             return False
 
+    def _load_wide(self, name: str,
+                   start_date: Optional[str] = None,
+                   end_date: Optional[str] = None,
+                   symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        """从本地文件读取宽格式行情数据: Feather > Parquet > CSV"""
+        feather_path = self._get_feather_path(name)
+        parquet_path = self._get_parquet_path(name)
+        csv_path = os.path.join(self.data_dir, f"{name}.csv")
+
+        # 优先读取 Feather
+        if PYARROW_AVAILABLE and os.path.exists(feather_path):
+            try:
+                return self._read_wide_feather(feather_path, start_date, end_date, symbols)
+            except Exception as e:
+                print(f"读取 {name}.feather 失败: {e}")
+
+        # 其次读取 Parquet
+        if PYARROW_AVAILABLE and os.path.exists(parquet_path):
+            try:
+                return self._read_wide_parquet(parquet_path, start_date, end_date, symbols)
+            except Exception as e:
+                print(f"读取 {name}.parquet 失败: {e}")
+
+        # 回退到 CSV
+        if os.path.exists(csv_path):
+            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+            if symbols is not None:
+                df = df[[s for s in symbols if s in df.columns]]
+            return _slice_dates(df, start_date, end_date)
+
+        return pd.DataFrame()
+
+    def save_prices(self, df: pd.DataFrame, format: str = DEFAULT_STORAGE_FORMAT) -> bool:
+        """
+        保存价格数据到 Feather / Parquet
+
+        Args:
+            df: 宽格式 DataFrame，index 为日期，列为股票代码
+            format: 存储格式 ('feather' 或 'parquet')
+
+        Returns:
+            bool: 是否成功
+        """
+        return self._save_wide("prices", df, format)
+
     def get_prices(self, start_date: Optional[str] = None,
                    end_date: Optional[str] = None,
-                   use_datahub: bool = None) -> pd.DataFrame:
+                   use_datahub: bool = None,
+                   symbols: Optional[List[str]] = None) -> pd.DataFrame:
         """
         读取价格数据
 
@@ -165,6 +443,7 @@ class DataManager:
             start_date: 开始日期 (YYYY-MM-DD)
             end_date: 结束日期 (YYYY-MM-DD)
             use_datahub: 是否使用 DataHub (None=使用默认设置)
+            symbols: 只读取的股票列 (None=全部)
 
         Returns:
             pd.DataFrame: 价格数据
@@ -176,6 +455,7 @@ class DataManager:
         if use_datahub and self.datahub_service:
             try:
                 df = self.datahub_service.get_prices(
+                    symbols=symbols,
                     start_date=start_date,
                     end_date=end_date,
                     use_cache=True
@@ -187,59 +467,25 @@ class DataManager:
                 logger.warning(f"DataHub unavailable: {e}")
 
         # 回退到本地文件
-        parquet_path = self._get_parquet_path("prices")
-        csv_path = os.path.join(self.data_dir, "prices.csv")
+        return self._load_wide("prices", start_date, end_date, symbols)
 
-        # 优先读取 Parquet
-        if PYARROW_AVAILABLE and os.path.exists(parquet_path):
-            try:
-                df = pd.read_parquet(parquet_path)
-                if start_date:
-                    df = df[df.index >= start_date]
-                if end_date:
-                    df = df[df.index <= end_date]
-                return df
-            except Exception as e:
-                print(f"读取 prices.parquet 失败: {e}")
-
-        # 回退到 CSV
-        if os.path.exists(csv_path):
-            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
-            if start_date:
-                df = df[df.index >= start_date]
-            if end_date:
-                df = df[df.index <= end_date]
-            return df
-
-        return pd.DataFrame()
-
-    def save_returns(self, df: pd.DataFrame) -> bool:
+    def save_returns(self, df: pd.DataFrame, format: str = DEFAULT_STORAGE_FORMAT) -> bool:
         """
-        保存收益率数据到 Parquet
+        保存收益率数据到 Feather / Parquet
 
         Args:
             df: 宽格式 DataFrame，index 为日期，列为股票代码
+            format: 存储格式 ('feather' 或 'parquet')
 
         Returns:
             bool: 是否成功
         """
-        if not PYARROW_AVAILABLE:
-            csv_path = os.path.join(self.data_dir, "returns.csv")
-            df.to_csv(csv_path)
-            return True
-
-        try:
-            path = self._get_parquet_path("returns")
-            df.to_parquet(path, engine='pyarrow', index=True)
-            self._update_version("returns", len(df))
-            return True
-        except Exception as e:
-            print(f"保存 returns.parquet 失败: {e}")
-            return False
+        return self._save_wide("returns", df, format)
 
     def get_returns(self, start_date: Optional[str] = None,
                     end_date: Optional[str] = None,
-                    use_datahub: bool = None) -> pd.DataFrame:
+                    use_datahub: bool = None,
+                    symbols: Optional[List[str]] = None) -> pd.DataFrame:
         """
         读取收益率数据
 
@@ -247,6 +493,7 @@ class DataManager:
             start_date: 开始日期 (YYYY-MM-DD)
             end_date: 结束日期 (YYYY-MM-DD)
             use_datahub: 是否使用 DataHub (None=使用默认设置)
+            symbols: 只读取的股票列 (None=全部)
 
         Returns:
             pd.DataFrame: 收益率数据
@@ -258,6 +505,7 @@ class DataManager:
         if use_datahub and self.datahub_service:
             try:
                 df = self.datahub_service.get_returns(
+                    symbols=symbols,
                     start_date=start_date,
                     end_date=end_date,
                     use_cache=True
@@ -269,37 +517,24 @@ class DataManager:
                 logger.warning(f"DataHub unavailable: {e}")
 
         # 回退到本地文件
-        parquet_path = self._get_parquet_path("returns")
-        csv_path = os.path.join(self.data_dir, "returns.csv")
-
-        # 优先读取 Parquet
-        if PYARROW_AVAILABLE and os.path.exists(parquet_path):
-            try:
-                df = pd.read_parquet(parquet_path)
-                if start_date:
-                    df = df[df.index >= start_date]
-                if end_date:
-                    df = df[df.index <= end_date]
-                return df
-            except Exception as e:
-                print(f"读取 returns.parquet 失败: {e}")
+        return self._load_wide("returns", start_date, end_date, symbols)
 
-        # 回退到 CSV
-        if os.path.exists(csv_path):
-            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
-            if start_date:
-                df = df[df.index >= start_date]
-            if end_date:
-                df = df[df.index <= end_date]
-            return df
+    # ============= 涨停池缓存 =============
 
-        return pd.DataFrame()
+    def _zt_pool_root(self) -> str:
+        """涨停池缓存根目录"""
+        return os.path.join(self.cache_dir, "zt_pool")
 
-    # ============= 涨停池缓存 =============
+    def _zt_pool_partitioning(self):
+        """涨停池 Hive 分区定义 (分区值均按字符串处理，保留前导零)"""
+        return ds.partitioning(
+            pa.schema([(name, pa.string()) for name in ZT_POOL_PARTITION_FIELDS]),
+            flavor="hive"
+        )
 
     def save_zt_pool(self, df: pd.DataFrame, date: str) -> bool:
         """
-        保存涨停池数据 (按年/月组织)
+        保存涨停池数据 (Hive 分区: year=YYYY/month=MM/date=YYYYMMDD)
 
         Args:
             df: 涨停池数据
@@ -311,22 +546,29 @@ class DataManager:
         year = date[:4]
         month = date[4:6]
 
-        cache_path = os.path.join(
-            self.cache_dir, "zt_pool", year, month,
-            f"{date}.parquet"
-        )
-
-        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-
         if PYARROW_AVAILABLE:
             try:
-                df.to_parquet(cache_path, engine='pyarrow', index=False)
+                # 分区列由目录名表示，不写入文件本身
+                data = df.drop(columns=[c for c in ZT_POOL_PARTITION_FIELDS if c in df.columns])
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                for name, value in zip(ZT_POOL_PARTITION_FIELDS, (year, month, date)):
+                    table = table.append_column(name, pa.array([value] * len(table), pa.string()))
+                ds.write_dataset(
+                    table,
+                    base_dir=self._zt_pool_root(),
+                    format="parquet",
+                    partitioning=self._zt_pool_partitioning(),
+                    basename_template="part-{i}.parquet",
+                    # 重复保存同一天只替换该日分区
+                    existing_data_behavior="delete_matching"
+                )
                 return True
             except Exception as e:
                 print(f"保存涨停池缓存失败: {e}")
 
         # 回退到 CSV
-        csv_path = cache_path.replace('.parquet', '.csv')
+        csv_path = os.path.join(self._zt_pool_root(), year, month, f"{date}.csv")
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         df.to_csv(csv_path, index=False, encoding='utf-8-sig')
         return True
 
@@ -342,32 +584,56 @@ class DataManager:
         """
         year = date[:4]
         month = date[4:6]
+        root = self._zt_pool_root()
 
-        # 尝试 Parquet
         if PYARROW_AVAILABLE:
-            parquet_path = os.path.join(
-                self.cache_dir, "zt_pool", year, month,
-                f"{date}.parquet"
-            )
+            # 直接读取当日分区目录
+            partition = os.path.join(root, f"year={year}", f"month={month}", f"date={date}")
+            if os.path.isdir(partition):
+                return pq.read_table(partition, partitioning=None).to_pandas()
+
+            # 旧版按 年/月/日期.parquet 组织的缓存
+            parquet_path = os.path.join(root, year, month, f"{date}.parquet")
             if os.path.exists(parquet_path):
                 return pd.read_parquet(parquet_path)
 
         # 回退到 CSV
-        csv_path = os.path.join(
-            self.cache_dir, "zt_pool", year, month,
-            f"{date}.csv"
-        )
+        csv_path = os.path.join(root, year, month, f"{date}.csv")
         if os.path.exists(csv_path):
             return pd.read_csv(csv_path, encoding='utf-8-sig')
 
         return pd.DataFrame()
 
+    def get_zt_pool_range(self, start: str, end: str) -> pd.DataFrame:
+        """
+        读取日期区间内的涨停池数据 (一次数据集扫描)
+
+        按 date 分区裁剪，区间外的分区文件不会被打开
+
+        Args:
+            start: 开始日期 (YYYYMMDD 格式)
+            end: 结束日期 (YYYYMMDD 格式)
+
+        Returns:
+            pd.DataFrame: 涨停池数据，date 列标识所属日期
+        """
+        root = self._zt_pool_root()
+        if not PYARROW_AVAILABLE or not os.path.isdir(root):
+            return pd.DataFrame()
+
+        dataset = ds.dataset(root, format="parquet", partitioning=self._zt_pool_partitioning())
+        date = ds.field("date")
+        table = dataset.to_table(filter=(date >= start) & (date <= end))
+        return table.drop_columns(["year", "month"]).to_pandas()
+
     # ============= SQLite 信号存储 =============
 
     def save_daily_signals(self, date: str, signals: Dict[str, Any]) -> bool:
         """
         保存每日信号到 SQLite
 
+        信号列表与热门板块以压缩二进制 (BLOB) 存储，JSON 文本列留空
+
         Args:
             date: 日期 (YYYYMMDD 格式)
             signals: 信号数据字典
@@ -376,23 +642,19 @@ class DataManager:
             bool: 是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_signals
-                (date, total_zt_count, signals_json, hot_sectors_json, generated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                date,
-                signals.get('total_zt_count'),
-                json.dumps(signals.get('signals', []), ensure_ascii=False),
-                json.dumps(signals.get('hot_sectors', []), ensure_ascii=False),
-                signals.get('generated_at')
-            ))
-
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute('''
+                    INSERT OR REPLACE INTO daily_signals
+                    (date, total_zt_count, signals_blob, hot_sectors_blob, payload_format, generated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    date,
+                    signals.get('total_zt_count'),
+                    _encode_payload(signals.get('signals', [])),
+                    _encode_payload(signals.get('hot_sectors', [])),
+                    SIGNAL_PAYLOAD_FORMAT,
+                    signals.get('generated_at')
+                ))
             return True
         except Exception as e:
             print(f"保存信号失败: {e}")
@@ -408,27 +670,52 @@ class DataManager:
         Returns:
             Dict: 信号数据
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {SIGNAL_COLUMNS} FROM daily_signals WHERE date = ?", (date,)
+            ).fetchone()
 
-        cursor.execute('''
-            SELECT total_zt_count, signals_json, hot_sectors_json, generated_at
-            FROM daily_signals WHERE date = ?
-        ''', (date,))
+        return self._signals_from_row(row) if row else {}
 
-        row = cursor.fetchone()
-        conn.close()
+    def iter_daily_signals(self, start: str, end: str) -> Iterator[Dict[str, Any]]:
+        """
+        按日期区间逐条读取每日信号 (批量回填用)
 
-        if row:
-            return {
-                'date': date,
-                'total_zt_count': row[0],
-                'signals': json.loads(row[1]) if row[1] else [],
-                'hot_sectors': json.loads(row[2]) if row[2] else [],
-                'generated_at': row[3]
-            }
+        Args:
+            start: 开始日期 (YYYYMMDD 格式)
+            end: 结束日期 (YYYYMMDD 格式)
 
-        return {}
+        Yields:
+            Dict: 单日信号数据，按日期升序
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SIGNAL_COLUMNS} FROM daily_signals "
+                "WHERE date BETWEEN ? AND ? ORDER BY date",
+                (start, end)
+            ).fetchall()
+
+        for row in rows:
+            yield self._signals_from_row(row)
+
+    @staticmethod
+    def _signals_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """daily_signals 行转为信号字典"""
+        fmt = row['payload_format']
+
+        def _load(blob, text):
+            # 新记录读 BLOB，旧记录回退到 JSON 文本列
+            if blob is not None:
+                return _decode_payload(blob, fmt)
+            return _json_loads(text) if text else []
+
+        return {
+            'date': row['date'],
+            'total_zt_count': row['total_zt_count'],
+            'signals': _load(row['signals_blob'], row['signals_json']),
+            'hot_sectors': _load(row['hot_sectors_blob'], row['hot_sectors_json']),
+            'generated_at': row['generated_at']
+        }
 
     def save_weights_history(self, date: str, weights: pd.DataFrame) -> bool:
         """
@@ -442,17 +729,17 @@ class DataManager:
             bool: 是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            for _, row in weights.iterrows():
-                cursor.execute('''
+            rows = [
+                (date, symbol, float(weight))
+                for symbol, weight in zip(weights['symbol'].to_numpy(), weights['weight'].to_numpy())
+            ]
+
+            # 单个事务批量写入
+            with self._lock, self._conn:
+                self._conn.executemany('''
                     INSERT OR REPLACE INTO weights_history (date, symbol, weight)
                     VALUES (?, ?, ?)
-                ''', (date, row['symbol'], row['weight']))
-
-            conn.commit()
-            conn.close()
+                ''', rows)
             return True
         except Exception as e:
             print(f"保存权重历史失败: {e}")
@@ -468,62 +755,61 @@ class DataManager:
         Returns:
             pd.DataFrame: 权重历史
         """
-        conn = sqlite3.connect(self.db_path)
-
-        if date:
-            df = pd.read_sql_query(
-                "SELECT * FROM weights_history WHERE date = ? ORDER BY weight DESC",
-                conn, params=(date,)
-            )
-        else:
-            df = pd.read_sql_query(
-                "SELECT * FROM weights_history ORDER BY date DESC, weight DESC",
-                conn
-            )
+        with self._lock:
+            if date:
+                df = pd.read_sql_query(
+                    "SELECT * FROM weights_history WHERE date = ? ORDER BY weight DESC",
+                    self._conn, params=(date,)
+                )
+            else:
+                df = pd.read_sql_query(
+                    "SELECT * FROM weights_history ORDER BY date DESC, weight DESC",
+                    self._conn
+                )
 
-        conn.close()
         return df
 
     # ============= 版本管理 =============
 
-    def _update_version(self, name: str, count: int):
-        """更新数据版本信息"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _update_version(self, name: str, count: int, conn: Optional[sqlite3.Connection] = None):
+        """
+        更新数据版本信息
 
-        cursor.execute('''
+        Args:
+            name: 数据名称
+            count: 记录数
+            conn: 调用方已开启事务的连接；为 None 时单独提交
+        """
+        sql = '''
             INSERT OR REPLACE INTO data_versions (name, version, last_updated, record_count)
             VALUES (?, COALESCE((SELECT version FROM data_versions WHERE name = ?), 0) + 1, ?, ?)
-        ''', (name, name, datetime.now().isoformat(), count))
-
-        conn.commit()
-        conn.close()
+        '''
+        params = (name, name, datetime.now().isoformat(), count)
+        if conn is not None:
+            conn.execute(sql, params)
+            return
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
 
     def get_version(self, name: str) -> Dict[str, Any]:
         """获取数据版本信息"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT version, last_updated, record_count FROM data_versions WHERE name = ?
-        ''', (name,))
-
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute('''
+                SELECT version, last_updated, record_count FROM data_versions WHERE name = ?
+            ''', (name,)).fetchone()
 
         if row:
             return {
-                'version': row[0],
-                'last_updated': row[1],
-                'record_count': row[2]
+                'version': row['version'],
+                'last_updated': row['last_updated'],
+                'record_count': row['record_count']
             }
         return {}
 
     def get_all_versions(self) -> Dict[str, Dict[str, Any]]:
         """获取所有数据版本"""
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM data_versions", conn)
-        conn.close()
+        with self._lock:
+            df = pd.read_sql_query("SELECT * FROM data_versions", self._conn)
 
         return df.set_index('name').to_dict('index')
 
@@ -15,11 +15,14 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import time
-import yaml
-from scipy import stats
+import pyarrow.parquet as pq
+from scipy.signal import lfilter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from DataHub.services.data_service import DataService
-from DataHub.core.data_client import UnifiedDataClient
+from DataHub.core.data_client import UnifiedDataClient, retry_call
+
+from config_loader import load_config
 
 # 尝试导入可选库
 try:
@@ -28,6 +31,303 @@ try:
 except ImportError:
     HAS_QUANTDATA = False
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+# 本地下载的默认并发数 (可在 config.yaml 中用 download_workers 覆盖)
+DOWNLOAD_WORKERS = 8
+
+# 单标的行情缓存子目录 (位于 data_dir 下，每个标的一个 Parquet 文件)
+OHLCV_CACHE_DIR = "ohlcv"
+
+# 无风险利率缓存有效期 (秒)，国债收益率按日更新
+RISK_FREE_RATE_TTL = 24 * 3600
+
+# 全量下载的起始日期
+HIST_START_DATE = "2010-01-01"
+
+# 行情缓存中最高/最低价的列名 (akshare/baostock 为中文，新浪 ETF 接口为英文)
+HIGH_LOW_COLUMNS = {'high': ('最高', 'high'), 'low': ('最低', 'low')}
+
+# 合并后的收盘价宽表 (index 为日期，列为代码)；收益率不再单独落盘，按需由价格计算
+PRICES_FILE = "prices.parquet"
+
+# 收益率矩阵精度: 日收益率量级 1e-2，单精度足够，协方差/优化读取的数据量减半；
+# 价格及 RSRS 前缀和等趋势指标仍用 float64 (累加误差敏感)
+RETURNS_DTYPE = np.float32
+
+# 滚动 Z-Score 的零波动判定: 窗口标准差不超过 |均值| 的该比例时视为无波动 (结果为 NaN)。
+# 收盘价 ±2% 近似高低价时 RSRS 斜率恒为 1.02/0.98，标准差只剩舍入误差，不能据此给出信号
+ZSCORE_STD_RTOL = 1e-8
+
+
+def _llt_loop(price: np.ndarray, alpha: float) -> np.ndarray:
+    """LLT 递推: out[i] = α·price[i] + (1-α)·out[i-1]，前两项取原价"""
+    out = np.empty_like(price)
+    out[0] = price[0]
+    out[1] = price[1]
+    for i in range(2, len(price)):
+        out[i] = alpha * price[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def _llt_lfilter(price: np.ndarray, alpha: float) -> np.ndarray:
+    """与 _llt_loop 相同的递推，用 scipy.signal.lfilter 一阶 IIR 滤波在 C 中完成 (沿第 0 轴)"""
+    out = np.array(price, dtype=np.float64)
+    if len(out) > 2:
+        # 从第 1 行起滤波，初始状态使首项输出等于 price[1]
+        zi = ((1 - alpha) * out[1])[np.newaxis, ...]
+        out[1:] = lfilter([alpha], [1.0, alpha - 1.0], out[1:], axis=0, zi=zi)[0]
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # 串行递推无法向量化，编译为原生循环
+    _llt_loop = njit(cache=True, fastmath=True)(_llt_loop)
+else:
+    _llt_loop = _llt_lfilter
+
+
+def _rolling_mean_std(x: np.ndarray, w: int):
+    """
+    单次扫描计算滚动均值与样本标准差 (ddof=1，与 pandas rolling 口径一致)
+
+    窗口未满或含 NaN 时输出 NaN；标准差不超过 ZSCORE_STD_RTOL·|均值| 时为 NaN。
+    累加前减去首个有效值，近似常数序列的方差不会被大数相消的舍入误差淹没
+    """
+    size = len(x)
+    mean = np.full(size, np.nan)
+    std = np.full(size, np.nan)
+    shift = 0.0
+    for i in range(size):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+    total = 0.0
+    total_sq = 0.0
+    n_nan = 0
+    for i in range(size):
+        v = x[i] - shift
+        if np.isnan(v):
+            n_nan += 1
+        else:
+            total += v
+            total_sq += v * v
+        if i >= w:
+            old = x[i - w] - shift
+            if np.isnan(old):
+                n_nan -= 1
+            else:
+                total -= old
+                total_sq -= old * old
+        if i >= w - 1 and n_nan == 0:
+            m = total / w
+            var = (total_sq - total * m) / (w - 1)
+            mean[i] = m + shift
+            if var > (ZSCORE_STD_RTOL * (m + shift)) ** 2:
+                std[i] = np.sqrt(var)
+    return mean, std
+
+
+if NUMBA_AVAILABLE:
+    _rolling_mean_std = njit(cache=True)(_rolling_mean_std)
+
+
+def _batch_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      ma_period: int, rsrs_n: int, rsrs_window: int, llt_alpha: float) -> np.ndarray:
+    """
+    逐列计算最新一期的趋势指标 (numba 下各列并行)
+
+    只计算判断所需的末端数值: MA 末值与 20 日前的值、RSRS 末端窗口的 Z-Score、LLT 末两期。
+    口径与 _rolling_ols_slope / _rolling_zscore / _llt_loop 一致，窗口含缺失值时为 NaN
+
+    Args:
+        close / high / low: T×N 价格矩阵
+        ma_period: 均线周期
+        rsrs_n: RSRS 回归窗口
+        rsrs_window: RSRS Z-Score 窗口
+        llt_alpha: LLT 平滑系数
+
+    Returns:
+        N×6 矩阵，列为 (收盘价, MA, 20 日前 MA, RSRS Z-Score, LLT, 前一期 LLT)
+    """
+    t, n_cols = close.shape
+    out = np.full((n_cols, 6), np.nan)
+    for j in prange(n_cols):
+        out[j, 0] = close[t - 1, j]
+
+        # MA 末值与 20 日前 (iloc[-20]) 的值
+        for k, end in ((1, t), (2, t - 19)):
+            if end - ma_period >= 0:
+                total = 0.0
+                for i in range(end - ma_period, end):
+                    total += close[i, j]
+                out[j, k] = total / ma_period
+
+        # RSRS: 末端 rsrs_window 个斜率 (第 i 个为 [i-rsrs_n, i) 窗口) 的 Z-Score
+        if t - rsrs_window >= rsrs_n:
+            slopes = np.empty(rsrs_window)
+            for w in range(rsrs_window):
+                i = t - rsrs_window + w
+                mx = 0.0
+                my = 0.0
+                for k in range(i - rsrs_n, i):
+                    mx += low[k, j]
+                    my += high[k, j]
+                mx /= rsrs_n
+                my /= rsrs_n
+                sxx = 0.0
+                syy = 0.0
+                sxy = 0.0
+                for k in range(i - rsrs_n, i):
+                    dx = low[k, j] - mx
+                    dy = high[k, j] - my
+                    sxx += dx * dx
+                    syy += dy * dy
+                    sxy += dx * dy
+                # 无波动窗口 (按价格水平取相对阈值，排除舍入残差) 与缺失窗口均为 NaN
+                scale = max(mx * mx, my * my, 1e-300)
+                if sxx > 1e-10 * rsrs_n * scale and syy > 1e-10 * rsrs_n * scale:
+                    slopes[w] = sxy / sxx
+                else:
+                    slopes[w] = np.nan
+            mean = slopes.mean()
+            var = ((slopes - mean) ** 2).sum() / (rsrs_window - 1)
+            if var > (ZSCORE_STD_RTOL * mean) ** 2:
+                out[j, 3] = (slopes[-1] - mean) / np.sqrt(var)
+
+        # LLT 末两期
+        if t >= 2:
+            llt = _llt_loop(np.ascontiguousarray(close[:, j]), llt_alpha)
+            out[j, 4] = llt[t - 1]
+            out[j, 5] = llt[t - 2]
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # 各股票指标链相互独立，按列并行
+    _batch_indicators = njit(cache=True, parallel=True)(_batch_indicators)
+
+
+def _rolling_ols_slope(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    y 对 x 的滚动 OLS 斜率 (沿第 0 轴，支持一维或 T×N 二维数组)
+
+    第 i 行为 [i-n, i) 窗口的斜率，由前缀和一次算出全部窗口:
+    slope = (n·Σxy - Σx·Σy) / (n·Σx² - (Σx)²)；窗口含缺失值或 x/y 无波动时为 NaN
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    slope = np.full(x.shape, np.nan)
+    if len(x) <= n:
+        return slope
+
+    # 缺失值置 0 并单独计数；先减去均值再累加，避免大数相减的精度损失
+    missing = np.isnan(x) | np.isnan(y)
+    count = np.maximum((~missing).sum(axis=0), 1)
+    x = np.where(missing, 0.0, x)
+    y = np.where(missing, 0.0, y)
+    x = np.where(missing, 0.0, x - x.sum(axis=0) / count)
+    y = np.where(missing, 0.0, y - y.sum(axis=0) / count)
+
+    def window_sum(values: np.ndarray) -> np.ndarray:
+        csum = np.cumsum(values, axis=0)
+        csum = np.concatenate((np.zeros((1,) + csum.shape[1:]), csum))
+        return csum[n:-1] - csum[:-n - 1]
+
+    sx, sy = window_sum(x), window_sum(y)
+    sxx = n * window_sum(x * x) - sx * sx
+    syy = n * window_sum(y * y) - sy * sy
+    sxy = n * window_sum(x * y) - sx * sy
+
+    # 方差为 0 (或仅剩舍入误差) 的窗口不计算斜率
+    scale = np.maximum(np.maximum((x * x).max(axis=0), (y * y).max(axis=0)), np.finfo(np.float64).tiny)
+    tol = 1e-10 * n * n * scale
+    valid = (sxx > tol) & (syy > tol) & (window_sum(missing.astype(np.float64)) == 0)
+    slope[n:] = np.divide(sxy, sxx, out=np.full(sxx.shape, np.nan), where=valid)
+    return slope
+
+
+def _rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滚动 Z-Score (沿第 0 轴，支持一维或 T×N 二维数组，样本标准差)
+
+    窗口标准差不超过 ZSCORE_STD_RTOL·|均值| (无波动，仅剩舍入误差) 时为 NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        # 均值与标准差在同一次扫描中得到，逐列调用编译内核
+        columns = values.reshape(len(values), -1)
+        zscore = np.empty_like(columns)
+        for j in range(columns.shape[1]):
+            col = np.ascontiguousarray(columns[:, j])
+            mean, std = _rolling_mean_std(col, window)
+            zscore[:, j] = (col - mean) / std
+        return zscore.reshape(values.shape)
+
+    rolling = pd.DataFrame(values.reshape(len(values), -1)).rolling(window)
+    mean = rolling.mean().to_numpy().reshape(values.shape)
+    std = rolling.std().to_numpy().reshape(values.shape)
+    # 无波动的位置直接置 NaN，不再复制一份替换后的 std
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > ZSCORE_STD_RTOL * np.abs(mean), (values - mean) / std, np.nan)
+
+
+def read_prices(data_dir: str) -> pd.DataFrame:
+    """读取 data_dir 下的收盘价宽表，兼容旧版 prices.csv"""
+    path = os.path.join(data_dir, PRICES_FILE)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    # 旧版 CSV: pyarrow 多线程解析，数值列直接读为 float64
+    prices = pd.read_csv(os.path.join(data_dir, "prices.csv"), engine='pyarrow', index_col=0)
+    prices.index = pd.DatetimeIndex(pd.to_datetime(prices.index), name=prices.index.name or None)
+    return prices.astype(np.float64)
+
+
+def read_high_low(data_dir: str, symbol: str):
+    """
+    从单标的行情缓存中只读取最高/最低价两列
+
+    Returns:
+        列为 high/low 的 DataFrame，无缓存或缺少对应列时返回 None
+    """
+    path = os.path.join(data_dir, OHLCV_CACHE_DIR, f"{symbol}.parquet")
+    if not os.path.exists(path):
+        return None
+
+    names = set(pq.read_schema(path).names)
+    columns = {}
+    for key, candidates in HIGH_LOW_COLUMNS.items():
+        found = next((c for c in candidates if c in names), None)
+        if found is None:
+            return None
+        columns[found] = key
+    return pd.read_parquet(path, columns=list(columns)).rename(columns=columns)
+
+
+def prices_to_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """由收盘价计算日收益率 (剔除任一标的缺失的日期，单精度存放)"""
+    return prices.pct_change().dropna().astype(RETURNS_DTYPE)
+
+
+def max_drawdown(port_returns) -> float:
+    """
+    最大回撤 (按复利净值计算，净值从 1 起步)
+
+    Args:
+        port_returns: 组合日收益率序列
+
+    Returns:
+        最大回撤 (非正数，如 -0.25 表示 25% 回撤)
+    """
+    nav = np.cumprod(1.0 + np.asarray(port_returns, dtype=np.float64))
+    peak = np.maximum(np.maximum.accumulate(nav), 1.0)
+    return float((nav / peak).min() - 1.0) if len(nav) else 0.0
+
 
 class TrendAnalyzer:
     """趋势分析器 - 计算 MA / RSRS / LLT 等技术指标"""
@@ -43,68 +343,36 @@ class TrendAnalyzer:
         return result
 
     def calculate_rsrs(self, df: pd.DataFrame, n: int = 18) -> pd.Series:
-        """计算 RSRS 斜率"""
-        rsrs_values = []
-
-        for i in range(len(df)):
-            if i < n:
-                rsrs_values.append(np.nan)
-                continue
-
-            highs = df['high'].iloc[i-n:i]
-            lows = df['low'].iloc[i-n:i]
-
-            if lows.std() == 0 or highs.std() == 0:
-                rsrs_values.append(np.nan)
-                continue
-
-            slope, _, _, _, _ = stats.linregress(lows, highs)
-            rsrs_values.append(slope)
-
-        return pd.Series(rsrs_values, index=df.index)
+        """计算 RSRS 斜率 ([i-n, i) 窗口内 high 对 low 的 OLS 斜率)"""
+        return pd.Series(_rolling_ols_slope(df['low'], df['high'], n), index=df.index)
 
     def calculate_rsrs_zscore(self, df: pd.DataFrame, n: int = 18, window: int = 600) -> pd.Series:
         """计算 RSRS Z-Score"""
         rsrs = self.calculate_rsrs(df, n)
-        rsrs_mean = rsrs.rolling(window).mean()
-        rsrs_std = rsrs.rolling(window).std()
-
-        rsrs_std = rsrs_std.replace(0, np.nan)
-        zscore = (rsrs - rsrs_mean) / rsrs_std
-
-        return zscore
+        return pd.Series(_rolling_zscore(rsrs.to_numpy(), window), index=df.index)
 
     def calculate_llt(self, df: pd.DataFrame, n: int = 10) -> pd.Series:
         """计算 LLT 低延迟趋势线"""
-        price = df['close'].values
-        llt = np.full(len(price), np.nan)
-
-        alpha = 2 / (n + 1)
-
-        llt[0] = price[0]
-        llt[1] = price[1]
-
-        for i in range(2, len(price)):
-            llt[i] = alpha * price[i] + (1 - alpha) * llt[i-1]
-
-        return pd.Series(llt, index=df.index)
+        price = df['close'].to_numpy(dtype=np.float64)
+        return pd.Series(_llt_loop(price, 2 / (n + 1)), index=df.index)
 
     def calculate_pe_percentile(self, pe_series: pd.Series, window: int = 2500) -> float:
         """
-        计算当前 PE 在历史中的分位数
+        计算当前 PE 在历史中的分位数 (经验分位: 历史中不高于当前值的比例)
         约 10 年历史数据
         """
         if len(pe_series) < window:
             return 1.0  # 数据不足，默认为不便宜
 
         current_pe = pe_series.iloc[-1]
-        hist_pe = pe_series.iloc[-window:-1]
+        hist_pe = pe_series.iloc[-window:-1].to_numpy(dtype=np.float64)
+        hist_pe = np.sort(hist_pe[~np.isnan(hist_pe)])
 
-        if hist_pe.min() == hist_pe.max():
+        if len(hist_pe) == 0 or hist_pe[0] == hist_pe[-1]:
             return 0.5
 
-        percentile = (current_pe - hist_pe.min()) / (hist_pe.max() - hist_pe.min())
-        return min(1.0, max(0.0, percentile))
+        # 当前 PE 缺失时 searchsorted 返回末尾，按不便宜处理
+        return float(np.searchsorted(hist_pe, current_pe, side='right') / len(hist_pe))
 
     def analyze_stock(self, df: pd.DataFrame, pe_percentile: float,
                       ma_period: int = 250, rsrs_threshold: float = 0.7) -> dict:
@@ -123,6 +391,81 @@ class TrendAnalyzer:
         if len(df) < ma_period:
             return {'status': 'INSUFFICIENT_DATA', 'reason': f'数据不足 {len(df)} 天'}
 
+        # 2. MA 判断
+        df_ma = self.calculate_ma(df, [ma_period])
+        ma = df_ma[f'ma_{ma_period}']
+
+        # 3. RSRS 判断
+        rsrs_zscore = self.calculate_rsrs_zscore(df)
+
+        # 4. LLT 判断
+        llt = self.calculate_llt(df)
+
+        return self._classify(
+            pe_percentile, df['close'].iloc[-1], ma.iloc[-1], ma.iloc[-20],
+            rsrs_zscore.iloc[-1] if not rsrs_zscore.empty else None,
+            llt.iloc[-1], llt.iloc[-2], rsrs_threshold
+        )
+
+    def analyze_prices(self, prices: pd.DataFrame, pe_percentiles: dict,
+                       ma_period: int = 250, rsrs_threshold: float = 0.7,
+                       high: pd.DataFrame = None, low: pd.DataFrame = None) -> dict:
+        """
+        按收盘价宽表一次性分析全部股票 (指标口径与 analyze_stock 相同)
+
+        MA / RSRS / LLT 在 T×N 矩阵上按列同时计算。
+        注意: 价格文件只有收盘价，未提供 high/low 时以收盘价 ±2% 近似，此时 RSRS 斜率恒为
+        1.02/0.98，Z-Score 为 NaN，RSRS 不给出信号 (只由 MA / LLT 判断)
+
+        Args:
+            prices: 收盘价宽表 (index 为日期，列为代码)
+            pe_percentiles: {symbol: pe_percentile}，缺失时取 0.5
+            ma_period: 均线周期
+            rsrs_threshold: RSRS Z-Score 阈值
+            high: 最高价宽表 (与 prices 对齐)，缺失的位置用收盘价 +2% 近似
+            low: 最低价宽表 (与 prices 对齐)，缺失的位置用收盘价 -2% 近似
+
+        Returns:
+            {symbol: analysis_result}
+        """
+        if len(prices) < ma_period:
+            return {
+                symbol: {'status': 'INSUFFICIENT_DATA', 'reason': f'数据不足 {len(prices)} 天'}
+                for symbol in prices.columns
+            }
+
+        # 窗口参数与 analyze_stock 调用的默认值一致 (RSRS n=18, window=600; LLT n=10)
+        close = prices.to_numpy(dtype=np.float64)
+        high = close * 1.02 if high is None else self._fill_missing(high, close * 1.02)
+        low = close * 0.98 if low is None else self._fill_missing(low, close * 0.98)
+
+        if NUMBA_AVAILABLE:
+            # 编译内核只算末端指标，按列并行
+            latest = _batch_indicators(close, high, low, ma_period, 18, 600, 2 / (10 + 1))
+        else:
+            ma = prices.rolling(ma_period).mean().to_numpy()
+            rsrs_zscore = _rolling_zscore(_rolling_ols_slope(low, high, 18), 600)
+            llt = _llt_loop(close, 2 / (10 + 1))
+            latest = np.column_stack((close[-1], ma[-1], ma[-20], rsrs_zscore[-1], llt[-1], llt[-2]))
+
+        return {
+            symbol: self._classify(
+                pe_percentiles.get(symbol, 0.5), *latest[j], rsrs_threshold=rsrs_threshold
+            )
+            for j, symbol in enumerate(prices.columns)
+        }
+
+    @staticmethod
+    def _fill_missing(values: pd.DataFrame, fallback: np.ndarray) -> np.ndarray:
+        """缺失值用 fallback 对应位置补齐"""
+        values = values.to_numpy(dtype=np.float64)
+        return np.where(np.isnan(values), fallback, values)
+
+    @staticmethod
+    def _classify(pe_percentile: float, current_price: float, ma_value: float,
+                  ma_value_20: float, rsrs_last, llt_last: float, llt_prev: float,
+                  rsrs_threshold: float) -> dict:
+        """由最新一期的指标值给出价值/趋势判断与最终状态 (结果只含 Python 原生类型)"""
         result = {
             'status': 'IGNORE',
             'value_score': 0,
@@ -133,30 +476,24 @@ class TrendAnalyzer:
         # 1. 价值判断
         is_undervalued = pe_percentile < 0.4
         result['value_score'] = 1 if is_undervalued else 0
-        result['pe_percentile'] = round(pe_percentile, 2)
+        result['pe_percentile'] = round(float(pe_percentile), 2)
 
         # 2. MA 判断
-        df_ma = self.calculate_ma(df, [ma_period])
-        current_price = df['close'].iloc[-1]
-        ma_value = df_ma[f'ma_{ma_period}'].iloc[-1]
-        ma_slope = (df_ma[f'ma_{ma_period}'].iloc[-1] - df_ma[f'ma_{ma_period}'].iloc[-20]) / 20
-
-        ma_ok = current_price > ma_value and ma_slope > 0
-        result['details']['ma_price'] = round(current_price, 2)
-        result['details']['ma_250'] = round(ma_value, 2)
+        ma_slope = (ma_value - ma_value_20) / 20
+        ma_ok = bool(current_price > ma_value and ma_slope > 0)
+        result['details']['ma_price'] = round(float(current_price), 2)
+        result['details']['ma_250'] = round(float(ma_value), 2)
         result['details']['ma_ok'] = ma_ok
 
         # 3. RSRS 判断
-        rsrs_zscore = self.calculate_rsrs_zscore(df)
-        rsrs_ok = rsrs_zscore.iloc[-1] > rsrs_threshold if not rsrs_zscore.empty else False
-        result['details']['rsrs_zscore'] = round(rsrs_zscore.iloc[-1], 2) if not rsrs_zscore.empty else None
+        rsrs_ok = bool(rsrs_last > rsrs_threshold) if rsrs_last is not None else False
+        result['details']['rsrs_zscore'] = round(float(rsrs_last), 2) if rsrs_last is not None else None
         result['details']['rsrs_ok'] = rsrs_ok
 
         # 4. LLT 判断
-        llt = self.calculate_llt(df)
-        llt_trending_up = llt.iloc[-1] > llt.iloc[-2]
-        price_above_llt = current_price > llt.iloc[-1]
-        llt_ok = price_above_llt and llt_trending_up
+        llt_trending_up = llt_last > llt_prev
+        price_above_llt = current_price > llt_last
+        llt_ok = bool(price_above_llt and llt_trending_up)
         result['details']['llt_ok'] = llt_ok
 
         # 5. 综合趋势得分
@@ -181,7 +518,7 @@ class DataUpdater:
 
     def __init__(self, config_path: str = "config.yaml", use_datahub: bool = True):
         self.config_path = config_path
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
         self.base_dir = os.path.dirname(config_path)
 
         # 数据目录: 从配置读取，默认到 storage/processed
@@ -208,10 +545,20 @@ class DataUpdater:
         else:
             self.datahub = None
 
-    def _load_config(self, path: str) -> dict:
-        """加载配置文件"""
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        # 最近一次下载/计算的结果，供优化器直接复用，避免重新读取 CSV
+        self._prices = None
+        self._returns = None
+
+        # 无风险利率缓存 (获取时间, 利率)
+        self._rf_cache = None
+
+    def get_cached_prices(self):
+        """最近一次下载的价格数据 (未下载时为 None)"""
+        return self._prices
+
+    def get_cached_returns(self):
+        """最近一次计算的收益率数据 (未计算时为 None)"""
+        return self._returns
 
     def get_trend_filter_config(self) -> dict:
         """获取趋势过滤配置"""
@@ -223,9 +570,54 @@ class DataUpdater:
             'pe_percentile_threshold': 0.4
         })
 
+    def _load_hist_incremental(self, symbol: str, fetch) -> pd.DataFrame:
+        """
+        增量获取历史行情: 本地已有缓存时只请求最后一个缓存日之后的数据
+
+        最后一个缓存日会重新请求一次做校验，收盘价不一致 (前复权因除权而整体变化) 时
+        丢弃缓存重新下载全部历史
+
+        Args:
+            symbol: 股票/ETF 代码
+            fetch: 数据客户端的获取函数 (symbol, start_date, end_date, adjust=...)，失败时退避重试
+        """
+        cache_dir = os.path.join(self.data_dir, OHLCV_CACHE_DIR)
+        cache_path = os.path.join(cache_dir, f"{symbol}.parquet")
+        end_date = datetime.now().strftime("%Y-%m-%d")
+
+        cached = pd.read_parquet(cache_path) if os.path.exists(cache_path) else None
+        df = None
+        if cached is not None and not cached.empty:
+            last_date = cached.index.max()
+            new = retry_call(lambda: fetch(symbol, last_date.strftime("%Y-%m-%d"), end_date, adjust="qfq"))
+            if new is None or new.empty:
+                return cached
+            if not isinstance(new.index, pd.DatetimeIndex):
+                new.index = pd.to_datetime(new.index)
+
+            close_col = '收盘' if '收盘' in new.columns else 'close'
+            overlap = new.index == last_date
+            if (close_col in cached.columns and close_col in new.columns and overlap.any()
+                    and np.isclose(new.loc[overlap, close_col].iloc[0], cached.at[last_date, close_col])):
+                df = pd.concat([cached, new[new.index > last_date]])
+            else:
+                print(f"  {symbol} 复权价格已变化，重新下载全部历史")
+
+        if df is None:
+            df = retry_call(lambda: fetch(symbol, HIST_START_DATE, end_date, adjust="qfq"))
+            if df is None or df.empty:
+                return pd.DataFrame()
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index)
+
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(cache_path, compression='zstd')
+        return df
+
     def get_stock_data(self, symbol: str, period: str = "2300d") -> pd.DataFrame:
         """
-        获取单只股票历史数据（使用统一数据客户端）
+        获取单只股票历史数据（使用统一数据客户端，本地增量缓存）
 
         Args:
             symbol: 股票代码，如 "600519.SH"
@@ -235,41 +627,51 @@ class DataUpdater:
             包含 OHLCV 数据的 DataFrame
         """
         try:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = "2010-01-01"
-            
-            df = self.data_client.get_stock_hist(symbol, start_date, end_date, adjust="qfq")
-            
-            if df is not None and not df.empty:
-                # 确保索引是 datetime
-                if not isinstance(df.index, pd.DatetimeIndex):
-                    df.index = pd.to_datetime(df.index)
-                df.sort_index(inplace=True)
-                return df
+            return self._load_hist_incremental(symbol, self.data_client.get_stock_hist)
         except Exception as e:
             print(f"获取 {symbol} 数据失败: {e}")
-        
+
         return pd.DataFrame()
 
     def get_etf_data(self, symbol: str) -> pd.DataFrame:
-        """获取ETF数据（使用统一数据客户端）"""
+        """获取ETF数据（使用统一数据客户端，本地增量缓存）"""
         try:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = "2010-01-01"
-            
-            df = self.data_client.get_etf_hist(symbol, start_date, end_date, adjust="qfq")
-            
-            if df is not None and not df.empty:
-                # 确保索引是 datetime
-                if not isinstance(df.index, pd.DatetimeIndex):
-                    df.index = pd.to_datetime(df.index)
-                df.sort_index(inplace=True)
-                return df
+            return self._load_hist_incremental(symbol, self.data_client.get_etf_hist)
         except Exception as e:
             print(f"获取 {symbol} ETF数据失败: {e}")
-        
+
         return pd.DataFrame()
 
+    def _download_one(self, symbol: str):
+        """
+        下载单个标的的收盘价序列
+
+        Returns:
+            以 datetime 为索引的收盘价 Series，数据为空或无收盘价列时返回 None
+        """
+        print(f"正在下载 {symbol} ...")
+
+        if symbol.endswith(".SH") or symbol.endswith(".SZ"):
+            df = self.get_stock_data(symbol)
+        else:
+            df = self.get_etf_data(symbol)
+
+        if df.empty:
+            print(f"  {symbol} 数据为空，跳过")
+            return None
+
+        # 兼容中文和英文列名
+        close_col = '收盘' if '收盘' in df.columns else 'close'
+        if close_col not in df.columns:
+            print(f"  {symbol} 无收盘价列，可用列: {list(df.columns)}")
+            return None
+
+        # 统一转换为 datetime，防止混合索引类型导致 DataFrame 创建失败
+        series = df[close_col].copy()
+        series.index = pd.to_datetime(series.index)
+        print(f"  {symbol} 成功获取 {len(df)} 条数据")
+        return series
+
     def download_all_data(self) -> pd.DataFrame:
         """
         下载所有配置中的股票数据
@@ -281,38 +683,25 @@ class DataUpdater:
             prices = self.datahub.get_prices(use_cache=False)
             if not prices.empty:
                 # 保存到本地目录
-                prices.to_csv(os.path.join(self.data_dir, "prices.csv"))
-                print(f"数据已保存至 {self.data_dir}/prices.csv")
+                self._save_prices(prices)
                 return prices
             else:
                 print("DataHub 获取数据为空，回退到本地下载")
 
-        # 本地下载
-        price_data = {}
+        # 本地下载: 网络等待为主，多线程并发 (baostock 查询在 data_client 内部已加锁串行)
         symbols = self.config['data_source']['stock_list']
+        workers = max(1, min(self.config.get('download_workers', DOWNLOAD_WORKERS), len(symbols)))
 
-        for symbol in symbols:
-            print(f"正在下载 {symbol} ...")
+        downloaded = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._download_one, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                series = future.result()
+                if series is not None:
+                    downloaded[futures[future]] = series
 
-            if symbol.endswith(".SH") or symbol.endswith(".SZ"):
-                df = self.get_stock_data(symbol)
-            else:
-                df = self.get_etf_data(symbol)
-
-            if df.empty:
-                print(f"  数据为空，跳过")
-                continue
-
-            # 兼容中文和英文列名
-            close_col = '收盘' if '收盘' in df.columns else 'close'
-            if close_col in df.columns:
-                # 统一转换为 datetime，防止混合索引类型导致 DataFrame 创建失败
-                series = df[close_col].copy()
-                series.index = pd.to_datetime(series.index)
-                price_data[symbol] = series
-                print(f"  成功获取 {len(df)} 条数据")
-            else:
-                print(f"  无收盘价列，可用列: {list(df.columns)}")
+        # 按配置顺序排列列
+        price_data = {symbol: downloaded[symbol] for symbol in symbols if symbol in downloaded}
 
         # 合并为 DataFrame
         prices = pd.DataFrame(price_data)
@@ -322,21 +711,25 @@ class DataUpdater:
             return prices
 
         # 保存
-        prices.to_csv(os.path.join(self.data_dir, "prices.csv"))
-        print(f"数据已保存至 {self.data_dir}/prices.csv")
+        self._save_prices(prices)
 
         return prices
 
+    def _save_prices(self, prices: pd.DataFrame):
+        """保存收盘价宽表 (Parquet) 并更新内存缓存"""
+        path = os.path.join(self.data_dir, PRICES_FILE)
+        prices.to_parquet(path, compression='zstd')
+        print(f"数据已保存至 {path}")
+        self._prices = prices
+
     def calculate_returns(self, prices: pd.DataFrame = None) -> pd.DataFrame:
         """计算收益率"""
         if prices is None:
-            prices = pd.read_csv(
-                os.path.join(self.data_dir, "prices.csv"),
-                index_col=0, parse_dates=True
-            )
+            prices = read_prices(self.data_dir)
 
-        returns = prices.pct_change().dropna()
-        returns.to_csv(os.path.join(self.data_dir, "returns.csv"))
+        returns = prices_to_returns(prices)
+        self._prices = prices
+        self._returns = returns
 
         # 如果启用 DataHub，同步到 DataHub
         if self.use_datahub and self.datahub and not returns.empty:
@@ -345,13 +738,18 @@ class DataUpdater:
         return returns
 
     def get_risk_free_rate(self) -> float:
-        """获取无风险利率 (10年期国债收益率)"""
+        """获取无风险利率 (10年期国债收益率)，成功获取的结果在 RISK_FREE_RATE_TTL 内复用"""
+        if self._rf_cache is not None and time.monotonic() - self._rf_cache[0] < RISK_FREE_RATE_TTL:
+            return self._rf_cache[1]
+
         try:
             df = self.data_client.get_bond_yield_curve()
             # 取最新一期数据
             latest = df.iloc[-1]
             # 返回年化收益率 (转为小数)
-            return float(latest['中证10年']) / 100
+            rate = float(latest['中证10年']) / 100
+            self._rf_cache = (time.monotonic(), rate)
+            return rate
         except Exception as e:
             print(f"获取无风险利率失败: {e}，使用默认值")
             # 默认值
@@ -370,10 +768,7 @@ class DataUpdater:
             {symbol: analysis_result}
         """
         if prices is None:
-            prices = pd.read_csv(
-                os.path.join(self.data_dir, "prices.csv"),
-                index_col=0, parse_dates=True
-            )
+            prices = read_prices(self.data_dir)
 
         if pe_percentiles is None:
             pe_percentiles = {symbol: 0.3 for symbol in prices.columns}
@@ -381,39 +776,33 @@ class DataUpdater:
         config = self.get_trend_filter_config()
         analyzer = TrendAnalyzer()
 
-        results = {}
-
         print("\n" + "=" * 60)
         print("趋势分析结果")
         print("=" * 60)
         print(f"{'代码':<12} {'状态':<12} {'PE分位':<8} {'MA250':<8} {'RSRS':<8} {'趋势分':<8}")
         print("-" * 60)
 
+        # RSRS 使用行情缓存中的真实最高/最低价 (只读这两列)，无缓存的标的用收盘价近似
+        highs, lows = {}, {}
         for symbol in prices.columns:
-            df = prices[[symbol]].copy()
-            df.columns = ['close']
-
-            # 尝试添加 high/low 列
-            if 'high' not in df.columns or 'low' not in df.columns:
-                # 用 close 近似 (实际应该从原始数据获取)
-                df['high'] = df['close'] * 1.02
-                df['low'] = df['close'] * 0.98
-            else:
-                df['high'] = df['high'].astype(float)
-                df['low'] = df['low'].astype(float)
-                df['close'] = df['close'].astype(float)
-
-            pe_pct = pe_percentiles.get(symbol, 0.5)
-
-            result = analyzer.analyze_stock(
-                df,
-                pe_percentile=pe_pct,
-                ma_period=config['ma_period'],
-                rsrs_threshold=config['rsrs_threshold']
-            )
-
-            results[symbol] = result
-
+            high_low = read_high_low(self.data_dir, symbol)
+            if high_low is not None:
+                highs[symbol] = high_low['high']
+                lows[symbol] = high_low['low']
+        high = pd.DataFrame(highs).reindex(index=prices.index, columns=prices.columns) if highs else None
+        low = pd.DataFrame(lows).reindex(index=prices.index, columns=prices.columns) if lows else None
+
+        # 全部股票在价格矩阵上一次算完指标
+        results = analyzer.analyze_prices(
+            prices,
+            pe_percentiles,
+            ma_period=config['ma_period'],
+            rsrs_threshold=config['rsrs_threshold'],
+            high=high,
+            low=low
+        )
+
+        for symbol, result in results.items():
             # 打印结果
             status = result['status']
             pe_p = result.get('pe_percentile', 'N/A')
@@ -434,20 +823,7 @@ class DataUpdater:
         print(f"观察名单: {len(watch_list)} 只 -> {watch_list}")
         print(f"忽略: {len(ignore)} 只")
 
-        # 转换 numpy 类型为 Python 原生类型
-        def _convert(obj):
-            if isinstance(obj, dict):
-                return {k: _convert(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [_convert(item) for item in obj]
-            elif isinstance(obj, (np.bool_, np.integer)):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            else:
-                return obj
-
-        return _convert(results)
+        return results
 
 
 if __name__ == "__main__":
@@ -5,14 +5,80 @@
 
 import pandas as pd
 import numpy as np
-import yaml
 import os
 import json
+import hashlib
 from datetime import datetime
+from scipy.linalg import LinAlgError, cho_factor, cho_solve
+from scipy.linalg.blas import dsyrk, ssyrk
 from scipy.optimize import minimize
 
 # 内部模块
-from data_updater import DataUpdater
+from config_loader import load_config
+from data_updater import DataUpdater, read_prices, prices_to_returns, max_drawdown
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 协方差矩阵磁盘缓存最多保留的文件数 (按最近使用淘汰)
+COV_CACHE_MAX_FILES = 100
+
+
+def ledoit_wolf_intensity(x: np.ndarray, cov: np.ndarray) -> float:
+    """
+    Ledoit-Wolf 收缩强度 (收缩目标为 μI，与 sklearn.covariance.ledoit_wolf 口径一致)
+
+    Args:
+        x: 去均值后的收益率矩阵 (T×n)
+        cov: 对应的样本协方差矩阵 (除以 T-1)
+    """
+    t, n = x.shape
+    emp = cov.astype(np.float64) * ((t - 1) / t)
+    trace = np.trace(emp)
+    mu = trace / n
+    # Σ_t (Σ_i x_ti²)² 等于 sum((X²)ᵀX²)，无需再做一次矩阵乘法
+    row_sq = np.square(x, dtype=np.float64).sum(axis=1)
+    beta = (np.sum(row_sq ** 2) / t - np.sum(emp ** 2)) / (n * t)
+    delta = (np.sum(emp ** 2) - 2.0 * mu * trace + n * mu ** 2) / n
+    beta = min(beta, delta)
+    return 0.0 if beta == 0 else float(beta / delta)
+
+
+def _variance_and_grad(w: np.ndarray, cov: np.ndarray):
+    """组合方差 wᵀΣw 及其梯度 2Σw，共用一次矩阵-向量乘"""
+    cw = cov @ w
+    return w @ cw, 2.0 * cw
+
+
+if NUMBA_AVAILABLE:
+    # 编译为原生代码，省去 SLSQP 每次回调的 NumPy 分派开销
+    _variance_and_grad = njit(cache=True, fastmath=True)(_variance_and_grad)
+
+
+def sample_cov(values: np.ndarray, dtype=np.float64, shrinkage: bool = False) -> np.ndarray:
+    """
+    样本协方差矩阵 (列为资产)
+
+    对去均值矩阵直接调用 BLAS SYRK，利用对称性只计算上三角，再镜像到下三角。
+    dtype 为 float32 时走 ssyrk，矩阵体积减半；shrinkage 开启时做 Ledoit-Wolf 收缩，
+    改善单精度下的条件数
+    """
+    x = np.asarray(values, dtype=dtype)
+    x = x - x.mean(axis=0)
+    syrk = ssyrk if x.dtype == np.float32 else dsyrk
+    cov = syrk(alpha=1.0 / (x.shape[0] - 1), a=x, trans=1, lower=0)
+    lower = np.tril_indices_from(cov, -1)
+    cov[lower] = cov.T[lower]
+
+    if shrinkage:
+        intensity = ledoit_wolf_intensity(x, cov)
+        mu = np.trace(cov) / len(cov)
+        cov *= (1.0 - intensity)
+        cov[np.diag_indices_from(cov)] += intensity * mu
+    return cov
 
 
 class PortfolioOptimizer:
@@ -20,7 +86,7 @@ class PortfolioOptimizer:
 
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
         self.base_dir = os.path.dirname(config_path)
 
         # 数据目录: 从配置读取，默认到 storage/processed
@@ -32,21 +98,111 @@ class PortfolioOptimizer:
 
         self.updater = DataUpdater(config_path)
 
-    def _load_config(self, path: str) -> dict:
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+    @staticmethod
+    def _select_wide(df: pd.DataFrame, symbols: list = None,
+                     start: str = None, end: str = None) -> pd.DataFrame:
+        """按股票列与日期范围截取宽格式数据 (日期在有序索引上二分切片)"""
+        if symbols is not None:
+            df = df[[s for s in symbols if s in df.columns]]
+        if start or end:
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+            df = df.loc[start or None:end or None]
+        return df
+
+    def load_returns(self, symbols: list = None, start: str = None, end: str = None) -> pd.DataFrame:
+        """加载收益率数据 (可只读取部分股票/日期)，优先复用 DataUpdater 内存中的结果"""
+        cached = self.updater.get_cached_returns()
+        if cached is not None:
+            return self._select_wide(cached, symbols, start, end)
+        # 收益率不单独落盘: 由完整价格表计算后再截取 (与 calculate_returns 的缺失值处理一致)
+        return self._select_wide(prices_to_returns(read_prices(self.data_dir)), symbols, start, end)
+
+    def load_prices(self, symbols: list = None, start: str = None, end: str = None) -> pd.DataFrame:
+        """加载价格数据 (可只读取部分股票/日期)，优先复用 DataUpdater 内存中的结果"""
+        cached = self.updater.get_cached_prices()
+        if cached is not None:
+            return self._select_wide(cached, symbols, start, end)
+        return self._select_wide(read_prices(self.data_dir), symbols, start, end)
 
     def load_data(self) -> tuple:
         """加载收益率数据"""
-        returns = pd.read_csv(
-            os.path.join(self.data_dir, "returns.csv"),
-            index_col=0, parse_dates=True
-        )
-        prices = pd.read_csv(
-            os.path.join(self.data_dir, "prices.csv"),
-            index_col=0, parse_dates=True
-        )
-        return returns, prices
+        return self.load_returns(), self.load_prices()
+
+    def _evict_cov_cache(self, cache_dir: str):
+        """超出上限时删除最久未使用的缓存文件"""
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith('.npy')]
+        if len(entries) <= COV_CACHE_MAX_FILES:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - COV_CACHE_MAX_FILES]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    def get_cov_matrix(self, returns: pd.DataFrame) -> np.ndarray:
+        """
+        计算收益率协方差矩阵 (带磁盘缓存)
+
+        缓存键为 (排序后的股票代码, 收益率矩阵内容的哈希, 精度/收缩设置)，同一份收益率重复优化时
+        直接读取缓存；哈希只需 O(T·N) 扫描一遍数据，远低于 O(T·N²) 的协方差计算
+        """
+        cov_config = self.config.get('covariance', {})
+        dtype = np.dtype(cov_config.get('dtype', 'float64'))
+        shrinkage = bool(cov_config.get('shrinkage', False))
+
+        # 一次性剔除含缺失值的行，之后全部走纯矩阵运算
+        returns = returns.dropna()
+        symbols = np.asarray(returns.columns, dtype=str)
+        if len(returns) < 2:
+            return np.full((len(symbols), len(symbols)), np.nan)
+
+        order = np.argsort(symbols, kind='stable')
+        values = np.ascontiguousarray(returns.to_numpy(dtype=np.float64)[:, order])
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("|".join(symbols[order]).encode('utf-8'))
+        digest.update(f"#{values.shape}#{dtype.name}#{shrinkage}#".encode('utf-8'))
+        digest.update(values.tobytes())
+        key = digest.hexdigest()
+
+        cache_dir = os.path.join(self.data_dir, "cov_cache")
+        cache_path = os.path.join(cache_dir, f"{key}.npy")
+
+        cov_sorted = None
+        if os.path.exists(cache_path):
+            try:
+                cov_sorted = np.load(cache_path, mmap_mode='r')
+                os.utime(cache_path)
+            except (OSError, ValueError):
+                cov_sorted = None
+
+        if cov_sorted is None:
+            cov_sorted = sample_cov(values, dtype=dtype, shrinkage=shrinkage)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.save(cache_path, cov_sorted)
+                self._evict_cov_cache(cache_dir)
+            except OSError as e:
+                print(f"协方差缓存写入失败: {e}")
+
+        # 还原为 returns 的列顺序
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return np.asarray(cov_sorted)[np.ix_(inverse, inverse)]
+
+    @staticmethod
+    def _min_variance_closed_form(cov_matrix: np.ndarray):
+        """无上下限约束的最小方差权重 (一次 Cholesky 分解 + 回代)，矩阵非正定时返回 None"""
+        try:
+            factor = cho_factor(cov_matrix)
+        except (LinAlgError, ValueError):
+            return None
+        x = cho_solve(factor, np.ones(len(cov_matrix)))
+        total = x.sum()
+        if not np.isfinite(total) or total == 0:
+            return None
+        return x / total
 
     def optimize_portfolio(self, returns: pd.DataFrame = None) -> pd.DataFrame:
         """
@@ -56,37 +212,61 @@ class PortfolioOptimizer:
             目标权重 DataFrame
         """
         if returns is None:
-            _, returns = self.load_data()
+            returns = self.load_returns()
 
         constraints = self.config.get('constraints', {})
         w_max = constraints.get('max_weight', 0.20)
         w_min = constraints.get('min_weight', 0.02)
 
         n = len(returns.columns)
-        cov_matrix = returns.cov().values
+        cov_matrix = self.get_cov_matrix(returns)
 
         # 目标函数: 方差
+        # SLSQP 以 float64 传入权重，先转为协方差矩阵精度，避免每次调用都把矩阵升精度
+        cov_contiguous = np.ascontiguousarray(cov_matrix)
+        cov_dtype = cov_contiguous.dtype
+
+        # 目标函数与解析梯度 (∇f = 2Σw) 一并返回，避免 SLSQP 做有限差分
         def portfolio_variance(weights):
-            return weights @ cov_matrix @ weights
+            w = np.ascontiguousarray(weights, dtype=cov_dtype)
+            value, grad = _variance_and_grad(w, cov_contiguous)
+            return float(value), grad.astype(np.float64)
 
-        # 约束
+        # 约束: 权重和为1 (雅可比为常量，只分配一次)
+        ones = np.ones(n)
         constraints = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1}  # 权重和为1
+            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1,
+             'jac': lambda w: ones}
         ]
 
         # 边界
         bounds = tuple((w_min, w_max) for _ in range(n))
 
-        # 初始猜测: 等权
+        # 等权 (优化失败时的回退)
         initial_weights = np.ones(n) / n
 
+        # 闭式解: 只有权重和为1约束时 w* = Σ⁻¹1 / (1ᵀΣ⁻¹1)，满足上下限则无需 SLSQP
+        closed_form = self._min_variance_closed_form(cov_matrix)
+        if closed_form is not None:
+            if (closed_form >= w_min - 1e-9).all() and (closed_form <= w_max + 1e-9).all():
+                return pd.DataFrame({
+                    'symbol': returns.columns,
+                    'weight': closed_form.round(4)
+                })
+            # 以截断后的闭式解热启动，迭代次数明显少于从等权出发
+            x0 = np.clip(closed_form, w_min, w_max)
+        else:
+            x0 = initial_weights
+
         try:
             result = minimize(
                 portfolio_variance,
-                initial_weights,
+                x0,
+                jac=True,
                 method='SLSQP',
                 bounds=bounds,
-                constraints=constraints
+                constraints=constraints,
+                options={'ftol': 1e-9}
             )
 
             if result.success:
@@ -108,19 +288,21 @@ class PortfolioOptimizer:
 
     def compute_metrics(self, returns: pd.DataFrame, weights: np.ndarray) -> dict:
         """计算组合绩效指标"""
-        port_returns = (returns * weights).sum(axis=1)
+        values = returns.to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            # 与逐行求和口径一致: 缺失收益按 0 计
+            values = np.nan_to_num(values)
+        port_returns = values @ np.asarray(weights, dtype=np.float64)
 
         annualized_return = port_returns.mean() * 252
-        annualized_vol = port_returns.std() * np.sqrt(252)
+        annualized_vol = port_returns.std(ddof=1) * np.sqrt(252)
         sharpe = (annualized_return - self.updater.get_risk_free_rate()) / annualized_vol
 
-        max_drawdown = (port_returns.cumsum() - port_returns.cumsum().cummax()).min()
-
         return {
             'annualized_return': annualized_return,
             'annualized_vol': annualized_vol,
             'sharpe_ratio': sharpe,
-            'max_drawdown': max_drawdown
+            'max_drawdown': max_drawdown(port_returns)
         }
 
     def run(self, apply_trend_filter: bool = None):
@@ -136,12 +318,13 @@ class PortfolioOptimizer:
 
         # 更新数据
         print("\n[1/4] 更新数据...")
-        self.updater.download_all_data()
-        self.updater.calculate_returns()
+        prices = self.updater.download_all_data()
+        # 直接用内存中的价格计算收益率，不再回读价格文件
+        self.updater.calculate_returns(prices if not prices.empty else None)
 
-        # 加载数据
-        returns, prices = self.load_data()
-        print(f"    数据范围: {returns.index[0].date()} ~ {returns.index[-1].date()}")
+        # 加载数据: 先读价格做趋势分析，收益率待过滤后按列读取
+        prices = self.load_prices()
+        print(f"    数据范围: {prices.index[0].date()} ~ {prices.index[-1].date()}")
         print(f"    原始资产数量: {len(prices.columns)}")
 
         # 趋势过滤
@@ -151,6 +334,7 @@ class PortfolioOptimizer:
 
         filtered_symbols = list(prices.columns)
         analysis_results = {}
+        returns = None
 
         if apply_trend_filter:
             print("\n[2/4] 趋势分析 (基本面 + 技术面)...")
@@ -160,21 +344,18 @@ class PortfolioOptimizer:
             min_score = trend_config.get('min_trend_score', 0.33)
             min_pe_pct = trend_config.get('pe_percentile_threshold', 0.4)
 
-            filtered_symbols = []
-            for symbol, result in analysis_results.items():
-                # 价值 + 趋势得分 >= 阈值
-                if result['value_score'] == 1 and result['trend_score'] >= min_score:
-                    filtered_symbols.append(symbol)
-                # PE 分位数特别低 (价值陷阱风险低) 也通过
-                elif result.get('pe_percentile', 1.0) < 0.2:
-                    filtered_symbols.append(symbol)
-
-            # 只保留有足够数据的股票
-            valid_symbols = []
-            for s in filtered_symbols:
-                if len(returns[s].dropna()) >= 250:
-                    valid_symbols.append(s)
-            filtered_symbols = valid_symbols
+            ar = pd.DataFrame.from_dict(analysis_results, orient='index').reindex(
+                columns=['value_score', 'trend_score', 'pe_percentile']
+            )
+            # 价值 + 趋势得分 >= 阈值；或 PE 分位数特别低 (价值陷阱风险低) 也通过
+            mask = ((ar['value_score'] == 1) & (ar['trend_score'] >= min_score)) | \
+                   (ar['pe_percentile'].fillna(1.0) < 0.2)
+            filtered_symbols = ar.index[mask].tolist()
+
+            # 只保留有足够数据的股票 (count 忽略缺失值)
+            returns = self.load_returns(filtered_symbols)
+            enough = returns.count() >= 250
+            filtered_symbols = enough.index[enough].tolist()
 
             print(f"    趋势过滤后资产数量: {len(filtered_symbols)}")
 
@@ -196,7 +377,10 @@ class PortfolioOptimizer:
 
         # 优化
         print(f"\n[3/4] 运行优化 ({len(filtered_symbols)} 只股票)...")
-        returns_filtered = returns[filtered_symbols]
+        if returns is not None and set(filtered_symbols) <= set(returns.columns):
+            returns_filtered = returns[filtered_symbols]
+        else:
+            returns_filtered = self.load_returns(filtered_symbols)
         weights = self.optimize_portfolio(returns_filtered)
 
         # 保存结果到 storage/outputs
@@ -206,6 +390,8 @@ class PortfolioOptimizer:
             output_path = os.path.join(os.path.dirname(self.config_path), output_path)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         weights.to_csv(output_path, index=False)
+        # Parquet 副本供 Dashboard 快速读取
+        weights.to_parquet(os.path.splitext(output_path)[0] + '.parquet', index=False, compression='zstd')
         print(f"    权重已保存至 {output_path}")
 
         # 绩效指标
@@ -6,10 +6,13 @@
 import pandas as pd
 import numpy as np
 import os
-import yaml
 from datetime import datetime
 from jinja2 import Template
 import base64
+import io
+
+from config_loader import load_config
+from data_updater import read_prices, prices_to_returns, max_drawdown
 
 try:
     import matplotlib
@@ -24,13 +27,67 @@ try:
 except:
     HAS_MATPLOTLIB = False
 
+# 报告文件写缓冲 (整份报告一次写出，避免按默认 8 KiB 分块多次系统调用)
+REPORT_WRITE_BUFFER = 1 << 20
+
+# HTML 报告模板 (模块加载时编译一次)
+HTML_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>投资组合报告</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        table { border-collapse: collapse; width: 50%; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #4CAF50; color: white; }
+        .chart { margin: 20px 0; }
+        .chart svg { width: 100%; height: auto; }
+        pre { background-color: #f5f5f5; padding: 15px; }
+    </style>
+</head>
+<body>
+    <h1>投资组合优化报告</h1>
+    <p>生成时间: {{ now }}</p>
+{% if pie %}
+    <div class="chart">
+        <h3>资产配置</h3>
+{% if svg %}
+        <div style="width: 500px">{{ pie }}</div>
+{% else %}
+        <img src="data:image/png;base64,{{ pie }}" width="500">
+{% endif %}
+    </div>
+{% endif %}
+{% if cumulative %}
+    <div class="chart">
+        <h3>历史净值</h3>
+{% if svg %}
+        <div style="width: 700px">{{ cumulative }}</div>
+{% else %}
+        <img src="data:image/png;base64,{{ cumulative }}" width="700">
+{% endif %}
+    </div>
+{% endif %}
+    <h3>推荐配置</h3>
+    <table>
+        <tr><th>资产代码</th><th>权重</th></tr>
+{% for symbol, weight in rows %}
+        <tr><td>{{ symbol }}</td><td>{{ weight }}</td></tr>
+{% endfor %}
+    </table>
+</body>
+</html>
+""", trim_blocks=True, keep_trailing_newline=True)
+
 
 class PortfolioReport:
     """组合报告生成器"""
 
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
         self.base_dir = os.path.dirname(config_path)
 
         # 数据目录: 从配置读取，默认到 storage/processed
@@ -52,31 +109,74 @@ class PortfolioReport:
         os.makedirs(self.reports_dir, exist_ok=True)
         os.makedirs(self.charts_dir, exist_ok=True)
 
-    def _load_config(self, path: str) -> dict:
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        # 本次报告已读取的权重/收益率 (run 开始时清空，同一次生成只读一次文件)
+        self._weights = None
+        self._returns = None
 
     def load_weights(self) -> pd.DataFrame:
         """加载优化后的权重"""
+        if self._weights is not None:
+            return self._weights
+
         output_config = self.config.get('output', {})
         weights_file = output_config.get('weights_file', '../storage/outputs/longterm/weights/output_weights.csv')
         if not os.path.isabs(weights_file):
             weights_file = os.path.join(self.base_dir, weights_file)
-        weights = pd.read_csv(weights_file)
+        weights = pd.read_csv(weights_file, engine='pyarrow', dtype={'symbol': str, 'weight': 'float64'})
         # 过滤零权重
         weights = weights[weights['weight'] > 0.001]
-        return weights.sort_values('weight', ascending=False)
+        self._weights = weights.sort_values('weight', ascending=False)
+        return self._weights
 
     def load_returns(self) -> pd.DataFrame:
-        """加载收益率数据"""
-        returns = pd.read_csv(
-            os.path.join(self.data_dir, "returns.csv"),
-            index_col=0, parse_dates=True
-        )
-        return returns
+        """加载收益率数据 (由本地价格文件计算)"""
+        if self._returns is None:
+            self._returns = prices_to_returns(read_prices(self.data_dir))
+        return self._returns
+
+    @staticmethod
+    def _portfolio_returns(returns: pd.DataFrame, weights: pd.DataFrame):
+        """
+        组合日收益率 (只取 returns 中存在的代码)
+
+        权重按 returns 列顺序 reindex 对齐 (不在组合中的列权重为 0)，收益率整表按自身精度 (float32)
+        复制为 C 连续矩阵后做一次矩阵-向量乘；只有乘积结果升为 float64，供后续年化/夏普/回撤计算
+
+        缺少价格数据的持仓不参与计算 (权重之和因此小于 1)，由 run 中的 _warn_missing_symbols 提示
+
+        Returns:
+            组合收益率 Series，没有可用代码时返回 None
+        """
+        w_series = weights.set_index('symbol')['weight']
+        if not returns.columns.isin(w_series.index).any():
+            return None
 
-    def generate_pie_chart(self, weights: pd.DataFrame) -> str:
-        """生成权重饼图"""
+        r = np.ascontiguousarray(returns.to_numpy())
+        w = w_series.reindex(returns.columns, fill_value=0.0).to_numpy(dtype=r.dtype)
+        return pd.Series((r @ w).astype(np.float64), index=returns.index)
+
+    @staticmethod
+    def _warn_missing_symbols(returns: pd.DataFrame, weights: pd.DataFrame):
+        """持仓代码缺少价格数据时提示 (组合收益按 0 权重处理这些代码，剩余权重之和小于 1)"""
+        missing = weights[~weights['symbol'].isin(returns.columns)]
+        if missing.empty:
+            return
+        print(f"  - 警告: {len(missing)} 个持仓代码缺少价格数据 (合计权重 {missing['weight'].sum():.2%})，"
+              f"组合收益只按其余持仓计算: {', '.join(missing['symbol'].astype(str))}")
+
+    @staticmethod
+    def _save_figure(chart_path: str, fmt: str = 'png') -> bytes:
+        """当前图表只渲染一次: 图像字节 (png/svg) 同时写入文件并返回给 HTML 内嵌"""
+        buf = io.BytesIO()
+        plt.savefig(buf, format=fmt, dpi=150, bbox_inches='tight')
+        plt.close()
+        data = buf.getvalue()
+        with open(chart_path, 'wb') as f:
+            f.write(data)
+        return data
+
+    def generate_pie_chart(self, weights: pd.DataFrame, fmt: str = 'png') -> bytes:
+        """生成权重饼图 (fmt: png / svg)"""
         if not HAS_MATPLOTLIB:
             return None
 
@@ -106,27 +206,23 @@ class PortfolioReport:
         plt.title('资产配置权重', fontsize=14)
         plt.axis('equal')
 
-        chart_path = os.path.join(self.charts_dir, "allocation_pie.png")
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        chart_path = os.path.join(self.charts_dir, f"allocation_pie.{fmt}")
+        return self._save_figure(chart_path, fmt)
 
-        return chart_path
-
-    def generate_historical_curve(self, returns: pd.DataFrame, weights: pd.DataFrame) -> str:
-        """生成历史净值曲线"""
+    def generate_historical_curve(self, returns: pd.DataFrame, weights: pd.DataFrame,
+                                  fmt: str = 'png') -> bytes:
+        """生成历史净值曲线 (fmt: png / svg)"""
         if not HAS_MATPLOTLIB:
             return None
 
-        # 获取有效的股票代码（存在于 returns 中的）
-        valid_symbols = [s for s in weights['symbol'] if s in returns.columns]
-        if not valid_symbols:
+        # 只使用存在于 returns 中的股票代码
+        port_returns = self._portfolio_returns(returns, weights)
+        if port_returns is None:
             return None
 
-        w_dict = dict(zip(weights['symbol'], weights['weight']))
-        port_returns = returns[valid_symbols].dot(
-            np.array([w_dict[s] for s in valid_symbols])
-        )
-        cumulative = (1 + port_returns).cumprod()
+        # 对数空间累加: exp(Σ log(1 + r)) 与连乘净值相同，长序列累计误差更小
+        pr = port_returns.to_numpy(dtype=np.float64)
+        cumulative = pd.Series(np.exp(np.cumsum(np.log1p(pr))), index=port_returns.index)
 
         plt.figure(figsize=(12, 6))
         plt.plot(cumulative.index, cumulative.values, linewidth=1.5)
@@ -135,11 +231,8 @@ class PortfolioReport:
         plt.ylabel('净值')
         plt.grid(True, alpha=0.3)
 
-        chart_path = os.path.join(self.charts_dir, "cumulative_return.png")
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-        plt.close()
-
-        return chart_path
+        chart_path = os.path.join(self.charts_dir, f"cumulative_return.{fmt}")
+        return self._save_figure(chart_path, fmt)
 
     def generate_text_report(self, weights: pd.DataFrame, metrics: dict) -> str:
         """生成文本报告"""
@@ -162,8 +255,10 @@ class PortfolioReport:
 |----------|------|
 """
 
-        for _, row in weights.iterrows():
-            report += f"| {row['symbol']} | {row['weight']:.2%} |\n"
+        # 直接遍历列数组 (iterrows 会把每行装箱成 Series)
+        symbols = weights['symbol'].to_numpy()
+        ws = weights['weight'].to_numpy()
+        report += "".join(f"| {sym} | {w:.2%} |\n" for sym, w in zip(symbols, ws))
 
         report += """
 ## 操作建议
@@ -179,110 +274,94 @@ class PortfolioReport:
 
         return report
 
-    def save_as_html(self, text_report: str, charts: dict):
-        """保存为 HTML 格式"""
-        # 读取图表为 base64
-        def image_to_base64(path):
-            if not path or not os.path.exists(path):
+    def save_as_html(self, text_report: str, charts: dict, weights: pd.DataFrame = None,
+                     fmt: str = 'png'):
+        """
+        保存为 HTML 格式
+
+        Args:
+            charts: 图表字节 {'pie': ..., 'cumulative': ...}
+            weights: 权重，None 时读取权重文件
+            fmt: 图表格式，png 以 base64 内嵌，svg 直接内联文本
+        """
+        def embed(data):
+            if not data:
                 return None
-            with open(path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
-
-        pie_b64 = image_to_base64(charts.get('pie'))
-        cum_b64 = image_to_base64(charts.get('cumulative'))
-
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>投资组合报告</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        table {{ border-collapse: collapse; width: 50%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #4CAF50; color: white; }}
-        .chart {{ margin: 20px 0; }}
-        pre {{ background-color: #f5f5f5; padding: 15px; }}
-    </style>
-</head>
-<body>
-    <h1>投资组合优化报告</h1>
-    <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-"""
-
-        if pie_b64:
-            html += f"""
-    <div class="chart">
-        <h3>资产配置</h3>
-        <img src="data:image/png;base64,{pie_b64}" width="500">
-    </div>
-"""
-
-        if cum_b64:
-            html += f"""
-    <div class="chart">
-        <h3>历史净值</h3>
-        <img src="data:image/png;base64,{cum_b64}" width="700">
-    </div>
-"""
-
-        # 添加表格
-        html += """
-    <h3>推荐配置</h3>
-    <table>
-        <tr><th>资产代码</th><th>权重</th></tr>
-"""
-
-        weights = self.load_weights()
-        for _, row in weights.iterrows():
-            html += f"<tr><td>{row['symbol']}</td><td>{row['weight']:.2%}</td></tr>"
-
-        html += """
-    </table>
-</body>
-</html>
-"""
-
+            if fmt == 'svg':
+                # 去掉 XML 声明/DOCTYPE，只保留 <svg> 元素
+                text = data.decode('utf-8')
+                return text[text.find('<svg'):]
+            return base64.b64encode(data).decode()
+
+        if weights is None:
+            weights = self.load_weights()
+        rows = [(sym, f"{w:.2%}") for sym, w in
+                zip(weights['symbol'].to_numpy(), weights['weight'].to_numpy())]
+
+        # 模板边渲染边写入文件，不在内存中拼接整份 HTML
         html_path = os.path.join(self.reports_dir, "portfolio_report.html")
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+        with open(html_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+            HTML_TEMPLATE.stream(
+                now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                svg=(fmt == 'svg'),
+                pie=embed(charts.get('pie')),
+                cumulative=embed(charts.get('cumulative')),
+                rows=rows,
+            ).dump(f)
 
         return html_path
 
-    def run(self, metrics: dict = None):
-        """生成完整报告"""
+    def run(self, metrics: dict = None, charts: bool = True, fmt: str = 'svg'):
+        """
+        生成完整报告
+
+        Args:
+            metrics: 绩效指标，None 时由权重与收益率简单计算
+            charts: 是否生成图表 (False 时完全不调用 matplotlib)
+            fmt: 图表格式，svg (HTML 内联，渲染更快) 或 png
+        """
         print("生成报告...")
 
+        # 重新读取输入文件 (优化结果可能已在两次 run 之间更新)
+        self._weights = None
+        self._returns = None
+
         weights = self.load_weights()
         print(f"  - 资产数量: {len(weights)}")
 
+        if metrics is None or (charts and HAS_MATPLOTLIB):
+            self._warn_missing_symbols(self.load_returns(), weights)
+
         if metrics is None:
             # 简单计算
-            returns = self.load_returns()
-            w_dict = dict(zip(weights['symbol'], weights['weight']))
-            port_returns = returns[weights['symbol']].dot(w_dict)
+            port_returns = self._portfolio_returns(self.load_returns(), weights)
+            if port_returns is None:
+                raise ValueError("价格数据中没有任何持仓代码，无法计算组合绩效指标")
+            # 均值/标准差只算一次，年化收益与夏普共用 (ddof=1 与 Series.std 一致)
+            pr = port_returns.to_numpy()
+            ann_return = pr.mean() * 252
+            ann_vol = pr.std(ddof=1) * np.sqrt(252)
             metrics = {
-                'annualized_return': port_returns.mean() * 252,
-                'annualized_vol': port_returns.std() * np.sqrt(252),
-                'sharpe_ratio': (port_returns.mean() * 252 - 0.025) / (port_returns.std() * np.sqrt(252)),
-                'max_drawdown': (port_returns.cumsum() - port_returns.cumsum().cummax()).min()
+                'annualized_return': ann_return,
+                'annualized_vol': ann_vol,
+                'sharpe_ratio': (ann_return - 0.025) / ann_vol,
+                'max_drawdown': max_drawdown(port_returns)
             }
 
         # 生成图表
-        charts = {}
-        if HAS_MATPLOTLIB:
-            charts['pie'] = self.generate_pie_chart(weights)
-            charts['cumulative'] = self.generate_historical_curve(self.load_returns(), weights)
+        chart_data = {}
+        if charts and HAS_MATPLOTLIB:
+            chart_data['pie'] = self.generate_pie_chart(weights, fmt)
+            chart_data['cumulative'] = self.generate_historical_curve(self.load_returns(), weights, fmt)
 
         # 生成报告
         text_report = self.generate_text_report(weights, metrics)
         text_path = os.path.join(self.reports_dir, "portfolio_report.md")
-        with open(text_path, 'w', encoding='utf-8') as f:
+        with open(text_path, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
             f.write(text_report)
         print(f"  - 文本报告: {text_path}")
 
-        html_path = self.save_as_html(text_report, charts)
+        html_path = self.save_as_html(text_report, chart_data, weights, fmt)
         print(f"  - HTML报告: {html_path}")
 
         print("报告生成完成")
@@ -11,9 +11,92 @@
 
 import numpy as np
 import pandas as pd
-from scipy import stats
+from scipy.signal import lfilter
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+# filter_universe 逐股信号判断的线程数 (滚动计算主要在释放 GIL 的 C 代码中)
+FILTER_WORKERS = 8
+
+
+def _rsrs_kernel(lows: np.ndarray, highs: np.ndarray, n: int) -> np.ndarray:
+    """
+    逐列计算 RSRS 斜率 (T×N，第 i 行为 [i-n, i) 窗口)，与 TrendFilter.calculate_rsrs 口径一致
+
+    每列先去均值，再以滚动和 (加入新值、剔除旧值) 单次扫描；窗口含缺失值或无波动时为 NaN
+    """
+    t, m = lows.shape
+    out = np.full((t, m), np.nan)
+    for j in prange(m):
+        count = 0
+        mean_l = 0.0
+        mean_h = 0.0
+        for i in range(t):
+            if not (np.isnan(lows[i, j]) or np.isnan(highs[i, j])):
+                mean_l += lows[i, j]
+                mean_h += highs[i, j]
+                count += 1
+        if count == 0:
+            continue
+        mean_l /= count
+        mean_h /= count
+
+        scale = 1e-300
+        for i in range(t):
+            dl = lows[i, j] - mean_l
+            dh = highs[i, j] - mean_h
+            if dl * dl > scale:
+                scale = dl * dl
+            if dh * dh > scale:
+                scale = dh * dh
+        tol = 1e-10 * n * n * scale
+
+        sl = 0.0
+        sh = 0.0
+        slh = 0.0
+        sll = 0.0
+        shh = 0.0
+        missing = 0
+        for i in range(1, t):
+            # 加入第 i-1 行，剔除第 i-1-n 行
+            for k, sign in ((i - 1, 1.0), (i - 1 - n, -1.0)):
+                if k < 0:
+                    continue
+                dl = lows[k, j] - mean_l
+                dh = highs[k, j] - mean_h
+                if np.isnan(dl) or np.isnan(dh):
+                    missing += 1 if sign > 0 else -1
+                else:
+                    sl += sign * dl
+                    sh += sign * dh
+                    slh += sign * dl * dh
+                    sll += sign * dl * dl
+                    shh += sign * dh * dh
+            if i >= n and missing == 0:
+                den = n * sll - sl * sl
+                if den > tol and n * shh - sh * sh > tol:
+                    out[i, j] = (n * slh - sl * sh) / den
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # 各股票相互独立，按列并行
+    _rsrs_kernel = njit(cache=True, parallel=True)(_rsrs_kernel)
 
 
 class TrendStatus(Enum):
@@ -25,6 +108,59 @@ class TrendStatus(Enum):
     STRONG_DOWN = "强下降"
 
 
+class RollingRSRS:
+    """
+    RSRS 斜率的增量计算 (盘中/实盘逐根 K 线更新)
+
+    维护最近 n 根 K 线的 ΣL, ΣH, ΣLH, ΣL², ΣH²，每次 update 加入新值、剔除最旧值，O(1) 得到
+    斜率 (n·ΣLH - ΣL·ΣH) / (n·ΣL² - (ΣL)²)。价格以第一根 K 线为基准平移后再累加，避免大数相减的精度损失
+
+    update 加入第 t 根 K 线后返回的斜率，对应 TrendFilter.calculate_rsrs 第 t+1 行的值 (窗口 [t-n+1, t])
+    """
+
+    def __init__(self, n: int = 18):
+        self.n = n
+        self._window = deque()
+        self._base = None
+        self._scale = np.finfo(np.float64).tiny
+        self._sl = self._sh = self._slh = self._sll = self._shh = 0.0
+
+    def update(self, high: float, low: float) -> float:
+        """
+        加入一根 K 线
+
+        Returns:
+            最近 n 根 K 线的 RSRS 斜率；窗口未满或最高价/最低价无波动时为 NaN
+        """
+        if self._base is None:
+            self._base = (low, high)
+        dl = low - self._base[0]
+        dh = high - self._base[1]
+        self._scale = max(self._scale, dl * dl, dh * dh)
+
+        self._window.append((dl, dh))
+        self._add(dl, dh, 1.0)
+        if len(self._window) > self.n:
+            self._add(*self._window.popleft(), -1.0)
+        if len(self._window) < self.n:
+            return np.nan
+
+        n = self.n
+        den = n * self._sll - self._sl * self._sl
+        den_h = n * self._shh - self._sh * self._sh
+        tol = 1e-10 * n * n * self._scale
+        if den <= tol or den_h <= tol:
+            return np.nan
+        return (n * self._slh - self._sl * self._sh) / den
+
+    def _add(self, dl: float, dh: float, sign: float):
+        self._sl += sign * dl
+        self._sh += sign * dh
+        self._slh += sign * dl * dh
+        self._sll += sign * dl * dl
+        self._shh += sign * dh * dh
+
+
 class TrendFilter:
     """趋势过滤器"""
 
@@ -52,12 +188,48 @@ class TrendFilter:
             periods: 周期列表
 
         Returns:
-            包含均线的 DataFrame
+            包含均线的 DataFrame (原数据 + ma_{period} 列)
         """
-        result = df.copy()
-        for period in periods:
-            result[f'ma_{period}'] = result[self.price_col].rolling(period).mean()
-        return result
+        ma = self.calculate_ma_columns(df, periods)
+        # 已有同名均线列时以新结果为准
+        return pd.concat([df.drop(columns=ma.columns, errors='ignore'), ma], axis=1)
+
+    def calculate_ma_columns(self, df: pd.DataFrame, periods: List[int] = [60, 120, 250]) -> pd.DataFrame:
+        """
+        只计算均线列，不复制原数据 (内部只需均线时使用)
+
+        Returns:
+            仅含 ma_{period} 列的 DataFrame，索引与 df 相同
+        """
+        rolling = df[self.price_col].rolling
+        return pd.DataFrame({f'ma_{period}': rolling(period).mean() for period in periods},
+                            index=df.index)
+
+    def _stack_head_aligned(self, prices: Dict[str, pd.DataFrame], col: str) -> np.ndarray:
+        """把各股票的某一列按首端对齐堆叠成 T×N 矩阵 (尾部以 NaN 补齐)"""
+        t = max(len(df) for df in prices.values())
+        mat = np.full((t, len(prices)), np.nan)
+        for j, df in enumerate(prices.values()):
+            mat[:len(df), j] = df[col].to_numpy(dtype=np.float64)
+        return mat
+
+    def calculate_ma_batch(self, prices: Dict[str, pd.DataFrame], period: int = 250) -> Dict[str, pd.Series]:
+        """
+        批量计算多只股票的均线
+
+        各股票按首端对齐堆叠成矩阵后整体滚动一次，尾部补齐的 NaN 不影响已有数据的结果
+
+        Returns:
+            {symbol: MA 序列}
+        """
+        if not prices:
+            return {}
+
+        ma = pd.DataFrame(self._stack_head_aligned(prices, self.price_col)).rolling(period).mean().to_numpy()
+        return {
+            symbol: pd.Series(ma[:len(df), j], index=df.index)
+            for j, (symbol, df) in enumerate(prices.items())
+        }
 
     def ma_trend_status(self, df: pd.DataFrame, ma_period: int = 250) -> TrendStatus:
         """
@@ -68,18 +240,23 @@ class TrendFilter:
         - 价格在 MA 下方 + MA 向下 = 下降趋势
         - 其他情况 = 震荡
         """
-        if len(df) < ma_period:
+        return self._ma_status(df[self.price_col].to_numpy(),
+                               df[f'ma_{ma_period}'].to_numpy(), ma_period)
+
+    @staticmethod
+    def _ma_status(price: np.ndarray, ma: np.ndarray, ma_period: int) -> TrendStatus:
+        """ma_trend_status 的数组版本 (按位置直接取值，避免 Series.iloc 的逐次查找开销)"""
+        if len(price) < ma_period:
             return TrendStatus.NEUTRAL
 
-        current_price = df[self.price_col].iloc[-1]
-        ma_value = df[f'ma_{ma_period}'].iloc[-1]
+        current_price = price[-1]
+        ma_value = ma[-1]
 
         # 计算 MA 的斜率 (过去 20 个交易日)
-        ma_series = df[f'ma_{ma_period}']
-        if len(ma_series) < 20:
+        if len(ma) < 20:
             return TrendStatus.NEUTRAL
 
-        ma_slope = (ma_series.iloc[-1] - ma_series.iloc[-20]) / 20
+        ma_slope = (ma[-1] - ma[-20]) / 20
 
         # 判断趋势
         if current_price > ma_value and ma_slope > 0.001:
@@ -100,13 +277,20 @@ class TrendFilter:
         Returns:
             布尔 Series，True 表示通过过滤
         """
-        if f'ma_{ma_period}' not in df.columns:
-            df = self.calculate_ma(df, [ma_period])
+        if f'ma_{ma_period}' in df.columns:
+            ma = df[f'ma_{ma_period}']
+        else:
+            ma = self.calculate_ma_columns(df, [ma_period])[f'ma_{ma_period}']
 
-        above_ma = df[self.price_col] > df[f'ma_{ma_period}']
-        ma_trending_up = df[f'ma_{ma_period}'].diff(20) > 0
+        # 直接在 numpy 数组上比较，避免 Series 中间结果的索引对齐开销
+        price = df[self.price_col].to_numpy(dtype=np.float64)
+        ma = ma.to_numpy(dtype=np.float64)
 
-        return above_ma & ma_trending_up
+        ma_diff = np.full_like(ma, np.nan)
+        ma_diff[20:] = ma[20:] - ma[:-20]
+
+        mask = (price > ma) & (ma_diff > 0)
+        return pd.Series(mask, index=df.index)
 
     # ==================== RSRS 阻力支撑相对强度 ====================
 
@@ -124,29 +308,68 @@ class TrendFilter:
         Returns:
             RSRS 斜率序列
         """
-        rsrs_values = []
-
-        for i in range(len(df)):
-            if i < n:
-                rsrs_values.append(np.nan)
-                continue
-
-            highs = df[self.high_col].iloc[i-n:i]
-            lows = df[self.low_col].iloc[i-n:i]
+        # 线性回归: High = Beta * Low + Alpha
+        # Beta 就是 RSRS 斜率 = (n·ΣLH - ΣL·ΣH) / (n·ΣL² - (ΣL)²)，四个滚动和一次算出全部窗口
+        lows = df[self.low_col].to_numpy(dtype=np.float64)
+        highs = df[self.high_col].to_numpy(dtype=np.float64)
+
+        # 先减去均值，避免大数相减的精度损失
+        finite = ~(np.isnan(lows) | np.isnan(highs))
+        if finite.any():
+            lows = lows - lows[finite].mean()
+            highs = highs - highs[finite].mean()
+        sums = pd.DataFrame({
+            'l': lows, 'h': highs, 'lh': lows * highs, 'll': lows * lows, 'hh': highs * highs
+        }).rolling(n).sum().shift(1)  # 第 i 行使用 [i-n, i) 窗口；含缺失值的窗口为 NaN
+
+        num = n * sums['lh'].to_numpy() - sums['l'].to_numpy() * sums['h'].to_numpy()
+        den = n * sums['ll'].to_numpy() - sums['l'].to_numpy() ** 2
+        den_h = n * sums['hh'].to_numpy() - sums['h'].to_numpy() ** 2
+
+        # 窗口内最高价或最低价没有波动 (仅剩舍入误差) 时不计算
+        scale = max(np.nanmax(lows * lows, initial=0.0), np.nanmax(highs * highs, initial=0.0),
+                    np.finfo(np.float64).tiny)
+        tol = 1e-10 * n * n * scale
+        with np.errstate(invalid='ignore'):
+            valid = (den > tol) & (den_h > tol)
+        rsrs = np.divide(num, den, out=np.full(len(df), np.nan), where=valid)
+
+        return pd.Series(rsrs, index=df.index)
+
+    def calculate_rsrs_batch(self, prices: Dict[str, pd.DataFrame], n: int = 18) -> Dict[str, pd.Series]:
+        """
+        批量计算多只股票的 RSRS 斜率
 
-            # 线性回归: High = Beta * Low + Alpha
-            # Beta 就是 RSRS 斜率
-            if lows.std() == 0 or highs.std() == 0:
-                rsrs_values.append(np.nan)
-                continue
+        numba 可用时把各股票按末端对齐堆叠成 T×N 矩阵 (前部以 NaN 补齐)，由并行内核一次算完；
+        否则逐只调用 calculate_rsrs
 
-            slope, _, _, _, _ = stats.linregress(lows, highs)
-            rsrs_values.append(slope)
+        Args:
+            prices: {symbol: price_df}
+            n: 回归周期
 
-        return pd.Series(rsrs_values, index=df.index)
+        Returns:
+            {symbol: RSRS 斜率序列}
+        """
+        if not NUMBA_AVAILABLE or not prices:
+            return {symbol: self.calculate_rsrs(df, n) for symbol, df in prices.items()}
+
+        t = max(len(df) for df in prices.values())
+        lows = np.full((t, len(prices)), np.nan)
+        highs = np.full((t, len(prices)), np.nan)
+        for j, df in enumerate(prices.values()):
+            if len(df):
+                lows[t - len(df):, j] = df[self.low_col].to_numpy(dtype=np.float64)
+                highs[t - len(df):, j] = df[self.high_col].to_numpy(dtype=np.float64)
+
+        rsrs = _rsrs_kernel(lows, highs, n)
+        return {
+            symbol: pd.Series(rsrs[t - len(df):, j], index=df.index)
+            for j, (symbol, df) in enumerate(prices.items())
+        }
 
     def rsrs_signal(self, df: pd.DataFrame, n: int = 18, threshold: float = 1.0,
-                     zscore_window: int = 600) -> Tuple[pd.Series, pd.Series]:
+                     zscore_window: int = 600,
+                     rsrs: Optional[pd.Series] = None) -> Tuple[pd.Series, pd.Series]:
         """
         RSRS 择时信号
 
@@ -160,20 +383,30 @@ class TrendFilter:
             n: 回归周期
             threshold: Z-Score 阈值 (通常 0.7 ~ 1.0)
             zscore_window: Z-Score 计算窗口
+            rsrs: 已计算的 RSRS 斜率 (如 calculate_rsrs_batch 结果)，None 时重新计算
 
         Returns:
             (rsrs_series, signal_series)
         """
         # 计算 RSRS 斜率
-        rsrs = self.calculate_rsrs(df, n)
-
-        # 计算 Z-Score
-        rsrs_mean = rsrs.rolling(zscore_window).mean()
-        rsrs_std = rsrs.rolling(zscore_window).std()
+        if rsrs is None:
+            rsrs = self.calculate_rsrs(df, n)
+
+        # 计算 Z-Score (bottleneck 可用时用其 C 实现的滑动窗口，口径与 pandas rolling 一致)
+        if BOTTLENECK_AVAILABLE:
+            values = rsrs.to_numpy(dtype=np.float64)
+            rsrs_mean = bn.move_mean(values, zscore_window, min_count=zscore_window)
+            rsrs_std = bn.move_std(values, zscore_window, min_count=zscore_window, ddof=1)
+            # 避免除零
+            rsrs_std[rsrs_std == 0] = np.nan
+            zscore = pd.Series((values - rsrs_mean) / rsrs_std, index=rsrs.index)
+        else:
+            rsrs_mean = rsrs.rolling(zscore_window).mean()
+            rsrs_std = rsrs.rolling(zscore_window).std()
 
-        # 避免除零
-        rsrs_std = rsrs_std.replace(0, np.nan)
-        zscore = (rsrs - rsrs_mean) / rsrs_std
+            # 避免除零
+            rsrs_std = rsrs_std.replace(0, np.nan)
+            zscore = (rsrs - rsrs_mean) / rsrs_std
 
         # 生成信号: Z-Score > threshold
         signal = zscore > threshold
@@ -201,33 +434,52 @@ class TrendFilter:
         """
         计算 LLT (Low Lag Trend) 低延迟趋势线
 
-        LLT 是二阶滤波器，比普通均线更快反应价格拐点
-
-        公式:
-        LLT_t = alpha * 2 * LLT_{t-1} - alpha^2 * LLT_{t-2} + (1 - alpha) * price_t
-                - 2 * (1 - alpha) * price_{t-1} + (1 - alpha)^2 * price_{t-2}
+        当前实现为简化版 (一阶)，即 EMA 递推:
+        LLT_t = a * price_t + (1 - a) * LLT_{t-1}，a = 2 / (n + 1)，前两项取原价
 
         Args:
             df: 价格数据
             n: 平滑参数 (影响滞后性)
-            alpha: 平滑因子 (0 < alpha < 1)，越大越灵敏
+            alpha: 保留参数，平滑系数由 n 决定
 
         Returns:
             LLT 序列
         """
-        price = df[self.price_col].values
-        llt = np.full(len(price), np.nan)
+        llt = df[self.price_col].to_numpy(dtype=np.float64).copy()
+        a = 2 / (n + 1)  # 根据窗口计算 alpha
 
-        # 简化版 LLT (一阶)
-        llt[0] = price[0]
-        llt[1] = price[1]
+        # 一阶 IIR 滤波由 lfilter 在 C 循环中完成；从第 1 项起滤波，初始状态使首项输出等于原价
+        if len(llt) > 2:
+            llt[1:] = lfilter([a], [1.0, a - 1.0], llt[1:], zi=[(1 - a) * llt[1]])[0]
 
-        alpha = 2 / (n + 1)  # 根据窗口计算 alpha
+        return pd.Series(llt, index=df.index)
 
-        for i in range(2, len(price)):
-            llt[i] = alpha * price[i] + (1 - alpha) * llt[i-1]
+    def calculate_llt_batch(self, prices: Dict[str, pd.DataFrame], n: int = 10) -> Dict[str, pd.Series]:
+        """
+        批量计算多只股票的 LLT
 
-        return pd.Series(llt, index=df.index)
+        各股票按首端对齐堆叠成矩阵，lfilter 沿时间轴一次滤完所有列 (每列各自的初始状态)；
+        尾部补齐的 NaN 只影响补齐部分，截回原长度后与 calculate_llt 结果一致
+
+        Returns:
+            {symbol: LLT 序列}
+        """
+        if not prices:
+            return {}
+
+        llt = self._stack_head_aligned(prices, self.price_col)
+        a = 2 / (n + 1)
+
+        # 不足 3 项的股票与 calculate_llt 一致保持原价
+        cols = np.array([len(df) > 2 for df in prices.values()])
+        if len(llt) > 2 and cols.any():
+            x = llt[1:, cols]
+            llt[1:, cols] = lfilter([a], [1.0, a - 1.0], x, axis=0, zi=(1 - a) * x[:1])[0]
+
+        return {
+            symbol: pd.Series(llt[:len(df), j], index=df.index)
+            for j, (symbol, df) in enumerate(prices.items())
+        }
 
     def llt_trend_status(self, llt: pd.Series) -> TrendStatus:
         """
@@ -274,7 +526,10 @@ class TrendFilter:
     def check_buy_signal(self, df: pd.DataFrame,
                          pe_percentile: float,
                          ma_period: int = 250,
-                         rsrs_threshold: float = 0.7) -> Dict:
+                         rsrs_threshold: float = 0.7,
+                         rsrs: Optional[pd.Series] = None,
+                         ma: Optional[pd.Series] = None,
+                         llt: Optional[pd.Series] = None) -> Dict:
         """
         综合买入信号检查 (价值 + 趋势共振)
 
@@ -283,6 +538,9 @@ class TrendFilter:
             pe_percentile: PE 分位数 (0~1)
             ma_period: 均线周期
             rsrs_threshold: RSRS Z-Score 阈值
+            rsrs: 已计算的 RSRS 斜率，None 时重新计算
+            ma: 已计算的 ma_period 均线 (如 calculate_ma_batch 结果)，None 时重新计算
+            llt: 已计算的 LLT (如 calculate_llt_batch 结果)，None 时重新计算
 
         Returns:
             信号结果字典
@@ -298,22 +556,35 @@ class TrendFilter:
         is_undervalued = pe_percentile < 0.4  # PE 分位数 < 40%
         result['value_score'] = 1 if is_undervalued else 0
 
+        # 不便宜时最终只能是 IGNORE，跳过全部技术指标计算
+        if not is_undervalued:
+            return result
+
         # 2. 计算技术指标
-        df_with_ma = self.calculate_ma(df, [ma_period])
-        rsrs, rsrs_signal = self.rsrs_signal(df)
-        llt = self.calculate_llt(df)
+        if ma is None:
+            ma = self.calculate_ma_columns(df, [ma_period])[f'ma_{ma_period}']
+        rsrs, rsrs_signal = self.rsrs_signal(df, rsrs=rsrs)
+        if llt is None:
+            llt = self.calculate_llt(df)
+
+        # 以下只取末端若干值，先取出底层数组再按位置索引
+        close = df[self.price_col].to_numpy()
+        ma_arr = ma.to_numpy()
+        rsrs_arr = rsrs.to_numpy()
+        signal_arr = rsrs_signal.to_numpy()
+        llt_arr = llt.to_numpy()
 
         # 3. MA 趋势判断
-        ma_status = self.ma_trend_status(df_with_ma, ma_period)
+        ma_status = self._ma_status(close, ma_arr, ma_period)
         ma_ok = ma_status in [TrendStatus.STRONG_UP, TrendStatus.UP]
         result['details']['ma_status'] = ma_status.value
 
         # 4. RSRS 判断
-        rsrs_ok = rsrs_signal.iloc[-1] if not rsrs_signal.empty else False
-        result['details']['rsrs_zscore'] = round(rsrs.iloc[-1], 2) if not rsrs.empty else None
+        rsrs_ok = signal_arr[-1] if len(signal_arr) else False
+        result['details']['rsrs_zscore'] = round(rsrs_arr[-1], 2) if len(rsrs_arr) else None
 
-        # 5. LLT 判断
-        llt_ok = self.llt_filter(df, llt).iloc[-1] if len(df) > 2 else False
+        # 5. LLT 判断 (同 llt_filter 末端: 价格在 LLT 上方且 LLT 向上)
+        llt_ok = (close[-1] > llt_arr[-1]) & (llt_arr[-1] - llt_arr[-2] > 0) if len(df) > 2 else False
         result['details']['llt_status'] = 'up' if llt_ok else 'down'
 
         # 6. 趋势综合得分
@@ -338,7 +609,8 @@ class TrendFilter:
 
     def filter_universe(self, prices: Dict[str, pd.DataFrame],
                         pe_percentiles: Dict[str, float],
-                        min_trend_score: float = 0.33) -> Dict[str, Dict]:
+                        min_trend_score: float = 0.33,
+                        max_workers: int = FILTER_WORKERS) -> Dict[str, Dict]:
         """
         对整个股票池进行趋势过滤
 
@@ -346,12 +618,33 @@ class TrendFilter:
             prices: {symbol: price_df}
             pe_percentiles: {symbol: pe_percentile}
             min_trend_score: 最小趋势得分
+            max_workers: 逐股信号判断的线程数
 
         Returns:
             {symbol: signal_result}
         """
         results = {}
 
+        # MA / RSRS / LLT 对数据充足且被低估的股票各一次批量计算 (其余股票直接判为 IGNORE)
+        eligible = {
+            symbol: df for symbol, df in prices.items()
+            if len(df) >= 250 and pe_percentiles.get(symbol, 1.0) < 0.4
+        }
+        ma_all = self.calculate_ma_batch(eligible, 250)
+        rsrs_all = self.calculate_rsrs_batch(eligible)
+        llt_all = self.calculate_llt_batch(eligible)
+
+        # 低估股票的逐股判断彼此独立，交给线程池并发执行
+        futures = {}
+        if eligible:
+            workers = max(1, min(max_workers, len(eligible)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    symbol: executor.submit(self.check_buy_signal, df, pe_percentiles[symbol],
+                                            rsrs=rsrs_all[symbol], ma=ma_all[symbol], llt=llt_all[symbol])
+                    for symbol, df in eligible.items()
+                }
+
         for symbol, df in prices.items():
             if len(df) < 250:  # 数据不足
                 results[symbol] = {
@@ -360,10 +653,11 @@ class TrendFilter:
                 }
                 continue
 
-            pe_pct = pe_percentiles.get(symbol, 1.0)  # 默认不便宜
-
-            signal = self.check_buy_signal(df, pe_pct)
-            results[symbol] = signal
+            if symbol in futures:
+                results[symbol] = futures[symbol].result()
+            else:
+                # 不便宜，check_buy_signal 直接返回 IGNORE
+                results[symbol] = self.check_buy_signal(df, pe_percentiles.get(symbol, 1.0))
 
         return results
 
@@ -6,6 +6,7 @@
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # 添加父目录到路径以便导入 DataHub
@@ -13,17 +14,61 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-from scipy import stats
 import logging
 
-from DataHub.core.data_client import UnifiedDataClient
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from DataHub.core.data_client import UnifiedDataClient, retry_call
+from .config_loader import load_config
+from .zt_cache import save_zt_partition, open_zt_dataset, load_zt_dataset, as_industry_category
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 并发下载历史涨停池的线程数 (网络 I/O 为主)
+ZT_DOWNLOAD_WORKERS = 8
+# 单日请求失败后的重试次数 (指数退避)
+ZT_FETCH_RETRIES = 3
+# 事件研究的涨停家数触发阈值
+EVENT_THRESHOLDS = (3, 5, 8, 10)
+
+
+def _next_in_group(codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    组内下一行的取值 (等价于 groupby(...).shift(-1))，组内最后一行为 -1
+
+    Args:
+        codes: 分组编码 (pd.factorize 结果)，需已按 (分组, 日期) 排序
+        counts: 与 codes 对齐的 int32 取值
+    """
+    out = np.full(len(counts), -1, dtype=np.int32)
+    same = codes[:-1] == codes[1:]
+    out[:-1][same] = counts[1:][same]
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _next_in_group(codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        # 单次顺序扫描，不生成中间布尔数组 (依赖行序，不能并行)
+        n = len(counts)
+        out = np.empty(n, dtype=np.int32)
+        for i in range(n - 1):
+            out[i] = counts[i + 1] if codes[i] == codes[i + 1] else -1
+        if n > 0:
+            out[n - 1] = -1
+        return out
+
 
 class EventStudyBacktest:
     """事件研究回测器"""
@@ -42,6 +87,8 @@ class EventStudyBacktest:
         cache_config = self.config.get('cache', {}).get('dir', 'cache')
         self.cache_dir = cache_config if os.path.isabs(cache_config) else os.path.join(self.base_dir, cache_config)
         os.makedirs(self.cache_dir, exist_ok=True)
+        # 涨停池数据集 (文件列表/元数据) 会话内缓存，下载新数据后失效
+        self._zt_dataset = None
 
         # 图表输出目录
         output_config = self.config.get('output', {})
@@ -54,59 +101,63 @@ class EventStudyBacktest:
         self.data_client = UnifiedDataClient()
 
     def _load_config(self, path: str) -> dict:
-        import yaml
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            logger.warning(f"Config file not found: {path}, using default config")
-            return {
-                'cache': {'dir': 'cache'},
-                'event_params': {'min_zt_count': 3},
-                'output': {'signals_file': 'signals.json', 'history_file': 'history.csv'}
-            }
-
-    def download_zt_history(self, start_date: str, end_date: str) -> pd.DataFrame:
-        """
-        下载历史涨停数据
-        """
-        all_zt = []
+        return load_config(path)
 
-        current = datetime.strptime(start_date, '%Y%m%d')
-        end = datetime.strptime(end_date, '%Y%m%d')
+    def _fetch_zt_day(self, date_str: str) -> pd.DataFrame:
+        """下载单日涨停池，失败时按指数退避重试"""
+        df = retry_call(lambda: self.data_client.get_zt_pool(date_str),
+                        retries=ZT_FETCH_RETRIES, base_delay=1.0)
 
-        while current <= end:
-            date_str = current.strftime('%Y%m%d')
+        if not df.empty:
+            df['date'] = date_str
+        return df
 
-            if current.weekday() >= 5:
-                current += timedelta(days=1)
-                continue
+    def download_zt_history(self, start_date: str, end_date: str,
+                            max_workers: int = ZT_DOWNLOAD_WORKERS) -> pd.DataFrame:
+        """
+        下载历史涨停数据 (按交易日并发请求)
+        """
+        dates = pd.bdate_range(start_date, end_date).strftime('%Y%m%d').tolist()
+        if not dates:
+            return pd.DataFrame()
 
-            try:
-                df = self.data_client.get_zt_pool(date_str)
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dates)))) as executor:
+            futures = {executor.submit(self._fetch_zt_day, d): d for d in dates}
+            for future in as_completed(futures):
+                date_str = futures[future]
+                try:
+                    df = future.result()
+                except Exception:
+                    print(f"{date_str}: 无数据或错误")
+                    continue
                 if not df.empty:
-                    df['date'] = date_str
-                    all_zt.append(df)
+                    results[date_str] = df
                     print(f"已下载: {date_str}, 涨停 {len(df)} 家")
-            except Exception as e:
-                print(f"{date_str}: 无数据或错误")
 
-            current += timedelta(days=1)
+        # 按日期顺序写入 zt_pool/date=YYYYMMDD 分区并合并
+        all_zt = [results[d] for d in dates if d in results]
+        for df in all_zt:
+            save_zt_partition(self.cache_dir, df, df['date'].iat[0])
+        if all_zt:
+            self._zt_dataset = None
 
         if all_zt:
-            result = pd.concat(all_zt, ignore_index=True)
-            cache_file = os.path.join(self.cache_dir, "zt_history.parquet")
-            result.to_parquet(cache_file)
-            return result
+            return pd.concat(all_zt, ignore_index=True)
 
         return pd.DataFrame()
 
-    def load_zt_history(self) -> pd.DataFrame:
-        """加载历史涨停数据"""
-        cache_file = os.path.join(self.cache_dir, "zt_history.parquet")
+    def load_zt_history(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """加载历史涨停数据 (按 date 分区裁剪，兼容旧版 zt_history.parquet)"""
+        if self._zt_dataset is None:
+            self._zt_dataset = open_zt_dataset(self.cache_dir)
+        df = load_zt_dataset(self.cache_dir, start_date, end_date, dataset=self._zt_dataset)
+        if not df.empty:
+            return df
 
+        cache_file = os.path.join(self.cache_dir, "zt_history.parquet")
         if os.path.exists(cache_file):
-            return pd.read_parquet(cache_file)
+            return pd.read_parquet(cache_file, engine='pyarrow')
 
         return pd.DataFrame()
 
@@ -115,7 +166,28 @@ class EventStudyBacktest:
         if df_zt.empty:
             return pd.DataFrame()
 
-        heat = df_zt.groupby(['date', '行业']).size().reset_index(name='limit_up_count')
+        if POLARS_AVAILABLE:
+            # Polars 多线程哈希聚合，仅转换参与分组的两列
+            heat = (
+                pl.from_pandas(df_zt[['date', '行业']])
+                .lazy()
+                .group_by(['date', '行业'])
+                .agg(pl.len().cast(pl.Int64).alias('limit_up_count'))
+                .rename({'行业': 'industry'})
+                .sort(['date', 'industry'])
+                .collect()
+                .to_pandas()
+            )
+            return heat
+
+        heat = (
+            as_industry_category(df_zt, '行业')
+            .groupby('date', observed=True)['行业']
+            .value_counts(sort=False)
+            .rename('limit_up_count')
+            .reset_index()
+        )
+        heat = heat[heat['limit_up_count'] > 0].sort_values(['date', '行业'], ignore_index=True)
         heat.columns = ['date', 'industry', 'limit_up_count']
 
         return heat
@@ -145,46 +217,123 @@ class EventStudyBacktest:
         print("事件研究: 板块热度与次日涨幅的关系")
         print("=" * 60)
 
-        industries = df_heat['industry'].unique()
-        print(f"共 {len(industries)} 个板块")
-
-        df_heat = df_heat.sort_values(['industry', 'date'])
-        df_heat['next_day_change'] = df_heat.groupby('industry')['limit_up_count'].shift(-1)
-
+        if POLARS_AVAILABLE:
+            df_heat, n_industries, stats = self._event_stats_polars(df_heat)
+        else:
+            df_heat, n_industries, stats = self._event_stats_numpy(df_heat)
+        print(f"共 {n_industries} 个板块")
         print(f"\n数据点总数: {len(df_heat)}")
 
-        thresholds = [3, 5, 8, 10]
         results = []
 
-        for threshold in thresholds:
-            subset = df_heat[df_heat['limit_up_count'] >= threshold]
-
-            if len(subset) > 10:
-                avg_next = subset['limit_up_count'].mean()
-                win_rate = (subset['limit_up_count'] > threshold).mean()
-
+        for threshold, n_subset, avg_next, win_rate in stats:
+            if n_subset > 10:
                 results.append({
                     'threshold': threshold,
-                    'count': len(subset),
+                    'count': n_subset,
                     'avg_next_zt': avg_next,
                     'continuation_rate': win_rate
                 })
 
                 print(f"\n当涨停家数 >= {threshold}:")
-                print(f"  样本数: {len(subset)}")
+                print(f"  样本数: {n_subset}")
                 print(f"  次日平均涨停: {avg_next:.1f}")
                 print(f"  延续概率: {win_rate:.1%}")
 
         return df_heat, results
 
+    @staticmethod
+    def _event_stats_numpy(df_heat: pd.DataFrame) -> tuple:
+        """
+        NumPy 实现: 次日涨停家数 + 各阈值统计
+
+        Returns:
+            (按 industry/date 排序并带 next_day_change 的 df_heat, 板块数,
+             [(阈值, 样本数, 次日平均涨停, 延续概率), ...])
+        """
+        # industry 转为 category: 排序与分组都基于整数编码
+        df_heat = as_industry_category(df_heat, 'industry').sort_values(['industry', 'date'])
+        codes = df_heat['industry'].cat.codes.to_numpy()
+        counts = df_heat['limit_up_count'].to_numpy(dtype=np.int32)
+        next_zt = _next_in_group(codes, counts)
+        df_heat['next_day_change'] = np.where(next_zt != -1, next_zt, np.nan)
+
+        # 所有阈值一次计算: 按当日涨停家数排序一次，searchsorted 定位 >= / > 阈值的起点，
+        # 次日涨停家数的后缀和 / 有效样本数求均值 (组内最后一天无次日数据，不计入)
+        thresholds = np.asarray(EVENT_THRESHOLDS)
+        order = np.argsort(counts, kind='stable')
+        sorted_counts = counts[order]
+        sorted_next = next_zt[order]
+        has_next = sorted_next != -1
+        suffix_next = np.append(np.cumsum(np.where(has_next, sorted_next, 0)[::-1])[::-1], 0)
+        suffix_valid = np.append(np.cumsum(has_next[::-1])[::-1], 0)
+        ge_idx = np.searchsorted(sorted_counts, thresholds, side='left')
+        gt_idx = np.searchsorted(sorted_counts, thresholds, side='right')
+        n_ge = len(sorted_counts) - ge_idx
+        n_gt = len(sorted_counts) - gt_idx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_next_zt = suffix_next[ge_idx] / suffix_valid[ge_idx]
+            win_rate = n_gt / n_ge
+
+        stats = [
+            (int(t), int(n), float(avg), float(rate))
+            for t, n, avg, rate in zip(thresholds, n_ge, avg_next_zt, win_rate)
+        ]
+        return df_heat, len(np.unique(codes)), stats
+
+    @staticmethod
+    def _event_stats_polars(df_heat: pd.DataFrame) -> tuple:
+        """
+        Polars 实现 (返回值同 _event_stats_numpy)
+
+        排序、组内 shift 与阈值聚合在一个惰性查询中完成，collect_all 共享公共子计划
+        """
+        heat = (
+            pl.from_pandas(df_heat.astype({'industry': str}))
+            .lazy()
+            .sort(['industry', 'date'], maintain_order=True)
+            .with_columns(
+                pl.col('limit_up_count').shift(-1).over('industry').alias('next_day_change')
+            )
+        )
+        agg = (
+            heat.join(pl.LazyFrame({'threshold': list(EVENT_THRESHOLDS)}), how='cross')
+            .filter(pl.col('limit_up_count') >= pl.col('threshold'))
+            .group_by('threshold')
+            .agg(
+                pl.len().alias('count'),
+                pl.col('next_day_change').mean().alias('avg_next_zt'),
+                (pl.col('limit_up_count') > pl.col('threshold')).mean().alias('continuation_rate'),
+            )
+        )
+        heat_df, agg_df = pl.collect_all([heat, agg])
+
+        by_threshold = {row[0]: row[1:] for row in agg_df.select(
+            'threshold', 'count', 'avg_next_zt', 'continuation_rate').iter_rows()}
+        stats = [
+            (t, *by_threshold.get(t, (0, float('nan'), float('nan'))))
+            for t in EVENT_THRESHOLDS
+        ]
+        n_industries = heat_df['industry'].n_unique()
+        df_heat = as_industry_category(
+            heat_df.to_pandas().astype({'next_day_change': float}), 'industry'
+        )
+        return df_heat, n_industries, stats
+
     def analyze_correlation(self, df_heat: pd.DataFrame) -> float:
         """计算热度与次日涨幅的相关性"""
-        df = df_heat.dropna()
+        df = df_heat[['limit_up_count', 'next_day_change']].dropna()
 
         if len(df) < 10:
             return 0
 
-        corr = df['limit_up_count'].corr(df['next_day_change'])
+        # 去均值后两次点积即 Pearson 相关系数，不构造 2x2 协方差矩阵
+        a = df['limit_up_count'].to_numpy(dtype=np.float64)
+        b = df['next_day_change'].to_numpy(dtype=np.float64)
+        a = a - a.mean()
+        b = b - b.mean()
+        denom = np.sqrt(np.dot(a, a) * np.dot(b, b))
+        corr = float(np.dot(a, b) / denom) if denom > 0 else float('nan')
 
         print(f"\n涨停家数与次日涨幅相关系数: {corr:.4f}")
 
@@ -192,11 +341,18 @@ class EventStudyBacktest:
 
     def plot_analysis(self, df_heat: pd.DataFrame):
         """可视化分析"""
+        # 绘图库只在出图时导入，扫描/回测计算路径不加载 matplotlib/seaborn
+        import matplotlib
+        matplotlib.use('Agg')  # 批量回测只保存图片，不需要交互式窗口
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.style.use('seaborn-v0_8-whitegrid')
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
         ax1 = axes[0, 0]
-        df_heat['limit_up_count'].hist(bins=20, ax=ax1)
+        hist, edges = np.histogram(df_heat['limit_up_count'].to_numpy(), bins=20)
+        ax1.bar(edges[:-1], hist, width=np.diff(edges), align='edge')
         ax1.set_xlabel('Limit Up Count')
         ax1.set_ylabel('Frequency')
         ax1.set_title('Distribution of Daily Limit Up Count per Sector')
@@ -211,15 +367,17 @@ class EventStudyBacktest:
             sns.heatmap(pivot, ax=ax2, cmap='RdYlGn', center=0)
             ax2.set_title('Heatmap: ZT Count vs Next Day Performance')
 
+        # hexbin 绘制成本与样本点数无关，回归线用 polyfit 一次求出 (不做 bootstrap 置信区间)
         ax3 = axes[1, 0]
-        sns.regplot(
-            x='limit_up_count',
-            y='next_day_change',
-            data=df_heat,
-            ax=ax3,
-            scatter_kws={'alpha': 0.3},
-            line_kws={'color': 'red'}
-        )
+        valid = df_heat[['limit_up_count', 'next_day_change']].dropna()
+        x = valid['limit_up_count'].to_numpy(dtype=float)
+        y = valid['next_day_change'].to_numpy(dtype=float)
+        if len(x) > 0:
+            ax3.hexbin(x, y, gridsize=40, cmap='Blues', mincnt=1)
+        if len(np.unique(x)) > 1:
+            slope, intercept = np.polyfit(x, y, 1)
+            line_x = np.array([x.min(), x.max()])
+            ax3.plot(line_x, slope * line_x + intercept, color='red')
         ax3.set_xlabel('Today ZT Count')
         ax3.set_ylabel('Next Day ZT Count')
         ax3.set_title('Correlation Analysis')
@@ -233,8 +391,8 @@ class EventStudyBacktest:
 
         plt.tight_layout()
         chart_path = os.path.join(self.charts_dir, 'event_study_analysis.png')
-        plt.savefig(chart_path, dpi=150)
-        plt.show()
+        fig.savefig(chart_path, dpi=150)
+        plt.close(fig)
         print(f"图表已保存至: {chart_path}")
 
     def validate_strategy(self):
@@ -0,0 +1,48 @@
+"""
+ShortTerm 配置加载 - 各模块共用
+
+按 (绝对路径, 修改时间) 缓存解析结果，同一进程内 LimitUpScanner / MarketRegime /
+EventStudyBacktest / ShortTermDataManager 共享一次 YAML 解析；文件修改后自动重新读取
+"""
+
+import os
+import copy
+import logging
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# LibYAML C 扩展可用时使用 C 解析器
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 配置文件缺失时的默认配置
+DEFAULT_CONFIG = {
+    'cache': {'dir': 'cache'},
+    'event_params': {'min_zt_count': 3},
+    'output': {'signals_file': 'signals.json', 'history_dir': '../storage/outputs/shortterm/daily_signal/sector_heat_history'}
+}
+
+_config_cache = {}
+
+
+def load_config(path: str) -> dict:
+    """
+    读取 YAML 配置 (缓存结果为只读共享对象，调用方不要原地修改)
+
+    Args:
+        path: 配置文件路径
+
+    Returns:
+        配置字典，文件不存在时返回 DEFAULT_CONFIG 的副本
+    """
+    try:
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        logger.warning(f"Config file not found: {path}, using default config")
+        return copy.deepcopy(DEFAULT_CONFIG)
+
+    if key not in _config_cache:
+        with open(path, 'r', encoding='utf-8') as f:
+            _config_cache[key] = yaml.load(f, Loader=_YAML_LOADER)
+    return _config_cache[key]
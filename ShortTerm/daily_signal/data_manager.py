@@ -2,7 +2,7 @@ import os
 import sys
 import json
 import logging
-import yaml
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -12,8 +12,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 
+from .config_loader import load_config
+from .zt_cache import save_zt_partition, load_zt_partition, load_zt_dataset
+
 logger = logging.getLogger(__name__)
 
+# 进程内涨停池 LRU 缓存的最大日期数 (约一个季度的交易日)
+ZT_POOL_CACHE_SIZE = 60
+
 # 尝试导入 DataHub
 try:
     from DataHub.services.data_service import DataService
@@ -22,6 +28,41 @@ try:
 except ImportError:
     DATAHUB_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(obj, path: str):
+    """写入缩进 2 的 UTF-8 JSON，安装了 orjson 时使用 orjson (可直接序列化 numpy 类型)"""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def _load_json(path: str):
+    """
+    读取 JSON 文件，安装了 orjson 时使用 orjson
+
+    旧版 json.dump 写出的文件可能含 NaN/Infinity，orjson 不接受这类字面量，遇到时回退到标准库。
+    """
+    if ORJSON_AVAILABLE:
+        raw = Path(path).read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw.decode('utf-8'))
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class ShortTermDataManager:
     """短线策略数据管理器 - 支持 DataHub"""
@@ -60,12 +101,16 @@ class ShortTermDataManager:
         else:
             self.datahub_service = None
 
+        # {日期: 涨停池}，按最近访问排序，超出 ZT_POOL_CACHE_SIZE 时淘汰最久未用的日期
+        self._zt_pool_cache: OrderedDict[str, pd.DataFrame] = OrderedDict()
+
     def _load_config(self, path: str) -> dict:
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_config(path)
 
     def save_zt_pool(self, date: str, df: pd.DataFrame):
         """保存涨停池数据"""
+        self._zt_pool_cache.pop(date, None)
+
         # 如果启用 DataHub，也保存到 DataHub
         if self.use_datahub and self.datahub_service:
             try:
@@ -74,12 +119,31 @@ class ShortTermDataManager:
             except Exception as e:
                 logger.warning(f"Failed to save ZT pool to DataHub: {e}")
 
-        # 同时保存本地缓存
-        cache_file = os.path.join(self.cache_dir, f"zt_pool_{date}.csv")
-        df.to_csv(cache_file, index=False, encoding='utf-8-sig')
+        # 同时保存本地缓存 (zt_pool/date=YYYYMMDD 分区)
+        save_zt_partition(self.cache_dir, df, date)
 
     def get_zt_pool(self, date: str) -> pd.DataFrame:
-        """读取涨停池数据"""
+        """
+        读取涨停池数据
+
+        同一进程内重复读取同一天 (回测按板块多次访问) 直接命中 LRU 缓存；
+        返回浅拷贝，调用方增删列不会影响缓存
+        """
+        df = self._zt_pool_cache.get(date)
+        if df is not None:
+            self._zt_pool_cache.move_to_end(date)
+            return df.copy(deep=False)
+
+        df = self._read_zt_pool(date)
+        if not df.empty:
+            self._zt_pool_cache[date] = df
+            if len(self._zt_pool_cache) > ZT_POOL_CACHE_SIZE:
+                self._zt_pool_cache.popitem(last=False)
+            return df.copy(deep=False)
+        return df
+
+    def _read_zt_pool(self, date: str) -> pd.DataFrame:
+        """读取涨停池数据 (不经过进程内缓存)"""
         # 优先从 DataHub 获取
         if self.use_datahub and self.datahub_service:
             try:
@@ -90,27 +154,35 @@ class ShortTermDataManager:
             except Exception as e:
                 logger.warning(f"DataHub unavailable: {e}")
 
-        # 回退到本地文件
-        cache_file = os.path.join(self.cache_dir, f"zt_pool_{date}.csv")
-        if os.path.exists(cache_file):
-            return pd.read_csv(cache_file)
-        return pd.DataFrame()
+        # 回退到本地分区缓存
+        return load_zt_partition(self.cache_dir, date)
+
+    def load_zt_pool_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        批量读取日期区间内的本地涨停池 (一次打开分区数据集，按 date 过滤)
+
+        Args:
+            start_date: 开始日期 (YYYYMMDD)
+            end_date: 结束日期 (YYYYMMDD)
+
+        Returns:
+            含 date 列的涨停池 DataFrame
+        """
+        return load_zt_dataset(self.cache_dir, start_date, end_date)
 
     def save_daily_signals(self, date: str, signals: dict):
         """保存每日信号到 JSON"""
         os.makedirs(os.path.dirname(self.signals_file), exist_ok=True)
         signals['date'] = date
         signals['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        with open(self.signals_file, 'w', encoding='utf-8') as f:
-            json.dump(signals, f, ensure_ascii=False, indent=2)
+        _dump_json(signals, self.signals_file)
 
     def get_daily_signals(self, date: Optional[str] = None) -> dict:
         """读取每日信号"""
         if os.path.exists(self.signals_file):
-            with open(self.signals_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if date is None or data.get('date') == date:
-                    return data
+            data = _load_json(self.signals_file)
+            if date is None or data.get('date') == date:
+                return data
         return {}
 
 
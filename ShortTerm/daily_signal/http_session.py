@@ -0,0 +1,31 @@
+"""
+共享 HTTP 会话 - 复用连接池
+
+东方财富 / 同花顺的直接请求统一走同一个 requests.Session，
+同一主机的后续请求复用 keep-alive 连接，省去重复的 TCP/TLS 握手
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 每个主机保留的连接数 (需覆盖并发获取宏观因子/板块表现的线程数)
+HTTP_POOL_SIZE = 32
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """返回进程内共享的 requests.Session (首次调用时创建)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
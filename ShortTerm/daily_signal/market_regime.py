@@ -5,6 +5,9 @@
 
 import os
 import sys
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加父目录到路径以便导入 DataHub
@@ -15,10 +18,28 @@ import numpy as np
 from datetime import datetime, timedelta
 import logging
 
-from DataHub.core.data_client import UnifiedDataClient
+from DataHub.core.data_client import UnifiedDataClient, backoff_delay
+from .config_loader import load_config
 
 logger = logging.getLogger(__name__)
 
+# 宏观数据与市场状态的缓存有效期 (秒)，同一轮扫描内重复调用不再请求网络
+MARKET_DATA_TTL = 3600
+
+
+def _ttl_cached(method):
+    """实例级 TTL 缓存: MARKET_DATA_TTL 秒内重复调用直接返回上次结果"""
+    @functools.wraps(method)
+    def wrapper(self):
+        now = time.monotonic()
+        hit = self._ttl_cache.get(method.__name__)
+        if hit is not None and now - hit[0] < MARKET_DATA_TTL:
+            return hit[1]
+        value = method(self)
+        self._ttl_cache[method.__name__] = (now, value)
+        return value
+    return wrapper
+
 
 class MarketRegime:
     """市场状态判断 - 宏观+技术综合版"""
@@ -37,22 +58,15 @@ class MarketRegime:
 
         self.data_client = UnifiedDataClient()
 
+        # {方法名: (时间戳, 结果)}，见 _ttl_cached
+        self._ttl_cache = {}
+
         # 板块分类
         self.offensive_sectors = ['半导体', '新能源', '科技', '计算机', '通信', '传媒', '券商']
         self.defensive_sectors = ['黄金', '银行', '公用事业', '医药', '食品饮料', '电力']
 
     def _load_config(self, path: str) -> dict:
-        import yaml
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            logger.warning(f"Config file not found: {path}, using default config")
-            return {
-                'cache': {'dir': 'cache'},
-                'event_params': {'min_zt_count': 3},
-                'output': {'signals_file': 'signals.json', 'history_file': 'history.csv'}
-            }
+        return load_config(path)
 
     # ========== 宏观因子 ==========
 
@@ -95,8 +109,7 @@ class MarketRegime:
         Returns:
             {'current': float, 'prev_close': float, 'change_pct': float, 'name': str}
         """
-        import requests
-        import time
+        from .http_session import get_session
 
         params = self._EASTMONEY_API['params'].copy()
         params['secid'] = secid
@@ -106,13 +119,10 @@ class MarketRegime:
         full_url = f"{self._EASTMONEY_API['base_url']}?{'&'.join([f'{k}={v}' for k, v in params.items()])}"
         logger.info(f"东方财富请求URL: {full_url}")
 
-        # 添加延时避免频率限制
-        time.sleep(0.5)
-
-        # 重试3次
+        # 重试3次 (首次请求不等待，失败后指数退避)
         for attempt in range(3):
             try:
-                resp = requests.get(
+                resp = get_session().get(
                     self._EASTMONEY_API['base_url'],
                     params=params,
                     timeout=10
@@ -159,11 +169,12 @@ class MarketRegime:
             except Exception as e:
                 logger.debug(f"东方财富API获取失败 {secid} (attempt {attempt+1}/3): {e}")
                 if attempt < 2:
-                    time.sleep(1)  # 重试前等待
+                    time.sleep(backoff_delay(attempt))
                 continue
 
         return {}
 
+    @_ttl_cached
     def get_usd_cny_rate(self) -> dict:
         """获取美元人民币汇率 - 东方财富离岸人民币"""
         data = self._get_eastmoney_data(self._MACRO_SECIDS['usdcnh'])
@@ -184,10 +195,12 @@ class MarketRegime:
             import akshare as ak
             df = ak.fx_spot_quote()
             if not df.empty:
-                usd_row = df[df['货币对'] == 'USD/CNY']
-                if not usd_row.empty:
-                    buy = usd_row.iloc[0].get('买报价', 0)
-                    sell = usd_row.iloc[0].get('卖报价', 0)
+                # 一次取出 USD/CNY 的买/卖报价数组 (缺失列按 0 处理)，不逐行构造 Series
+                quotes = df.loc[df['货币对'] == 'USD/CNY'].reindex(
+                    columns=['买报价', '卖报价'], fill_value=0
+                ).to_numpy(dtype=np.float64)
+                if quotes.size:
+                    buy, sell = quotes[0]
                     if buy > 0 and sell > 0:
                         current = (buy + sell) / 2
                     elif sell > 0:
@@ -212,6 +225,7 @@ class MarketRegime:
         logger.warning("获取汇率失败，使用默认值")
         return {'current': 6.9, 'change_5d': 0, 'source': '默认', 'date': None}
 
+    @_ttl_cached
     def get_north_money_flow(self) -> dict:
         """获取北向资金流向"""
         try:
@@ -255,6 +269,7 @@ class MarketRegime:
         logger.warning("获取北向资金失败，使用默认值")
         return {'recent_3d_avg': 0, 'today': 0}
 
+    @_ttl_cached
     def get_gold_price(self) -> dict:
         """获取黄金价格 - 东方财富COMEX黄金"""
         data = self._get_eastmoney_data(self._MACRO_SECIDS['gold'])
@@ -276,10 +291,11 @@ class MarketRegime:
         try:
             import akshare as ak
             df = ak.futures_zh_spot(symbol="AU0")
-            if not df.empty and len(df) > 0:
-                latest = df.iloc[0]
-                current = float(latest.get('current_price', 0))
-                last_settle = float(latest.get('last_settle_price', current))
+            if not df.empty:
+                # 最新行的价格直接从 numpy 数组读取
+                current = float(df['current_price'].to_numpy(dtype=np.float64)[0]) if 'current_price' in df.columns else 0.0
+                last_settle = (float(df['last_settle_price'].to_numpy(dtype=np.float64)[0])
+                               if 'last_settle_price' in df.columns else current)
                 if current > 0 and last_settle > 0:
                     change = current - last_settle
                     change_pct = (change / last_settle) * 100
@@ -299,6 +315,7 @@ class MarketRegime:
         logger.warning("获取黄金价格失败，使用默认值")
         return {'current': 2000, 'change': 0, 'change_pct': 0, 'change_5d': 0, 'unit': 'USD/盎司', 'source': '默认', 'note': '数据暂不可用'}
 
+    @_ttl_cached
     def get_dxy_index(self) -> dict:
         """获取美元指数 - 东方财富"""
         data = self._get_eastmoney_data(self._MACRO_SECIDS['dxy'])
@@ -338,6 +355,7 @@ class MarketRegime:
         logger.warning("美元指数数据暂不可用，返回默认值")
         return {'current': 103.5, 'change_pct': 0, 'change_5d': 0, 'source': '默认', 'note': '数据暂不可用'}
 
+    @_ttl_cached
     def get_oil_price(self) -> dict:
         """获取原油价格 - 东方财富NYMEX原油"""
         data = self._get_eastmoney_data(self._MACRO_SECIDS['oil'])
@@ -360,10 +378,11 @@ class MarketRegime:
         try:
             import akshare as ak
             df = ak.futures_zh_spot(symbol="SC0")
-            if not df.empty and len(df) > 0:
-                latest = df.iloc[0]
-                current = float(latest.get('current_price', 0))
-                last_settle = float(latest.get('last_settle_price', current))
+            if not df.empty:
+                # 最新行的价格直接从 numpy 数组读取
+                current = float(df['current_price'].to_numpy(dtype=np.float64)[0]) if 'current_price' in df.columns else 0.0
+                last_settle = (float(df['last_settle_price'].to_numpy(dtype=np.float64)[0])
+                               if 'last_settle_price' in df.columns else current)
                 if current > 0 and last_settle > 0:
                     change = current - last_settle
                     change_pct = (change / last_settle) * 100
@@ -954,6 +973,16 @@ class MarketRegime:
             'note': note
         }
 
+    @_ttl_cached
+    def get_industry_board(self) -> pd.DataFrame:
+        """
+        东方财富行业板块行情 (stock_board_industry_name_em)
+
+        会话内缓存，板块强度与 LimitUpScanner 的行业列表共用同一次请求；
+        调用方需要修改时先 copy
+        """
+        return self.data_client.get_industry_list()
+
     def get_sector_strength(self) -> dict:
         """
         获取板块强度对比（进攻 vs 防守）
@@ -962,7 +991,7 @@ class MarketRegime:
             import akshare as ak
             # 尝试多个接口获取行业板块数据
             try:
-                df = ak.stock_board_industry_name_em()
+                df = self.get_industry_board().copy()
                 # 获取涨幅列
                 if '涨跌幅' in df.columns:
                     change_col = '涨跌幅'
@@ -1461,17 +1490,24 @@ class MarketRegime:
 
     # ========== 综合判断 ==========
 
+    @_ttl_cached
     def get_market_status(self) -> dict:
         """
         综合判断市场状态（宏观+技术）
         返回包含宏观评分、技术面评分的完整评估
         """
-        # 1. 宏观因子
-        currency = self.get_usd_cny_rate()
-        north_money = self.get_north_money_flow()
-        gold = self.get_gold_price()
-        dxy = self.get_dxy_index()  # 美元指数
-        oil = self.get_oil_price()  # 原油价格
+        # 1. 宏观因子 (相互独立的网络请求并发获取，耗时取最慢的一个)
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            currency_f = executor.submit(self.get_usd_cny_rate)
+            north_money_f = executor.submit(self.get_north_money_flow)
+            gold_f = executor.submit(self.get_gold_price)
+            dxy_f = executor.submit(self.get_dxy_index)  # 美元指数
+            oil_f = executor.submit(self.get_oil_price)  # 原油价格
+        currency = currency_f.result()
+        north_money = north_money_f.result()
+        gold = gold_f.result()
+        dxy = dxy_f.result()
+        oil = oil_f.result()
 
         # 2. 技术面因子
         breadth = self.get_market_breadth()
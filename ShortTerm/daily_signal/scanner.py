@@ -18,14 +18,35 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import warnings
 import logging
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow.dataset as ds
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
 from DataHub.services.data_service import DataService
 from DataHub.core.data_client import UnifiedDataClient
 from .market_regime import MarketRegime
+from .config_loader import load_config
+from .zt_cache import save_zt_partition, load_zt_partition, as_industry_category
 
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
+# 热点板块表现并发请求的线程数
+SECTOR_PERF_WORKERS = 8
+
 
 def get_trading_date(dt: datetime = None) -> str:
     """
@@ -203,6 +224,11 @@ class LimitUpScanner:
             self.cache_dir = os.path.join(self.base_dir, self.cache_dir)
         os.makedirs(self.cache_dir, exist_ok=True)
 
+        # 板块热度历史分区文件列表 (首次访问时扫描，会话内复用)
+        self._history_files_cache: list[str] | None = None
+        # 板块近期表现缓存 {(板块, 回看天数, 交易日): 绩效字典}
+        self._sector_perf_cache: dict[tuple[str, int, str], dict] = {}
+
         # DataHub 集成
         self.datahub_service = DataService()
         self.data_client = UnifiedDataClient()
@@ -213,17 +239,7 @@ class LimitUpScanner:
         logger.info("LimitUpScanner initialized with DataHub")
 
     def _load_config(self, path: str) -> dict:
-        import yaml
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            logger.warning(f"Config file not found: {path}, using default config")
-            return {
-                'cache': {'dir': 'cache'},
-                'event_params': {'min_zt_count': 3},
-                'output': {'signals_file': 'signals.json', 'history_file': 'history.csv'}
-            }
+        return load_config(path)
 
     def get_today_zt_pool(self, date: str = None) -> pd.DataFrame:
         """
@@ -233,7 +249,7 @@ class LimitUpScanner:
             date: 日期，格式 'YYYYMMDD'，默认当前交易日（考虑A股开盘时间）
 
         Returns:
-            涨停板 DataFrame
+            涨停板 DataFrame (所属行业 为 category)
         """
         if date is None:
             date = get_trading_date()
@@ -243,24 +259,21 @@ class LimitUpScanner:
             df = self.datahub_service.get_zt_pool(date)
             if not df.empty:
                 logger.info(f"Loaded ZT pool from DataHub for {date}")
-                return df
+                return as_industry_category(df)
         except Exception as e:
             logger.warning(f"DataHub unavailable: {e}")
 
         # 回退到本地缓存
-        cache_file = os.path.join(self.cache_dir, f"zt_pool_{date}.csv")
-
-        if os.path.exists(cache_file):
-            df = pd.read_csv(cache_file)
-            if not df.empty:
-                return df
+        df = load_zt_partition(self.cache_dir, date)
+        if not df.empty:
+            return as_industry_category(df)
 
         # 从网络获取
         try:
             df = self.data_client.get_zt_pool(date)
             
             if not df.empty:
-                df.to_csv(cache_file, index=False, encoding='utf-8-sig')
+                save_zt_partition(self.cache_dir, df, date)
 
                 # 同时保存到 DataHub
                 try:
@@ -268,7 +281,7 @@ class LimitUpScanner:
                 except Exception as e:
                     logger.warning(f"Failed to save ZT pool to DataHub: {e}")
 
-            return df
+            return as_industry_category(df)
         except Exception as e:
             print(f"获取 {date} 涨停数据失败: {e}")
             return pd.DataFrame()
@@ -279,7 +292,7 @@ class LimitUpScanner:
             date = get_trading_date()
 
         try:
-            return self.data_client.get_industry_list()
+            return self.market_regime.get_industry_board()
         except Exception as e:
             logger.warning(f"获取行业指数失败: {e}")
             return pd.DataFrame()
@@ -297,7 +310,25 @@ class LimitUpScanner:
         if df_zt.empty or '所属行业' not in df_zt.columns:
             return pd.DataFrame()
 
-        heat = df_zt.groupby('所属行业').size().reset_index(name='limit_up_count')
+        if POLARS_AVAILABLE:
+            heat = (
+                pl.from_pandas(df_zt[['所属行业']])
+                .lazy()
+                .group_by('所属行业')
+                .agg(pl.len().cast(pl.Int64).alias('limit_up_count'))
+                .sort('所属行业')
+                .collect()
+                .to_pandas()
+            )
+        else:
+            # 单列频数直接 value_counts，不构造 GroupBy；去掉未出现的类别并按行业排序
+            counts = as_industry_category(df_zt)['所属行业'].value_counts(sort=False)
+            heat = (
+                counts[counts > 0]
+                .sort_index()
+                .rename_axis('所属行业')
+                .reset_index(name='limit_up_count')
+            )
         heat['date'] = get_trading_date()
 
         return heat
@@ -312,7 +343,7 @@ class LimitUpScanner:
 
     def analyze_sector_performance(self, sector: str, days: int = 5) -> dict:
         """
-        分析某板块近期表现
+        分析某板块近期表现 (同一交易日内结果缓存)
 
         Args:
             sector: 板块名称
@@ -321,29 +352,56 @@ class LimitUpScanner:
         Returns:
             绩效字典
         """
+        key = (sector, days, get_trading_date())
+        if key in self._sector_perf_cache:
+            return self._sector_perf_cache[key]
+
         try:
             df = self.data_client.get_industry_cons(sector)
             
             if df.empty:
                 return {}
 
-            df = df.tail(days + 1)
+            df = df.iloc[-(days + 1):]
             if len(df) < 2:
                 return {}
 
-            change = (df['close'].iloc[-1] / df['close'].iloc[0] - 1)
-            avg_change = df['pct_chg'].mean() if 'pct_chg' in df.columns else 0
+            close = df['close'].to_numpy(dtype=float)
+            change = close[-1] / close[0] - 1
+            if 'pct_chg' in df.columns:
+                pct_chg = df['pct_chg'].to_numpy(dtype=float)
+                avg_change = np.nanmean(pct_chg)
+                volatility = pd.Series(pct_chg).std()
+            else:
+                avg_change = volatility = 0
 
-            return {
+            perf = {
                 'sector': sector,
                 'period_return': change,
                 'avg_daily_change': avg_change,
-                'volatility': df['pct_chg'].std() if 'pct_chg' in df.columns else 0
+                'volatility': volatility
             }
         except Exception as e:
             logger.warning(f"分析板块 {sector} 表现失败: {e}")
             return {}
 
+        self._sector_perf_cache[key] = perf
+        return perf
+
+    def analyze_sectors_performance(self, sectors: list[str], days: int = 5) -> dict[str, dict]:
+        """
+        并发分析多个板块近期表现 (每个板块一次独立网络请求)
+
+        Returns:
+            {板块名称: 绩效字典}
+        """
+        if not sectors:
+            return {}
+        workers = max(1, min(SECTOR_PERF_WORKERS, len(sectors)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            perfs = executor.map(lambda sector: self.analyze_sector_performance(sector, days), sectors)
+            return dict(zip(sectors, perfs))
+
     def generate_daily_signals(self, date: str = None) -> dict:
         """
         生成每日信号 - 宏观+技术面综合分析
@@ -472,51 +530,51 @@ class LimitUpScanner:
             else:
                 print("  无")
         else:
-            for _, row in hot_sectors.iterrows():
-                print(f"  {row['所属行业']}: {row['limit_up_count']} 家")
+            for sector_name, count in zip(hot_sectors['所属行业'], hot_sectors['limit_up_count']):
+                print(f"  {sector_name}: {count} 家")
 
-        # 4. 分析板块详情
+        # 4. 分析板块详情 (各板块表现并发获取)
+        sector_names = hot_sectors['所属行业'].astype(str).tolist()
+        sector_perfs = self.analyze_sectors_performance(sector_names)
         sector_details = []
-        for _, row in hot_sectors.iterrows():
-            sector_name = row['所属行业']
-            perf = self.analyze_sector_performance(sector_name)
-
-            zt_stocks = df_zt[df_zt['所属行业'] == sector_name]
-
-            # 提取该板块下所有涨停个股代码（仅代码，不保存名称）
-            stocks_list = []
-            for _, stock_row in zt_stocks.iterrows():
-                stock_code = stock_row.get('代码', '')
-                if stock_code:
-                    stocks_list.append(str(stock_code))
-
-            detail = {
-                'sector': sector_name,
-                'zt_count': int(row['limit_up_count']),
-                'lead_stock_code': str(zt_stocks.iloc[0]['代码']) if len(zt_stocks) > 0 else '',
-                'lead_stock_pct': zt_stocks.iloc[0]['涨跌幅'] if len(zt_stocks) > 0 else 0,
-                'performance_5d': perf.get('period_return', 0),
-                'volatility': perf.get('volatility', 0),
-                'stocks': stocks_list  # 仅保存股票代码列表
-            }
-            sector_details.append(detail)
-
-        # 5. 生成交易信号
         signals = []
-        for sector in sector_details:
-            strength_score = (
-                min(sector['zt_count'] / 10, 1.0) * 0.5 +
-                (sector['lead_stock_pct'] > 9.5) * 0.3 +
-                (sector['performance_5d'] > 0) * 0.2
-            )
-
-            action = '关注' if strength_score >= 0.5 else '观望'
-            signals.append({
-                'sector': sector['sector'],
-                'action': action,
-                'strength': round(strength_score, 2),
-                'reason': f"涨停{sector['zt_count']}家，龙头{sector['lead_stock']}"
+        if sector_names:
+            # 一次分组: 每个板块的首只涨停股为龙头，代码列表仅保存代码不保存名称
+            zt_stocks = df_zt[df_zt['所属行业'].isin(sector_names)]
+            groups = zt_stocks.groupby(zt_stocks['所属行业'].astype(str), sort=False)
+            lead = groups.head(1)
+            lead = lead.set_index(lead['所属行业'].astype(str)).reindex(sector_names)
+            stocks = groups['代码'].agg(lambda codes: [str(c) for c in codes if c]).reindex(sector_names)
+
+            zt_count = hot_sectors['limit_up_count'].to_numpy(dtype=np.int64)
+            lead_pct = lead['涨跌幅'].fillna(0).to_numpy(dtype=float)
+            perf_5d = np.array([sector_perfs[name].get('period_return', 0) for name in sector_names], dtype=float)
+            volatility = [sector_perfs[name].get('volatility', 0) for name in sector_names]
+            lead_code = lead['代码'].fillna('').astype(str)
+
+            details = pd.DataFrame({
+                'sector': sector_names,
+                'zt_count': zt_count,
+                'lead_stock_code': lead_code.to_numpy(),
+                'lead_stock_pct': lead_pct,
+                'performance_5d': perf_5d,
+                'volatility': volatility,
+                'stocks': [s if isinstance(s, list) else [] for s in stocks]
             })
+            sector_details = details.to_dict('records')
+
+            # 5. 生成交易信号 (整列计算强度分)
+            strength = (
+                np.minimum(zt_count / 10, 1.0) * 0.5 +
+                (lead_pct > 9.5) * 0.3 +
+                (perf_5d > 0) * 0.2
+            )
+            signals = pd.DataFrame({
+                'sector': sector_names,
+                'action': np.where(strength >= 0.5, '关注', '观望'),
+                'strength': np.round(strength, 2),
+                'reason': '涨停' + details['zt_count'].astype(str) + '家，龙头' + details['lead_stock_code']
+            }).to_dict('records')
 
         # 6. 保存结果
         # 判断市场类型
@@ -683,21 +741,26 @@ class LimitUpScanner:
         # 生成时间戳 (HHMMSS格式)
         timestamp = datetime.now().strftime('%H%M%S')
         
+        # 只序列化一次，三份文件写入相同字节
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(
+                result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            payload = json.dumps(result, ensure_ascii=False, indent=2).encode('utf-8')
+
         # 保存三份文件：
         # 1. 最新文件（Dashboard读取）- 在根目录
         latest_file = base_output_dir / "daily_signals.json"
-        with open(latest_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        latest_file.write_bytes(payload)
         
         # 2. 日期文件夹内的分钟级文件
         timed_file = date_folder / f"daily_signals_{timestamp}.json"
-        with open(timed_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        timed_file.write_bytes(payload)
         
         # 3. 日期文件夹内的最新文件（方便查看当天最新）
         daily_latest_file = date_folder / "daily_signals_latest.json"
-        with open(daily_latest_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        daily_latest_file.write_bytes(payload)
 
         print(f"\n信号已保存至:")
         print(f"  最新: {latest_file}")
@@ -797,30 +860,103 @@ class LimitUpScanner:
         else:
             return "普跌格局，市场情绪低迷"
     
-    def save_to_history(self, heat: pd.DataFrame):
-        """保存板块热度历史数据"""
-        # 统一到 storage/outputs/shortterm/daily_signal
+    def _history_dir(self) -> Path:
+        """板块热度历史目录 storage/outputs/shortterm/daily_signal"""
         # base_dir 是 ShortTerm/, 所以只需要 parent 到项目根目录
-        output_dir = Path(self.base_dir).parent / "storage" / "outputs" / "shortterm" / "daily_signal"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 最新历史文件
-        history_file = output_dir / "sector_heat_history.csv"
-        
-        if os.path.exists(history_file):
-            history = pd.read_csv(history_file)
+        return Path(self.base_dir).parent / "storage" / "outputs" / "shortterm" / "daily_signal"
+
+    def _history_partition_dir(self) -> Path:
+        """板块热度历史分区目录 (config.yaml 的 output.history_dir，相对路径基于 ShortTerm/)"""
+        history_dir = self.config.get('output', {}).get('history_dir')
+        if not history_dir:
+            return self._history_dir() / "sector_heat_history"
+        return Path(self.base_dir) / history_dir
+
+    def _migrate_legacy_history(self, history_dir: Path):
+        """
+        将旧版整表历史 (sector_heat_history.parquet/.csv) 按日期拆分为分区文件
+
+        仅在分区目录尚不存在时执行一次，旧文件保留不删除
+        """
+        legacy_file = self._history_dir() / "sector_heat_history.parquet"
+        if legacy_file.exists():
+            history = pd.read_parquet(legacy_file, engine='pyarrow')
+        elif legacy_file.with_suffix('.csv').exists():
+            history = pd.read_csv(legacy_file.with_suffix('.csv'), dtype={'date': str})
         else:
-            history = pd.DataFrame(columns=['date', 'industry', 'limit_up_count'])
+            return
+
+        history_dir.mkdir(parents=True, exist_ok=True)
+        for date, day in history.astype({'date': str}).groupby('date', sort=False):
+            day.to_parquet(
+                history_dir / f"date={date}.parquet", engine='pyarrow', index=False, compression='zstd'
+            )
+        logger.info(f"已迁移板块热度历史: {len(history)} 行 -> {history_dir}")
+
+    def list_history_files(self) -> list[str]:
+        """
+        列出板块热度历史分区文件 (date=YYYYMMDD.parquet，按日期升序)
+
+        文件列表只在首次调用时扫描目录，之后由 save_to_history 增量维护
+        """
+        if self._history_files_cache is None:
+            history_dir = self._history_partition_dir()
+            if not history_dir.exists():
+                self._migrate_legacy_history(history_dir)
+            files = []
+            if history_dir.is_dir():
+                with os.scandir(history_dir) as it:
+                    for entry in it:
+                        if entry.name.startswith("date=") and entry.name.endswith(".parquet"):
+                            files.append(entry.path)
+            self._history_files_cache = sorted(files)
+        return self._history_files_cache
+
+    def load_history(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        读取板块热度历史
 
-        history = pd.concat([history, heat], ignore_index=True)
-        history.to_csv(history_file, index=False, encoding='utf-8-sig')
+        Args:
+            start_date: 开始日期 (YYYYMMDD)，None 表示不限
+            end_date: 结束日期 (YYYYMMDD)，None 表示不限
+        """
+        files = [
+            f for f in self.list_history_files()
+            if (start_date is None or Path(f).stem[5:] >= start_date)
+            and (end_date is None or Path(f).stem[5:] <= end_date)
+        ]
+        if not files:
+            return pd.DataFrame(columns=['date', '所属行业', 'limit_up_count'])
+        return ds.dataset(files, format='parquet').to_table().to_pandas()
+
+    def save_to_history(self, heat: pd.DataFrame):
+        """
+        保存板块热度历史数据
+
+        每日写入独立分区文件 sector_heat_history/date=YYYYMMDD.parquet，
+        不再读取并重写整份历史 (重复运行只覆盖当日文件)
+        """
+        # 统一到 storage/outputs/shortterm/daily_signal
+        output_dir = self._history_dir()
+        history_dir = self._history_partition_dir()
+        # 先加载文件列表 (首次会迁移旧版整表历史)，再写入当日分区
+        files = self.list_history_files()
+        history_dir.mkdir(parents=True, exist_ok=True)
+
+        date = str(heat['date'].iloc[0]) if not heat.empty else get_trading_date()
+        partition_file = history_dir / f"date={date}.parquet"
+        heat.astype({'date': str}).to_parquet(
+            partition_file, engine='pyarrow', index=False, compression='zstd'
+        )
+
+        if str(partition_file) not in files:
+            bisect.insort(files, str(partition_file))
         
         # 同时保存带日期的历史文件
         date_str = heat['date'].iloc[0] if not heat.empty else get_trading_date_str()
         dated_history_file = output_dir / f"sector_heat_history_{date_str}.csv"
         heat.to_csv(dated_history_file, index=False, encoding='utf-8-sig')
 
-
 if __name__ == "__main__":
     scanner = LimitUpScanner()
     result = scanner.generate_daily_signals()
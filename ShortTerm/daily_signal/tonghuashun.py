@@ -1,11 +1,12 @@
 """
 同花顺数据中心数据获取
 """
-import requests
 import re
 from bs4 import BeautifulSoup
 import logging
 
+from .http_session import get_session
+
 logger = logging.getLogger(__name__)
 
 # 统一的请求配置
@@ -43,7 +44,7 @@ def _fetch_ths_data(order: str, threshold: float, color_class: str, limit_type:
         for page in range(1, max_pages + 1):
             url = _THS_BASE_URL.format(order=order, page=page)
 
-            resp = requests.get(url, headers=_THS_HEADERS, timeout=15)
+            resp = get_session().get(url, headers=_THS_HEADERS, timeout=15)
             resp.encoding = 'gbk'
 
             if resp.status_code != 200:
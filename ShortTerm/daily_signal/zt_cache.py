@@ -0,0 +1,152 @@
+"""
+涨停池本地缓存 - Hive 分区 Parquet 数据集
+
+目录结构: <cache_dir>/zt_pool/date=YYYYMMDD/part-0.parquet
+每日扫描 (ShortTermDataManager / LimitUpScanner) 与历史下载 (EventStudyBacktest)
+共用同一数据集，按 date 分区裁剪，不再逐日解析 CSV
+"""
+
+import os
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+ZT_POOL_DIR = "zt_pool"
+
+# 涨停池固定列类型: 代码保持字符串 (保留前导 0)，行业字典编码 (groupby 更省内存)，
+# 不在表中的列保持推断类型
+ZT_POOL_SCHEMA = pa.schema([
+    ("代码", pa.string()),
+    ("名称", pa.string()),
+    ("涨跌幅", pa.float32()),
+    ("最新价", pa.float32()),
+    ("所属行业", pa.dictionary(pa.int16(), pa.string())),
+])
+
+# CSV 解析阶段的列类型 (字典列先按字符串读入，再统一转换)
+_CSV_COLUMN_TYPES = {
+    f.name: (pa.string() if pa.types.is_dictionary(f.type) else f.type)
+    for f in ZT_POOL_SCHEMA
+}
+
+_PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def zt_pool_root(cache_dir: str) -> str:
+    """涨停池数据集根目录"""
+    return os.path.join(cache_dir, ZT_POOL_DIR)
+
+
+def as_industry_category(df: pd.DataFrame, column: str = "所属行业") -> pd.DataFrame:
+    """
+    行业列转为 category (分组/过滤按整数编码进行)，列不存在或已是 category 时原样返回
+    """
+    if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+        df = df.astype({column: "category"})
+    return df
+
+
+def _apply_zt_schema(table: pa.Table) -> pa.Table:
+    """按 ZT_POOL_SCHEMA 转换已存在的列，无法转换的列保持原类型"""
+    for field in ZT_POOL_SCHEMA:
+        i = table.schema.get_field_index(field.name)
+        if i < 0 or table.schema.field(i).type == field.type:
+            continue
+        column = table.column(i)
+        try:
+            if pa.types.is_dictionary(field.type):
+                column = column.cast(pa.string()).dictionary_encode()
+            column = column.cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+        table = table.set_column(i, field.name, column)
+    return table
+
+
+def save_zt_partition(cache_dir: str, df: pd.DataFrame, date: str):
+    """
+    保存单日涨停池 (重复保存同一天只替换该日分区)
+
+    Args:
+        cache_dir: 缓存目录
+        df: 涨停池数据 (可带 date 列，以分区值为准)
+        date: 日期 (YYYYMMDD 格式)
+    """
+    data = df.drop(columns=["date"]) if "date" in df.columns else df
+    table = _apply_zt_schema(pa.Table.from_pandas(data, preserve_index=False))
+    table = table.append_column("date", pa.array([date] * len(table), pa.string()))
+    ds.write_dataset(
+        table,
+        base_dir=zt_pool_root(cache_dir),
+        format="parquet",
+        partitioning=_PARTITIONING,
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+
+
+def load_zt_partition(cache_dir: str, date: str) -> pd.DataFrame:
+    """
+    读取单日涨停池，依次尝试分区目录与旧版 zt_pool_<date>.csv
+
+    Returns:
+        涨停池 DataFrame (不含 date 列)，无缓存时为空
+    """
+    partition = os.path.join(zt_pool_root(cache_dir), f"date={date}")
+    if os.path.isdir(partition):
+        return pq.read_table(partition, partitioning=None, memory_map=True).to_pandas(
+            self_destruct=True
+        )
+
+    legacy_file = os.path.join(cache_dir, f"zt_pool_{date}.csv")
+    if os.path.exists(legacy_file):
+        table = pa_csv.read_csv(
+            legacy_file,
+            convert_options=pa_csv.ConvertOptions(column_types=_CSV_COLUMN_TYPES),
+        )
+        return _apply_zt_schema(table).to_pandas(self_destruct=True)
+
+    return pd.DataFrame()
+
+
+def open_zt_dataset(cache_dir: str) -> Optional[ds.Dataset]:
+    """
+    打开涨停池数据集 (仅在此处扫描目录)
+
+    返回的 Dataset 持有文件列表，调用方可在会话内复用，避免每次读取重复遍历分区
+    """
+    root = zt_pool_root(cache_dir)
+    if not os.path.isdir(root):
+        return None
+    return ds.dataset(root, format="parquet", partitioning=_PARTITIONING)
+
+
+def load_zt_dataset(cache_dir: str, start: Optional[str] = None,
+                    end: Optional[str] = None,
+                    dataset: Optional[ds.Dataset] = None) -> pd.DataFrame:
+    """
+    一次扫描读取日期区间内的全部涨停池 (含 date 列)
+
+    Args:
+        cache_dir: 缓存目录
+        start: 开始日期 (YYYYMMDD)，None 表示不限
+        end: 结束日期 (YYYYMMDD)，None 表示不限
+        dataset: 已打开的数据集 (open_zt_dataset)，None 时重新扫描目录
+    """
+    if dataset is None:
+        dataset = open_zt_dataset(cache_dir)
+    if dataset is None:
+        return pd.DataFrame()
+
+    date = ds.field("date")
+    condition = None
+    if start:
+        condition = date >= start
+    if end:
+        condition = (date <= end) if condition is None else condition & (date <= end)
+    return dataset.to_table(filter=condition).to_pandas()
@@ -0,0 +1,36 @@
+"""
+lib/tests 共用的测试辅助: RSRS 斜率参照实现与 K 线生成
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def reference_rsrs(df: pd.DataFrame, n: int = 18) -> pd.Series:
+    """逐窗口 linregress: 第 i 行为 [i-n, i) 窗口的 High~Low 斜率；窗口含缺失值或无波动时为 NaN"""
+    from scipy import stats
+
+    values = np.full(len(df), np.nan)
+    for i in range(n, len(df)):
+        lows = df['low'].iloc[i - n:i]
+        highs = df['high'].iloc[i - n:i]
+        if lows.isna().any() or highs.isna().any() or lows.std() == 0 or highs.std() == 0:
+            continue
+        values[i] = stats.linregress(lows, highs).slope
+    return pd.Series(values, index=df.index)
+
+
+def make_bars(length: int = 200, level: float = 20.0, seed: int = 0, gaps: bool = True) -> pd.DataFrame:
+    """随机游走 K 线 (close/high/low)；gaps 为 True 时在 50:53 行加入缺失值、120:150 行加入无波动窗口"""
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0.0003, 0.015, length)))
+    df = pd.DataFrame({
+        'close': close,
+        'high': close * (1 + np.abs(rng.normal(0, 0.01, length))),
+        'low': close * (1 - np.abs(rng.normal(0, 0.01, length))),
+    }, index=pd.date_range("2022-01-03", periods=length, freq="B"))
+    if gaps:
+        df.iloc[50:53, df.columns.get_loc('low')] = np.nan
+        df.iloc[120:150, df.columns.get_loc('low')] = level * 0.5
+        df.iloc[120:150, df.columns.get_loc('high')] = level * 0.52
+    return df
@@ -0,0 +1,74 @@
+"""
+Dashboard DataBridge 读取测试
+"""
+
+import sys
+import os
+
+import pandas as pd
+
+# 添加项目根路径
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+
+from Dashboard.data_bridge import DataBridge, read_csv_fast  # noqa: E402
+
+
+def make_bridge(tmp_path) -> DataBridge:
+    bridge = DataBridge()
+    bridge.storage_outputs = tmp_path
+    return bridge
+
+
+def test_sector_heat_history_reads_partitions(tmp_path):
+    """板块热度历史读取 sector_heat_history/date=YYYYMMDD.parquet 分区"""
+    history_dir = tmp_path / "shortterm" / "daily_signal" / "sector_heat_history"
+    history_dir.mkdir(parents=True)
+    for date, count in (("20240102", 5), ("20240103", 7), ("20240104", 9)):
+        pd.DataFrame({'date': [date], '所属行业': ['半导体'], 'limit_up_count': [count]}).to_parquet(
+            history_dir / f"date={date}.parquet", index=False
+        )
+
+    bridge = make_bridge(tmp_path)
+    history = bridge.get_sector_heat_history()
+    assert history['date'].tolist() == ["20240102", "20240103", "20240104"]
+
+    window = bridge.get_sector_heat_history(columns=['date', 'limit_up_count'], start_date="20240103")
+    assert list(window.columns) == ['date', 'limit_up_count']
+    assert window['limit_up_count'].tolist() == [7, 9]
+
+    assert bridge.get_sector_heat_history(end_date="20231231").empty
+
+
+def test_sector_heat_history_legacy_file(tmp_path):
+    """分区目录不存在时回退到旧版整表 CSV"""
+    output_dir = tmp_path / "shortterm" / "daily_signal"
+    output_dir.mkdir(parents=True)
+    pd.DataFrame({'date': ["20240102", "20240103"], '所属行业': ['银行', '银行'],
+                  'limit_up_count': [3, 4]}).to_csv(output_dir / "sector_heat_history.csv", index=False)
+
+    bridge = make_bridge(tmp_path)
+    assert len(bridge.get_sector_heat_history()) == 2
+    assert bridge.get_sector_heat_history(start_date="20240103")['limit_up_count'].tolist() == [4]
+    assert make_bridge(tmp_path / "missing").get_sector_heat_history().empty
+
+
+def test_read_csv_fast_matches_default_engine(tmp_path):
+    """ISO 日期/时间列与默认引擎一样保留为字符串"""
+    path = tmp_path / "table.csv"
+    path.write_text(
+        "date,ts,value\n"
+        "2024-01-02,2024-01-02 10:00:00,1.5\n"
+        "2024-01-03,2024-01-03 11:00:00,2.5\n"
+    )
+    expected = pd.read_csv(path)
+    got = read_csv_fast(path)
+    pd.testing.assert_frame_equal(got, expected)
+    assert isinstance(got['date'].iloc[0], str)
+
+    got = read_csv_fast(path, usecols=['date', 'value'])
+    pd.testing.assert_frame_equal(got, pd.read_csv(path, usecols=['date', 'value']))
+
+    # 显式 parse_dates 时保持调用方的解析方式
+    parsed = read_csv_fast(path, parse_dates=['date'])
+    assert pd.api.types.is_datetime64_any_dtype(parsed['date'])
@@ -0,0 +1,61 @@
+"""
+LongTerm DataManager 行情读写单元测试 (本地文件模式，不依赖 DataHub)
+"""
+
+import sys
+import os
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+# 添加项目根路径与 LongTerm 目录
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "LongTerm"))
+
+from data_manager import DataManager, _json_loads  # noqa: E402
+
+
+@pytest.fixture
+def manager(tmp_path):
+    # SQLite 库位于 base_dir 上两级目录的 storage/ 下，放在临时目录内
+    dm = DataManager(base_dir=str(tmp_path / "project" / "LongTerm"), use_datahub=False)
+    yield dm
+    dm.close()
+
+
+def make_wide(length: int = 30) -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=length, freq="B")
+    data = np.random.default_rng(0).random((length, 3))
+    return pd.DataFrame(data, index=index, columns=["000001", "600519", "300750"])
+
+
+@pytest.mark.parametrize("fmt", ["feather", "parquet"])
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"symbols": ["600519"]},
+    {"start_date": "2024-01-05", "end_date": "2024-01-20"},
+])
+def test_loaded_frames_are_writable(manager, fmt, kwargs):
+    """get_prices / get_returns 返回普通可写 DataFrame (不是只读的 Arrow 视图)"""
+    df = make_wide()
+    manager.save_prices(df, format=fmt)
+    manager.save_returns(df, format=fmt)
+
+    for loaded in (manager.get_prices(**kwargs), manager.get_returns(**kwargs)):
+        assert not loaded.empty
+        loaded.iloc[0, 0] = -1.0
+        loaded[loaded.columns[0]] *= 2
+        assert loaded.iloc[0, 0] == -2.0
+
+
+def test_json_loads_legacy_nan():
+    """旧版 json.dumps 写入的 NaN/Infinity 记录可以解析"""
+    data = _json_loads(json.dumps({'score': float('nan'), 'ratio': float('-inf')}))
+    assert math.isnan(data['score'])
+    assert data['ratio'] == float('-inf')
@@ -0,0 +1,97 @@
+"""
+DataHub DataService 缓存读取单元测试
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+# 添加项目根路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from DataHub.services.data_service import DataService  # noqa: E402
+
+
+class FakeProvider:
+    """按请求的代码返回固定行情，并记录调用"""
+
+    def __init__(self, prices: pd.DataFrame):
+        self.prices = prices
+        self.calls = []
+
+    def get_price_data(self, symbols, start_date, end_date, period="daily", **kwargs):
+        self.calls.append(list(symbols))
+        return self.prices[[s for s in symbols if s in self.prices.columns]]
+
+
+def make_prices(length: int = 30) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=length, freq="B", name="date")
+    data = 10 + np.random.default_rng(0).random((length, 3))
+    return pd.DataFrame(data, index=index, columns=["000001", "600519", "300750"])
+
+
+@pytest.fixture
+def service(tmp_path):
+    data_service = DataService(storage_path=tmp_path)
+    data_service.provider = FakeProvider(make_prices())
+    yield data_service
+    data_service.storage.close()
+
+
+def test_corrupt_price_cache_falls_back_to_provider(service):
+    """价格缓存文件损坏时回退到数据源，而不是返回空表"""
+    service.storage.save_prices(make_prices()[["000001", "600519"]])
+    for part in service.storage._price_partitions():
+        part.write_bytes(b"not a parquet file")
+
+    prices = service.get_prices(symbols=["000001", "600519"])
+    assert service.provider.calls == [["000001", "600519"]]
+    assert list(prices.columns) == ["000001", "600519"]
+    assert len(prices) == 30
+
+
+def test_corrupt_returns_cache_is_recomputed(service):
+    """收益率缓存文件损坏时由价格重新计算"""
+    service.storage.save_prices(make_prices())
+    returns_file = service.storage.processed_returns_dir / "returns.parquet"
+    returns_file.write_bytes(b"not a parquet file")
+
+    returns = service.get_returns(symbols=["600519"])
+    assert list(returns.columns) == ["600519"]
+    assert returns["600519"].iloc[1:].notna().all()
+
+
+def test_partial_price_cache_hit_fetches_missing_symbols(service):
+    """缓存只有部分代码时，只向数据源请求缺失的代码并合并进缓存"""
+    prices = make_prices()
+    service.storage.save_prices(prices[["000001", "600519"]])
+
+    got = service.get_prices(symbols=["300750", "000001"])
+    assert service.provider.calls == [["300750"]]
+    assert list(got.columns) == ["300750", "000001"]
+    np.testing.assert_allclose(got.to_numpy(), prices[["300750", "000001"]].to_numpy(), rtol=1e-6)
+
+    # 已合并进缓存，再次读取不再请求数据源
+    assert sorted(service.storage.load_prices().columns) == ["000001", "300750", "600519"]
+    assert list(service.get_prices(symbols=["300750"]).columns) == ["300750"]
+    assert len(service.provider.calls) == 1
+
+
+def test_partial_returns_cache_hit_computes_missing_symbols(service):
+    """收益率缓存缺少的代码由价格计算并合并进缓存"""
+    prices = make_prices()
+    service.storage.save_prices(prices)
+    service.storage.save_returns(prices[["000001"]].pct_change())
+
+    got = service.get_returns(symbols=["000001", "600519"], start_date="2024-01-10")
+    assert list(got.columns) == ["000001", "600519"]
+    assert got.index[0] == pd.Timestamp("2024-01-10")
+    expected = prices["600519"].pct_change().loc["2024-01-10":]
+    np.testing.assert_allclose(got["600519"].to_numpy(), expected.to_numpy(), atol=1e-5)
+    assert service.provider.calls == []
+    assert sorted(service.storage.load_returns().columns) == ["000001", "600519"]
@@ -0,0 +1,26 @@
+"""
+LongTerm 配置加载 (config_loader) 单元测试
+"""
+
+import sys
+import os
+
+# 添加 LongTerm 目录
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "LongTerm"))
+
+from config_loader import load_config  # noqa: E402
+
+
+def test_load_config_cached_until_modified(tmp_path):
+    """同一文件只解析一次，修改后重新读取"""
+    path = tmp_path / "config.yaml"
+    path.write_text("constraints:\n  max_weight: 0.2\n", encoding="utf-8")
+
+    first = load_config(str(path))
+    assert first == {'constraints': {'max_weight': 0.2}}
+    assert load_config(str(path)) is first
+
+    path.write_text("constraints:\n  max_weight: 0.3\n", encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert load_config(str(path))['constraints']['max_weight'] == 0.3
@@ -0,0 +1,45 @@
+"""
+LongTerm 组合优化器 (PortfolioOptimizer) 单元测试
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+# 添加项目根路径与 LongTerm 目录
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "LongTerm"))
+
+from optimizer import PortfolioOptimizer  # noqa: E402
+
+
+@pytest.fixture
+def optimizer(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"data_dir: {tmp_path / 'processed'}\n", encoding="utf-8")
+    return PortfolioOptimizer(str(config_path))
+
+
+def make_returns(seed: int) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=120, freq="B")
+    data = np.random.default_rng(seed).normal(0, 0.02, (120, 4))
+    return pd.DataFrame(data, index=index, columns=["600519", "000001", "300750", "601318"])
+
+
+def test_cov_cache_keyed_on_returns_content(optimizer):
+    """形状与日期相同但数值不同的收益率不会命中同一份协方差缓存"""
+    first, second = make_returns(0), make_returns(1)
+
+    np.testing.assert_allclose(optimizer.get_cov_matrix(first), np.cov(first.to_numpy(), rowvar=False))
+    np.testing.assert_allclose(optimizer.get_cov_matrix(second), np.cov(second.to_numpy(), rowvar=False))
+
+    # 命中缓存时结果不变，且按传入的列顺序返回
+    reordered = first[["300750", "600519", "601318", "000001"]]
+    np.testing.assert_allclose(optimizer.get_cov_matrix(reordered), np.cov(reordered.to_numpy(), rowvar=False))
+    assert len(os.listdir(os.path.join(optimizer.data_dir, "cov_cache"))) == 2
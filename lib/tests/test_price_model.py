@@ -0,0 +1,39 @@
+"""
+DataHub PriceData 模型单元测试
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# 添加项目根路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from DataHub.models.price import PriceData  # noqa: E402
+
+
+def make_price_data(df: pd.DataFrame) -> PriceData:
+    return PriceData(data=df, symbol="000001", start_date="2024-01-02",
+                     end_date="2024-01-04", last_updated=datetime(2024, 1, 4))
+
+
+def test_get_stats_numeric_columns():
+    """数值列给出 mean/std/min/max/latest，非数值列不参与统计"""
+    df = pd.DataFrame({'close': [10.0, 11.0, 12.0], 'name': ['平安银行'] * 3})
+    stats = make_price_data(df).get_stats()
+    assert list(stats["statistics"]) == ['close']
+    assert stats["statistics"]['close'] == {'mean': 11.0, 'std': 1.0, 'min': 10.0, 'max': 12.0, 'latest': 12.0}
+
+
+def test_get_stats_without_numeric_columns():
+    """全部为字符串列时 statistics 为空字典"""
+    df = pd.DataFrame({'date': ['2024-01-02', '2024-01-03'], 'name': ['平安银行'] * 2})
+    stats = make_price_data(df).get_stats()
+    assert stats["statistics"] == {}
+    assert stats["row_count"] == 2
+
+
+def test_get_stats_empty_frame():
+    assert make_price_data(pd.DataFrame()).get_stats() == {}
@@ -0,0 +1,32 @@
+"""
+ShortTerm 信号文件 JSON 读写单元测试
+"""
+
+import sys
+import os
+import json
+import math
+
+# 添加项目根路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from ShortTerm.daily_signal.data_manager import _dump_json, _load_json  # noqa: E402
+
+
+def test_load_legacy_json_with_nan(tmp_path):
+    """标准库 json.dump 写出的 NaN/Infinity 字面量可以读取"""
+    path = tmp_path / "signals.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'score': float('nan'), 'ratio': float('inf'), 'name': '半导体'}, f, ensure_ascii=False)
+
+    data = _load_json(str(path))
+    assert math.isnan(data['score'])
+    assert data['ratio'] == float('inf')
+    assert data['name'] == '半导体'
+
+
+def test_dump_load_roundtrip(tmp_path):
+    path = tmp_path / "signals.json"
+    obj = {'date': '20240102', 'signals': [{'code': '600519', 'score': 1.5}]}
+    _dump_json(obj, str(path))
+    assert _load_json(str(path)) == obj
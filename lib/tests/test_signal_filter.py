@@ -0,0 +1,95 @@
+"""
+LongTerm 信号过滤 (signal_filter) RSRS 单元测试
+
+以逐窗口 linregress (conftest.reference_rsrs) 为参照，检查 calculate_rsrs / _rsrs_kernel / RollingRSRS 的斜率
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy.stats")
+
+# 添加项目根路径与 LongTerm 目录
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "LongTerm"))
+
+from signal_filter import RollingRSRS, TrendFilter, _rsrs_kernel  # noqa: E402
+
+from .conftest import make_bars, reference_rsrs  # noqa: E402
+
+N = 18
+RTOL = 1e-8
+
+
+def kernel_variants():
+    """_rsrs_kernel 的编译版本与纯 Python 版本 (未安装 numba 时两者相同)"""
+    variants = [_rsrs_kernel]
+    if hasattr(_rsrs_kernel, 'py_func'):
+        variants.append(_rsrs_kernel.py_func)
+    return variants
+
+
+# ==================== 测试 ====================
+
+@pytest.mark.parametrize("level", [20.0, 3000.0])
+def test_calculate_rsrs_matches_linregress(level):
+    """calculate_rsrs 与 linregress 一致 (含缺失值、无波动窗口与高价位)"""
+    df = make_bars(level=level)
+    expected = reference_rsrs(df).to_numpy()
+    got = TrendFilter().calculate_rsrs(df, N)
+
+    assert got.index.equals(df.index)
+    np.testing.assert_allclose(got.to_numpy(), expected, rtol=RTOL, equal_nan=True)
+    assert np.isnan(got.iloc[120 + N:150]).all()
+    assert np.isnan(got.iloc[51:53 + N]).all()
+
+
+@pytest.mark.parametrize("kernel", kernel_variants())
+def test_rsrs_kernel_matches_linregress(kernel):
+    """_rsrs_kernel 按列计算，与 linregress 一致"""
+    frames = [make_bars(seed=0), make_bars(level=3000.0, seed=1), make_bars(seed=2, gaps=False)]
+    lows = np.column_stack([df['low'].to_numpy() for df in frames])
+    highs = np.column_stack([df['high'].to_numpy() for df in frames])
+
+    got = kernel(lows, highs, N)
+    for j, df in enumerate(frames):
+        np.testing.assert_allclose(got[:, j], reference_rsrs(df).to_numpy(), rtol=RTOL, equal_nan=True)
+
+
+def test_calculate_rsrs_batch_matches_single():
+    """批量计算 (长度不同的股票末端对齐) 与逐只 calculate_rsrs 一致"""
+    prices = {
+        'a': make_bars(length=200, seed=0),
+        'b': make_bars(length=120, seed=1, gaps=False),
+        'c': make_bars(length=10, seed=2, gaps=False),
+    }
+    trend_filter = TrendFilter()
+    batch = trend_filter.calculate_rsrs_batch(prices, N)
+
+    for symbol, df in prices.items():
+        assert batch[symbol].index.equals(df.index)
+        np.testing.assert_allclose(batch[symbol].to_numpy(), reference_rsrs(df).to_numpy(), rtol=RTOL, equal_nan=True)
+        np.testing.assert_allclose(batch[symbol].to_numpy(), trend_filter.calculate_rsrs(df, N).to_numpy(),
+                                   rtol=RTOL, equal_nan=True)
+
+
+@pytest.mark.parametrize("level", [20.0, 3000.0])
+def test_rolling_rsrs_matches_calculate_rsrs(level):
+    """RollingRSRS 加入第 t 根 K 线后的斜率等于 calculate_rsrs 第 t+1 行 (含无波动窗口)"""
+    df = make_bars(level=level, gaps=False)
+    df.iloc[120:150, df.columns.get_loc('low')] = level * 0.5
+    df.iloc[120:150, df.columns.get_loc('high')] = level * 0.52
+
+    rolling = RollingRSRS(N)
+    got = np.array([rolling.update(high, low) for high, low in zip(df['high'], df['low'])])
+    expected = TrendFilter().calculate_rsrs(df, N).to_numpy()
+
+    np.testing.assert_allclose(got[:-1], expected[1:], rtol=RTOL, equal_nan=True)
+    np.testing.assert_allclose(got[:-1], reference_rsrs(df).to_numpy()[1:], rtol=RTOL, equal_nan=True)
+    assert np.isnan(got[:N - 1]).all()
+    assert np.isfinite(got[N - 1])
+
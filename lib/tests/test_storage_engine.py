@@ -0,0 +1,63 @@
+"""
+DataHub StorageEngine 行情读写单元测试
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+# 添加项目根路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from DataHub.core.storage_engine import StorageEngine  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path):
+    storage = StorageEngine(base_path=tmp_path)
+    yield storage
+    storage.close()
+
+
+def make_wide(length: int = 400) -> pd.DataFrame:
+    index = pd.date_range("2023-06-01", periods=length, freq="B", name="date")
+    data = np.random.default_rng(0).random((length, 3))
+    return pd.DataFrame(data, index=index, columns=["000001", "600519", "300750"])
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"columns": ["600519", "unknown"]},
+    {"start_date": "2024-01-01", "end_date": "2024-03-31"},
+    {"columns": ["000001"], "start_date": "2024-01-01"},
+])
+def test_loaded_frames_are_writable_and_independent(engine, kwargs):
+    """过滤与不过滤的读取都返回可写的新 DataFrame，修改不影响缓存中的表"""
+    df = make_wide()
+    engine.save_prices(df)
+    engine.save_returns(df)
+
+    for load in (engine.load_prices, engine.load_returns):
+        first = load(**kwargs)
+        assert not first.empty
+        first.iloc[0, 0] = -1.0
+
+        second = load(**kwargs)
+        assert second.iloc[0, 0] != -1.0
+
+
+def test_filters_are_applied(engine):
+    df = make_wide()
+    engine.save_prices(df)
+
+    loaded = engine.load_prices(start_date="2024-01-01", end_date="2024-03-31", columns=["600519"])
+    assert list(loaded.columns) == ["600519"]
+    assert loaded.index.min() >= pd.Timestamp("2024-01-01")
+    assert loaded.index.max() <= pd.Timestamp("2024-03-31")
+    expected = df.loc["2024-01-01":"2024-03-31", ["600519"]].astype(np.float32)
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False)
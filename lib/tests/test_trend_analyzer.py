@@ -0,0 +1,127 @@
+"""
+LongTerm 趋势分析 (TrendAnalyzer) 单元测试
+
+以原始逐窗口 linregress 实现为参照，检查批量 analyze_prices 的结果
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy.stats")
+
+# 添加项目根路径与 LongTerm 目录
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "LongTerm"))
+
+from data_updater import TrendAnalyzer, _rolling_ols_slope, _rolling_zscore  # noqa: E402
+
+from .conftest import make_bars, reference_rsrs  # noqa: E402
+
+
+# ==================== 参照实现 (逐窗口 linregress) ====================
+
+def reference_rsrs_zscore(df: pd.DataFrame, n: int = 18, window: int = 600) -> pd.Series:
+    rsrs = reference_rsrs(df, n)
+    std = rsrs.rolling(window).std().replace(0, np.nan)
+    return (rsrs - rsrs.rolling(window).mean()) / std
+
+
+def reference_analyze(df: pd.DataFrame, pe_percentile: float, ma_period: int = 250,
+                      rsrs_threshold: float = 0.7) -> dict:
+    close = df['close']
+    ma = close.rolling(ma_period).mean()
+    ma_ok = close.iloc[-1] > ma.iloc[-1] and (ma.iloc[-1] - ma.iloc[-20]) / 20 > 0
+
+    zscore = reference_rsrs_zscore(df).iloc[-1]
+    rsrs_ok = bool(zscore > rsrs_threshold)
+
+    alpha = 2 / (10 + 1)
+    llt = close.to_numpy().copy()
+    for i in range(2, len(llt)):
+        llt[i] = alpha * close.iloc[i] + (1 - alpha) * llt[i - 1]
+    llt_ok = close.iloc[-1] > llt[-1] and llt[-1] > llt[-2]
+
+    return {'zscore': zscore, 'ma_ok': bool(ma_ok), 'rsrs_ok': rsrs_ok, 'llt_ok': bool(llt_ok)}
+
+
+def make_prices(n_symbols: int = 6, length: int = 700, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=length, freq="B")
+    columns = [f"s{j}" for j in range(n_symbols)]
+    close = pd.DataFrame(
+        20 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (length, n_symbols)), axis=0)),
+        index=index, columns=columns,
+    )
+    spread_high = np.abs(rng.normal(0, 0.01, close.shape))
+    spread_low = np.abs(rng.normal(0, 0.01, close.shape))
+    high = close * (1 + spread_high)
+    low = close * (1 - spread_low)
+    return close, high, low
+
+
+# ==================== 测试 ====================
+
+def test_rolling_ols_slope_matches_linregress():
+    """滚动 OLS 斜率与 linregress 一致 (含缺失值与无波动窗口)"""
+    df = make_bars()   # 含缺失值与无波动窗口
+
+    expected = reference_rsrs(df).to_numpy()
+    got = _rolling_ols_slope(df['low'].to_numpy(), df['high'].to_numpy(), 18)
+    np.testing.assert_allclose(got, expected, rtol=1e-8, equal_nan=True)
+
+    # 二维输入按列计算
+    both = _rolling_ols_slope(np.column_stack((df['low'], df['low'])),
+                              np.column_stack((df['high'], df['high'])), 18)
+    np.testing.assert_allclose(both[:, 1], expected, rtol=1e-8, equal_nan=True)
+
+
+def test_rolling_zscore_constant_series_is_nan():
+    """近似常数序列 (仅剩舍入误差) 的 Z-Score 为 NaN"""
+    values = np.full(700, 1.02 / 0.98) + np.random.default_rng(1).normal(0, 1e-16, 700)
+    assert np.isnan(_rolling_zscore(values, 600)).all()
+
+
+def test_analyze_prices_matches_reference_with_high_low():
+    """提供真实高低价时，批量分析与逐只参照实现的结论一致"""
+    close, high, low = make_prices()
+    pe = {symbol: 0.2 for symbol in close.columns}
+
+    results = TrendAnalyzer().analyze_prices(close, pe, high=high, low=low)
+
+    for symbol in close.columns:
+        df = pd.DataFrame({'close': close[symbol], 'high': high[symbol], 'low': low[symbol]})
+        expected = reference_analyze(df, pe[symbol])
+        details = results[symbol]['details']
+        assert details['rsrs_zscore'] == pytest.approx(round(expected['zscore'], 2), abs=0.011)
+        assert details['ma_ok'] == expected['ma_ok']
+        assert details['rsrs_ok'] == expected['rsrs_ok']
+        assert details['llt_ok'] == expected['llt_ok']
+
+        # 单只分析与批量分析结论一致
+        single = TrendAnalyzer().analyze_stock(df, pe[symbol])
+        assert single['status'] == results[symbol]['status']
+        assert single['details']['rsrs_zscore'] == pytest.approx(details['rsrs_zscore'], abs=0.011)
+
+
+def test_analyze_prices_synthetic_high_low_has_no_rsrs_signal():
+    """只有收盘价时 (高低价以 ±2% 近似)，RSRS 斜率恒定，不产生 RSRS 信号"""
+    close, _, _ = make_prices()
+    pe = {symbol: 0.2 for symbol in close.columns}
+
+    results = TrendAnalyzer().analyze_prices(close, pe)
+
+    for symbol in close.columns:
+        df = pd.DataFrame({'close': close[symbol], 'high': close[symbol] * 1.02,
+                           'low': close[symbol] * 0.98})
+        expected = reference_analyze(df, pe[symbol])
+        details = results[symbol]['details']
+        assert np.isnan(details['rsrs_zscore'])
+        assert details['rsrs_ok'] is False
+        assert details['ma_ok'] == expected['ma_ok']
+        assert details['llt_ok'] == expected['llt_ok']
+        assert results[symbol]['trend_score'] == (expected['ma_ok'] + expected['llt_ok']) / 3